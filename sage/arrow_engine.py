@@ -0,0 +1,264 @@
+"""Motor de lectura y validación basado en PyArrow (seleccionable por catálogo o globalmente)"""
+from typing import Any, BinaryIO, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .ingest import TEXT_TYPES
+from .models import Catalog
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - pyarrow es una dependencia declarada
+    pa = pc = pa_csv = None
+
+ENGINE_PANDAS = 'pandas'
+ENGINE_PYARROW = 'pyarrow'
+ENGINES = (ENGINE_PANDAS, ENGINE_PYARROW)
+
+# Los mismos valores que pd.read_csv interpreta como nulos, para que ambos motores
+# entreguen los mismos vacíos a las reglas
+NULL_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+               '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+# Números que pd.to_numeric acepta: enteros, decimales, notación científica, inf y nan
+NUMERIC_PATTERN = r'^\s*[+-]?(?:(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|inf|infinity|nan)\s*$'
+
+
+def arrow_available() -> bool:
+    """Indica si pyarrow está instalado"""
+    return pa is not None
+
+
+def arrow_string_dtype() -> pd.StringDtype:
+    """
+    dtype de texto respaldado por Arrow con semántica de NaN para los vacíos,
+    la misma que ven las reglas df[...] con el motor pandas (con pandas 2,
+    coercion.to_text completa los vacíos de los campos texto como el lector de pandas)
+    """
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:  # pandas 2.2
+        return pd.StringDtype('pyarrow_numpy')
+
+
+def is_arrow_string(column: pd.Series) -> bool:
+    """Indica si la columna es texto almacenado en un arreglo de Arrow"""
+    dtype = column.dtype
+    return isinstance(dtype, pd.StringDtype) and dtype.storage in ('pyarrow', 'pyarrow_numpy')
+
+
+def _arrow_columns(catalog: Catalog, columns: Optional[List[str]]) -> Dict[str, Any]:
+    """
+    Tipos y proyección de columnas para pyarrow.csv, equivalentes a ingest.csv_read_options
+
+    Sin encabezado Arrow nombra las columnas f0, f1, ...; se renombran después de leer.
+    """
+    if catalog.file_format.header:
+        names = [field.name for field in catalog.fields]
+        present = columns or []
+    else:
+        names = [f'f{i}' for i in range(len(catalog.fields))]
+        present = [f'f{i}' for i in range(len(columns))] if columns is not None else names
+
+    options: Dict[str, Any] = {
+        'column_types': {name: pa.string() for name, field in zip(names, catalog.fields)
+                         if field.type in TEXT_TYPES}
+    }
+    if columns is not None and len(columns) > len(names):
+        wanted = set(names)
+        # Orden del archivo, como hace usecols en pandas
+        options['include_columns'] = [name for name in present if name in wanted]
+    return options
+
+
+def read_csv_arrow(stream: BinaryIO, catalog: Catalog, columns: Optional[List[str]],
+                   encoding: str) -> pd.DataFrame:
+    """
+    Lee un CSV con el lector multihilo de pyarrow
+
+    Los campos de texto y fecha se leen como cadenas y se entregan como
+    columnas de texto respaldadas por Arrow; los numéricos los infiere Arrow.
+
+    Args:
+        stream: Flujo binario del archivo
+        catalog: Catálogo con la definición de campos
+        columns: Campos de la primera línea del archivo, si se conocen
+        encoding: Codificación detectada (ver ingest.sniff_encoding)
+
+    Raises:
+        pyarrow.ArrowInvalid: Si el archivo no se puede leer (por ejemplo, UTF-8 inválido)
+    """
+    read_options = pa_csv.ReadOptions(
+        # Arrow omite el BOM de UTF-8 por sí mismo
+        encoding='utf8' if encoding in ('utf-8', 'utf-8-sig') else encoding,
+        autogenerate_column_names=not catalog.file_format.header,
+        use_threads=True
+    )
+    parse_options = pa_csv.ParseOptions(delimiter=catalog.file_format.delimiter)
+    convert_options = pa_csv.ConvertOptions(
+        null_values=NULL_VALUES,
+        strings_can_be_null=True,
+        quoted_strings_can_be_null=True,
+        **_arrow_columns(catalog, columns)
+    )
+    table = pa_csv.read_csv(stream, read_options=read_options,
+                            parse_options=parse_options, convert_options=convert_options)
+
+    string_dtype = arrow_string_dtype()
+    mapping = {pa.string(): string_dtype, pa.large_string(): string_dtype}
+    return table.to_pandas(types_mapper=mapping.get, split_blocks=True, self_destruct=True)
+
+
+def null_mask(column: pd.Series) -> np.ndarray:
+    """Máscara de valores nulos (con pc.is_null sobre columnas de texto de Arrow)"""
+    if is_arrow_string(column):
+        return pc.is_null(pa.array(column), nan_is_null=True).to_numpy(zero_copy_only=False)
+    return column.isna().to_numpy()
+
+
+def string_keys(column: pd.Series, null_key: str) -> np.ndarray:
+    """Valores de texto de una columna de Arrow con los nulos reemplazados por `null_key`"""
+    return pc.fill_null(pa.array(column), null_key).to_numpy(zero_copy_only=False)
+
+
+def to_numeric(column: pd.Series) -> pd.Series:
+    """
+    Equivalente a pd.to_numeric(errors='coerce') para texto de Arrow
+
+    Valida los valores con una expresión regular y los convierte con pc.cast,
+    sin pasar por objetos de Python. Si todos son enteros, devuelve int64.
+    """
+    values = pa.array(column)
+    valid = pc.fill_null(pc.match_substring_regex(values, NUMERIC_PATTERN, ignore_case=True), False)
+    numbers = pc.cast(pc.utf8_trim_whitespace(pc.if_else(valid, values, None)), pa.float64())
+    result = numbers.to_numpy(zero_copy_only=False)
+    if numbers.null_count == 0 and np.all(np.isfinite(result)) and np.all(result == np.floor(result)):
+        result = result.astype(np.int64)
+    return pd.Series(result, index=column.index, name=column.name)
+
+
+# --- Expresiones regulares con el kernel RE2 de Arrow ------------------------
+
+# Clases de Python (Unicode) expresadas con propiedades de RE2, cuyas \w, \d y \s son solo ASCII
+_UNICODE_CLASSES = {
+    'd': r'\p{Nd}',
+    'w': r'\p{L}\p{N}_',
+    's': r'\t\n\x0b\f\r\x1c-\x1f\x85\p{Z}',
+}
+_UNSUPPORTED_ESCAPES = set('bBN0123456789')  # Bordes de palabra Unicode, \N{...}, referencias y octales
+_UNSUPPORTED_FLAGS = set('aLux')             # (?a), (?L), (?u) y (?x) cambian la sintaxis o la semántica
+
+
+def re2_pattern(pattern: str, mode: str) -> Optional[str]:
+    """
+    Traduce una expresión regular de Python a RE2 (el motor de pyarrow.compute)
+    con el anclaje del modo: fullmatch, match o search.
+
+    Devuelve None si la traducción no conserva la semántica de `re` (lookarounds,
+    referencias, \\b, banderas como (?x), clases negadas dentro de corchetes...) o
+    si Arrow no la acepta; en ese caso la regla se evalúa con `re`.
+    """
+    if pa is None:
+        return None
+    out = []
+    i, n, in_class = 0, len(pattern), False
+    while i < n:
+        char = pattern[i]
+        if char == '\\':
+            if i + 1 >= n:
+                return None
+            escape = pattern[i + 1]
+            i += 2
+            if escape in _UNSUPPORTED_ESCAPES:
+                return None
+            if escape.lower() in _UNICODE_CLASSES:
+                chars = _UNICODE_CLASSES[escape.lower()]
+                if escape.isupper():
+                    if in_class:
+                        return None
+                    out.append(f'[^{chars}]')
+                elif in_class or escape == 'd':
+                    out.append(chars)
+                else:
+                    out.append(f'[{chars}]')
+            elif escape == 'Z':
+                out.append(r'\z')
+            elif escape in 'uU':
+                width = 4 if escape == 'u' else 8
+                code = pattern[i:i + width]
+                if len(code) != width:
+                    return None
+                out.append(f'\\x{{{code}}}')
+                i += width
+            else:
+                out.append('\\' + escape)
+            continue
+
+        if in_class:
+            if char == '[':
+                return None  # Python no tiene clases POSIX [[:alpha:]] ni conjuntos anidados
+            if char == ']':
+                in_class = False
+            out.append(char)
+        elif char == '[':
+            in_class = True
+            out.append(char)
+            i += 1
+            if i < n and pattern[i] == '^':
+                out.append('^')
+                i += 1
+            if i < n and pattern[i] == ']':
+                out.append(r'\]')  # ']' al principio es un literal
+                i += 1
+            continue
+        elif char == '$':
+            # En Python '$' también coincide antes de un salto de línea final
+            if mode == 'fullmatch':
+                out.append('$')
+            else:
+                out.append(r'(?:\n?\z)')
+        elif char == '{' and pattern.startswith('{,', i):
+            return None  # {,n} es un cuantificador en Python y un literal en RE2
+        elif char == '(' and pattern.startswith('(?', i):
+            flags = ''
+            j = i + 2
+            while j < n and pattern[j].isalpha():
+                flags += pattern[j]
+                j += 1
+            if set(flags) & _UNSUPPORTED_FLAGS:
+                return None
+            out.append(char)
+        else:
+            out.append(char)
+        i += 1
+
+    if in_class:
+        return None
+    translated = ''.join(out)
+    if mode == 'fullmatch':
+        translated = f'^(?:{translated})\\z'
+    elif mode == 'match':
+        translated = f'^(?:{translated})'
+
+    try:
+        pc.match_substring_regex(pa.array([''], pa.string()), pattern=translated)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return None
+    return translated
+
+
+def regex_mask(column: pd.Series, pattern: str) -> Optional[np.ndarray]:
+    """
+    Evalúa un patrón RE2 (ver re2_pattern) sobre una columna de texto; los nulos no coinciden.
+
+    Devuelve None si la columna tiene valores que no son texto.
+    """
+    try:
+        values = pa.array(column, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+    matches = pc.match_substring_regex(values, pattern=pattern)
+    return pc.fill_null(matches, False).to_numpy(zero_copy_only=False)
@@ -0,0 +1,142 @@
+"""División de un CSV grande en rangos de bytes alineados a filas, para validarlos en paralelo"""
+import io
+import os
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+QUOTE, NEWLINE = ord('"'), ord('\n')
+BLANK_BYTES = b' \t\r'  # Una línea con solo estos bytes es una línea vacía para pandas
+SCAN_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+@dataclass
+class ByteRange:
+    """
+    Rango [start, end) de un CSV que empieza y termina en un límite de fila.
+
+    Solo el primer rango contiene el encabezado; los demás se leen con los
+    nombres de columna del encabezado. first_row y rows se cuentan al dividir
+    el archivo, igual que pd.read_csv (sin líneas vacías), y permiten calcular
+    los números de línea globales y verificar que el rango se leyó completo.
+    """
+    path: str
+    start: int
+    end: int
+    first_row: int   # Índice (base 0) de la primera fila de datos del rango
+    rows: int        # Filas de datos del rango
+    header: bool     # El rango incluye la línea de encabezado
+
+    def open(self):
+        return io.BufferedReader(_RangeReader(self.path, self.start, self.end))
+
+    def __str__(self):
+        return self.path
+
+
+class _RangeReader(io.RawIOBase):
+    """Lectura binaria acotada a un rango de bytes de un archivo"""
+
+    def __init__(self, path: str, start: int, end: int):
+        self._file = open(path, 'rb')
+        self._file.seek(start)
+        self._remaining = end - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        read = self._file.readinto(memoryview(buffer)[:size])
+        self._remaining -= read
+        return read
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def _non_blank(buffer: bytes, data: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Filas con contenido: una línea vacía solo tiene espacios, tabulaciones o \\r"""
+    lengths = ends - starts
+    first = data[np.minimum(starts, len(data) - 1)] if len(data) else np.empty(0, dtype=np.uint8)
+    # Solo las líneas vacías o que empiezan con un espacio pueden estar vacías
+    candidates = (lengths == 0) | np.isin(first, np.frombuffer(BLANK_BYTES, dtype=np.uint8))
+    non_blank = ~candidates
+    for i in np.flatnonzero(candidates):
+        non_blank[i] = bool(buffer[starts[i]:ends[i]].strip(BLANK_BYTES))
+    return non_blank
+
+
+def split_csv(path: str, parts: int, header: bool) -> Optional[List[ByteRange]]:
+    """
+    Divide un CSV en hasta `parts` rangos de tamaño parecido, cortando solo en
+    saltos de línea que no estén dentro de un campo entre comillas.
+
+    El archivo se recorre una vez por bloques con NumPy: un salto de línea está
+    fuera de comillas si la cantidad de comillas anteriores es par (las comillas
+    escapadas "" no cambian la paridad).
+
+    Returns:
+        Optional[List[ByteRange]]: Los rangos, o None si el archivo no se puede
+        dividir (comillas sin cerrar o un solo rango)
+    """
+    size = os.path.getsize(path)
+    targets = [size * k // parts for k in range(1, parts)]
+    cuts = [(0, 0)]   # (byte donde empieza el rango, filas con contenido anteriores)
+    rows = 0          # Filas con contenido ya contadas (incluye el encabezado)
+    parity = 0        # Paridad de las comillas antes de `offset`
+    offset = 0        # Posición en el archivo del inicio de `pending`
+    pending = b''     # Fila incompleta del bloque anterior
+
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(SCAN_BLOCK_SIZE)
+            buffer = pending + block
+            if not buffer:
+                break
+            data = np.frombuffer(buffer, dtype=np.uint8)
+            quotes = np.flatnonzero(data == QUOTE)
+            newlines = np.flatnonzero(data == NEWLINE)
+            ends = newlines[((parity + np.searchsorted(quotes, newlines)) & 1) == 0]
+            if not block:
+                if (parity + len(quotes)) & 1:
+                    return None  # Comillas sin cerrar: que pandas reporte el error
+                ends = np.append(ends, len(data))  # Última fila sin salto de línea
+            starts = np.concatenate(([0], ends[:-1] + 1)).astype(np.int64)
+            counted = rows + np.cumsum(_non_blank(buffer, data, starts, ends))
+
+            # Cortes: el primer fin de fila a partir de cada objetivo
+            while targets and len(ends):
+                i = int(np.searchsorted(offset + ends, targets[0]))
+                if i >= len(ends):
+                    break
+                cut = offset + int(ends[i]) + 1
+                if cut < size and cut > cuts[-1][0]:
+                    cuts.append((cut, int(counted[i])))
+                targets = [target for target in targets if target >= cut]
+
+            if len(ends):
+                rows = int(counted[-1])
+                consumed = int(ends[-1]) + 1
+                parity = (parity + int(np.searchsorted(quotes, consumed))) & 1
+                pending = buffer[consumed:]
+                offset += consumed
+            else:
+                pending = buffer
+            if not block:
+                break
+
+    if len(cuts) < 2:
+        return None
+    header_rows = 1 if header else 0
+    bounds = cuts + [(size, rows)]
+    ranges = []
+    for i, ((start, before), (end, after)) in enumerate(zip(bounds, bounds[1:])):
+        first_row = max(before - header_rows, 0)
+        ranges.append(ByteRange(path, start, end, first_row, max(after - header_rows, 0) - first_row,
+                                header=header and i == 0))
+    return ranges
@@ -0,0 +1,85 @@
+"""
+Compactación de columnas de texto de baja cardinalidad a categóricas
+
+Una columna como region o canal repite unos pocos valores en millones de
+filas; como categórica guarda cada valor una sola vez y un código entero por
+fila. Las reglas con kernel se evalúan una vez por categoría (ver
+rule_kernels.RuleKernel) y Parquet escribe la columna con codificación de
+diccionario.
+"""
+from functools import reduce
+from typing import Any, List, Optional
+
+import pandas as pd
+
+
+def is_categorical(column: pd.Series) -> bool:
+    return isinstance(column.dtype, pd.CategoricalDtype)
+
+
+def compact_text(column: pd.Series, max_ratio: float, sample_rows: int) -> Optional[pd.Series]:
+    """
+    Convierte la columna a categórica si tiene pocos valores distintos por fila
+
+    La cardinalidad se estima con una muestra repartida en toda la columna (una
+    muestra sobreestima la proporción, así que el criterio es conservador) y
+    se confirma con las categorías reales.
+
+    Returns:
+        Optional[pd.Series]: La columna categórica, o None si no conviene convertirla
+    """
+    if is_categorical(column) or len(column) == 0:
+        return None
+    sample = column.iloc[::max(len(column) // sample_rows, 1)]
+    if sample.nunique() > max_ratio * len(sample):
+        return None
+    compact = column.astype('category')
+    if len(compact.cat.categories) > max_ratio * len(column):
+        return None
+    return compact
+
+
+def decode(column: pd.Series) -> pd.Series:
+    """Columna categórica de vuelta al tipo de sus categorías"""
+    return column.astype(column.dtype.categories.dtype)
+
+
+def decode_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """El DataFrame con sus columnas categóricas decodificadas (el mismo objeto si no tiene)"""
+    columns = [name for name, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+    if not columns:
+        return df
+    return df.assign(**{name: decode(df[name]) for name in columns})
+
+
+def has_categorical(df_value: Any) -> bool:
+    """Indica si un DataFrame (o diccionario de DataFrames) tiene columnas categóricas"""
+    frames = df_value.values() if isinstance(df_value, dict) else [df_value]
+    return any(isinstance(df, pd.DataFrame) and any(isinstance(dtype, pd.CategoricalDtype) for dtype in df.dtypes)
+               for df in frames)
+
+
+def decode_value(df_value: Any) -> Any:
+    """decode_frame sobre un DataFrame o sobre cada DataFrame de un diccionario"""
+    if isinstance(df_value, dict):
+        return {name: decode_frame(df) if isinstance(df, pd.DataFrame) else df for name, df in df_value.items()}
+    return decode_frame(df_value)
+
+
+def concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    pd.concat que conserva las columnas categóricas de todos los bloques
+
+    Cada bloque se compacta con sus propias categorías y pd.concat convierte a
+    texto las categóricas con categorías distintas; aquí se recodifican todas
+    con la unión de las categorías. Si un campo no quedó categórico en algún
+    bloque, queda como texto.
+    """
+    if len(frames) > 1:
+        first = frames[0]
+        shared = [name for name in first.columns
+                  if all(name in df.columns and is_categorical(df[name]) for df in frames)]
+        for name in shared:
+            categories = reduce(lambda a, b: a.union(b, sort=False), (df[name].cat.categories for df in frames))
+            frames = [df.assign(**{name: df[name].cat.set_categories(categories)}) for df in frames]
+    return pd.concat(frames)
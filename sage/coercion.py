@@ -0,0 +1,154 @@
+"""
+Conversión vectorizada de columnas a los tipos SAGE (texto, entero, decimal, fecha, booleano)
+
+Cada conversión devuelve la columna convertida y la máscara de celdas con valor
+que no se pudieron convertir (quedan nulas en la columna convertida), para
+reportar los errores de tipo de todas las filas a la vez en lugar de recorrer
+la columna celda por celda.
+"""
+import warnings
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+Coerced = Tuple[pd.Series, np.ndarray]  # (columna convertida, máscara de celdas que no se convirtieron)
+NumericParser = Callable[[pd.Series], pd.Series]
+
+# Valores aceptados como booleanos (texto en minúsculas; True/False y 1/0 se escriben igual)
+TRUE_VALUES = ('true', '1', '1.0')
+FALSE_VALUES = ('false', '0', '0.0')
+
+INT64_LIMIT = 2.0 ** 63
+
+# Lo que deja astype(str) en una celda de texto vacía: el texto 'None' con pandas 2
+# (required y las reglas no la ven vacía) o un nulo con pandas 3
+TEXT_NULL = pd.Series([None], dtype=object).astype(str).iloc[0]
+
+
+def _coerce_numeric(column: pd.Series) -> pd.Series:
+    return pd.to_numeric(column, errors='coerce')
+
+
+def _present(column: pd.Series) -> np.ndarray:
+    """Celdas con valor: ni nulas ni texto vacío"""
+    present = column.notna().to_numpy()
+    if column.dtype == object or isinstance(column.dtype, pd.StringDtype):
+        present = present & (column != '').to_numpy(dtype=bool, na_value=False)
+    return present
+
+
+def _failures(column: pd.Series, converted: pd.Series) -> np.ndarray:
+    return _present(column) & converted.isna().to_numpy()
+
+
+def is_final_text(column: pd.Series) -> bool:
+    """Indica si la columna ya tiene los valores que dejaría to_text"""
+    return isinstance(column.dtype, pd.StringDtype) and not (isinstance(TEXT_NULL, str) and column.hasnans)
+
+
+def to_text(column: pd.Series) -> Coerced:
+    """Cualquier valor se puede escribir como texto: no hay celdas que fallen"""
+    if not isinstance(column.dtype, pd.StringDtype):
+        column = column.replace({np.nan: None}).astype(str)
+    elif not is_final_text(column):
+        # Texto de Arrow (motor pyarrow): las celdas vacías quedan igual que con el lector de pandas
+        column = column.fillna(TEXT_NULL)
+    return column, np.zeros(len(column), dtype=bool)
+
+
+def to_decimal(column: pd.Series, parse: NumericParser = _coerce_numeric) -> Coerced:
+    converted = parse(column)
+    if not pd.api.types.is_float_dtype(converted):
+        converted = converted.astype('float64')
+    return converted, _failures(column, converted)
+
+
+def to_integer(column: pd.Series, parse: NumericParser = _coerce_numeric) -> Coerced:
+    """
+    Números enteros: int64, o float64 si quedan nulos (igual que los lee el parser)
+
+    Los números con decimales ('2.5') y los que no entran en int64 también fallan.
+    """
+    if pd.api.types.is_integer_dtype(column) and not pd.api.types.is_bool_dtype(column):
+        return column, np.zeros(len(column), dtype=bool)
+    numbers = parse(column).to_numpy(dtype='float64', na_value=np.nan, copy=True)
+    with np.errstate(invalid='ignore'):
+        integral = np.isfinite(numbers) & (np.floor(numbers) == numbers) & (np.abs(numbers) < INT64_LIMIT)
+    failures = _present(column) & ~integral
+    numbers[~integral] = np.nan
+    if integral.all():
+        return pd.Series(numbers.astype(np.int64), index=column.index, name=column.name), failures
+    return pd.Series(numbers, index=column.index, name=column.name), failures
+
+
+def to_boolean(column: pd.Series) -> Coerced:
+    """
+    True/False, 1/0 y los textos 'true'/'false'/'1'/'0' (sin distinguir mayúsculas).
+
+    Devuelve bool, o el booleano con nulos de pandas si hay celdas vacías o inválidas.
+    """
+    if pd.api.types.is_bool_dtype(column):
+        return column, np.zeros(len(column), dtype=bool)
+    if pd.api.types.is_numeric_dtype(column):
+        values = column.to_numpy(dtype='float64', na_value=np.nan)
+        truthy, falsy = values == 1, values == 0
+    else:
+        text = column.astype(str).str.lower()
+        truthy = text.isin(TRUE_VALUES).to_numpy(dtype=bool)
+        falsy = text.isin(FALSE_VALUES).to_numpy(dtype=bool)
+    valid = truthy | falsy
+    failures = _present(column) & ~valid
+    if valid.all():
+        return pd.Series(truthy, index=column.index, name=column.name), failures
+    converted = pd.Series(pd.arrays.BooleanArray(truthy, ~valid), index=column.index, name=column.name)
+    return converted, failures
+
+
+class DateFormatCache:
+    """
+    Formato de fecha de cada campo, inferido una sola vez y reutilizado.
+
+    pd.to_datetime sin formato lo infiere del primer valor de cada llamada; con
+    la caché todos los bloques (streaming) y rangos (validación en paralelo) de
+    un archivo usan el formato inferido del primer valor del campo, y ninguno
+    repite la inferencia.
+    """
+
+    def __init__(self, formats: Optional[Dict[Hashable, Optional[str]]] = None):
+        self._formats: Dict[Hashable, Optional[str]] = dict(formats or {})
+
+    def infer(self, key: Hashable, column: pd.Series) -> Optional[str]:
+        """
+        Formato del campo `key`; si aún no se conoce, se infiere del primer valor de la columna
+
+        Returns:
+            Optional[str]: El formato, o None si no se pudo inferir (pandas interpreta cada valor)
+        """
+        if key in self._formats:
+            return self._formats[key]
+        present = np.flatnonzero(_present(column))
+        if len(present) == 0:
+            return None  # Sin valores: se infiere en el próximo bloque
+        first = column.iloc[present[0]]
+        date_format = None
+        if isinstance(first, str):
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                date_format = guess_datetime_format(first)
+        self._formats[key] = date_format
+        return date_format
+
+    def as_dict(self) -> Dict[Hashable, Optional[str]]:
+        return dict(self._formats)
+
+
+def to_date(column: pd.Series, formats: DateFormatCache, key: Hashable) -> Coerced:
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column, np.zeros(len(column), dtype=bool)
+    date_format = formats.infer(key, column)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # Formato no inferido: pandas avisa que interpreta cada valor
+        converted = pd.to_datetime(column, format=date_format, errors='coerce')
+    return converted, _failures(column, converted)
@@ -0,0 +1,206 @@
+"""
+Grupos de errores por (catálogo, campo, regla)
+
+En un archivo grande, una regla que falla en medio millón de filas solo
+registraba como eventos las primeras MAX_ERRORS_PER_RULE, todas del inicio
+del archivo. ErrorGroups resume en un grupo cada verificación que falló:
+
+- count: filas que fallaron; exacto salvo que la regla se haya descartado por
+  exceso de errores en streaming (count_exact es False y count es un mínimo)
+- distinct_values: valores distintos entre esas filas, estimados con un
+  sketch KMV (los SKETCH_SIZE hashes más chicos); exacto mientras haya menos
+- examples: SAMPLE_SIZE filas de ejemplo elegidas por muestreo de reservorio,
+  repartidas de manera uniforme por todo el archivo
+
+Los grupos de los procesos hijos (catálogos o rangos en paralelo) se exportan
+con export() y se combinan en el proceso principal con merge().
+"""
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .event_store import json_safe
+from .utils import env_int
+
+GroupKey = Tuple[str, Optional[str], str]  # (archivo, campo, regla)
+
+
+def _take(values: Any, positions: np.ndarray) -> list:
+    """Valores en las posiciones indicadas de una Serie, arreglo o lista"""
+    if isinstance(values, pd.Series):
+        return values.iloc[positions].tolist()
+    return [values[i] for i in positions.tolist()]
+
+
+class ErrorGroup:
+    """Conteo exacto, valores distintos estimados y muestra de filas de una verificación"""
+
+    def __init__(self, key: GroupKey, severity: str, message: str, sample_size: int, sketch_size: int):
+        self.key = key
+        self.severity = severity
+        self.message = message
+        self.sample_size = sample_size
+        self.sketch_size = sketch_size
+        self.count = 0
+        self.first_line: Optional[int] = None
+        self.last_line: Optional[int] = None
+        self.examples: List[Tuple[int, Any]] = []     # (línea, valor), a lo sumo sample_size
+        self.sketch = np.empty(0, dtype=np.uint64)    # Hashes más chicos de los valores, ordenados
+        self.has_values = False
+        self.count_exact = True  # False si la regla dejó de evaluarse en parte del archivo
+        # Semilla fija por grupo: la misma entrada produce siempre los mismos ejemplos
+        self._rng = np.random.default_rng(zlib.crc32(repr(key).encode('utf-8')))
+
+    def add(self, lines: np.ndarray, values: Any = None) -> None:
+        """Suma filas que fallaron: sus números de línea y, si la verificación los tiene, sus valores"""
+        n = len(lines)
+        if n == 0:
+            return
+        # Muestreo de reservorio (algoritmo R) vectorizado: la fila en la posición t
+        # del grupo reemplaza un ejemplo al azar con probabilidad sample_size / t
+        fill = max(0, min(n, self.sample_size - self.count))
+        rest = np.arange(fill, n)
+        slots = (self._rng.random(len(rest)) * (self.count + rest + 1)).astype(np.int64)
+        kept = slots < self.sample_size
+        positions = np.concatenate([np.arange(fill), rest[kept]])
+        sampled = list(zip(np.asarray(lines)[positions].tolist(),
+                           _take(values, positions) if values is not None else [None] * len(positions)))
+        self.examples.extend(sampled[:fill])
+        for slot, example in zip(slots[kept].tolist(), sampled[fill:]):
+            self.examples[slot] = example
+
+        self.count += n
+        first, last = int(np.min(lines)), int(np.max(lines))
+        self.first_line = first if self.first_line is None else min(self.first_line, first)
+        self.last_line = last if self.last_line is None else max(self.last_line, last)
+        if values is not None:
+            series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+            self._add_hashes(pd.util.hash_pandas_object(series, index=False).to_numpy())
+
+    def _add_hashes(self, hashes: np.ndarray) -> None:
+        if len(self.sketch) >= self.sketch_size:
+            hashes = hashes[hashes < self.sketch[-1]]  # Los mayores no pueden entrar al sketch
+        self.sketch = np.union1d(self.sketch, hashes)[:self.sketch_size]
+        self.has_values = True
+
+    def merge(self, other: Dict[str, Any]) -> None:
+        """Combina el grupo exportado por otro proceso (ver export)"""
+        total = self.count + other['count']
+        examples = [tuple(example) for example in other['examples']]
+        if len(self.examples) + len(examples) > self.sample_size:
+            # Cada muestra es uniforme sobre sus filas: de cuántos ejemplos aporta cada
+            # una sale de una hipergeométrica, como si se muestreara el grupo completo
+            from_self = int(self._rng.hypergeometric(self.count, other['count'], self.sample_size))
+            mine = self._rng.choice(len(self.examples), from_self, replace=False)
+            theirs = self._rng.choice(len(examples), self.sample_size - from_self, replace=False)
+            self.examples = [self.examples[i] for i in sorted(mine)] + [examples[i] for i in sorted(theirs)]
+        else:
+            self.examples = self.examples + examples
+        self.count = total
+        self.count_exact = self.count_exact and other.get('count_exact', True)
+        for attribute, pick in (('first_line', min), ('last_line', max)):
+            value = other[attribute]
+            if value is not None:
+                current = getattr(self, attribute)
+                setattr(self, attribute, value if current is None else pick(current, value))
+        if other['has_values']:
+            self._add_hashes(np.asarray(other['sketch'], dtype=np.uint64))
+
+    def distinct_values(self) -> Tuple[Optional[int], bool]:
+        """(valores distintos, si el número es exacto); None si la verificación no tiene valores"""
+        if not self.has_values:
+            return None, True
+        if len(self.sketch) < self.sketch_size:
+            return len(self.sketch), True
+        # Estimador KMV: k hashes uniformes en [0, 2^64) cubren una fracción kth / 2^64
+        kth = float(self.sketch[-1]) / 2.0 ** 64
+        return max(int(round((self.sketch_size - 1) / kth)), self.sketch_size), False
+
+    def export(self) -> Dict[str, Any]:
+        return {'key': self.key, 'severity': self.severity, 'message': self.message, 'count': self.count,
+                'first_line': self.first_line, 'last_line': self.last_line, 'examples': self.examples,
+                'sketch': self.sketch, 'has_values': self.has_values, 'count_exact': self.count_exact}
+
+    def as_dict(self) -> Dict[str, Any]:
+        distinct, exact = self.distinct_values()
+        file_name, field_name, rule = self.key
+        return {
+            'file': file_name,
+            'field': field_name,
+            'rule': rule,
+            'severity': self.severity,
+            'message': self.message,
+            'count': self.count,
+            'count_exact': self.count_exact,
+            'distinct_values': distinct,
+            'distinct_exact': exact,
+            'first_line': self.first_line,
+            'last_line': self.last_line,
+            'examples': [{'line': line, 'value': json_safe(value)} if self.has_values else {'line': line}
+                         for line, value in sorted(self.examples, key=lambda example: example[0])]
+        }
+
+
+class ErrorGroups:
+    """Grupos de errores y advertencias de una validación, por (archivo, campo, regla)"""
+
+    SAMPLE_SIZE = 10     # Filas de ejemplo por grupo
+    SKETCH_SIZE = 1024   # Hashes del sketch de valores distintos (error típico ~3%)
+
+    def __init__(self, sample_size: Optional[int] = None, sketch_size: Optional[int] = None):
+        """
+        Args:
+            sample_size: Por defecto SAGE_ERROR_SAMPLES o SAMPLE_SIZE
+        """
+        self.sample_size = max(sample_size or env_int('SAGE_ERROR_SAMPLES', self.SAMPLE_SIZE) or self.SAMPLE_SIZE, 1)
+        self.sketch_size = max(sketch_size or self.SKETCH_SIZE, 2)
+        self._groups: Dict[GroupKey, ErrorGroup] = {}
+
+    def _group(self, key: GroupKey, severity: str, message: str) -> ErrorGroup:
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = ErrorGroup(key, severity, message, self.sample_size, self.sketch_size)
+        return group
+
+    def add(self, file_name: str, field_name: Optional[str], rule: str, severity: str, message: str,
+            lines: np.ndarray, values: Any = None) -> None:
+        """
+        Suma al grupo las filas que fallaron una verificación
+
+        Args:
+            rule: Nombre de la regla, o el tipo de verificación (type, required, unique, unique_key)
+            lines: Números de línea de las filas
+            values: Valores de las filas (Serie, arreglo o lista), si la verificación los tiene
+        """
+        if len(lines):
+            self._group((file_name, field_name, rule), severity, message).add(lines, values)
+
+    def mark_partial(self, file_name: str, field_name: Optional[str], rule: str) -> None:
+        """Indica que la regla no se evaluó en parte del archivo: su conteo es un mínimo"""
+        group = self._groups.get((file_name, field_name, rule))
+        if group is not None:
+            group.count_exact = False
+
+    def merge(self, other: List[Dict[str, Any]]) -> None:
+        """Combina los grupos de otro proceso (ver ErrorGroups.export)"""
+        for exported in other:
+            key = tuple(exported['key'])
+            if key in self._groups:
+                self._groups[key].merge(exported)
+            else:
+                group = self._group(key, exported['severity'], exported['message'])
+                group.merge(exported)
+
+    def export(self) -> List[Dict[str, Any]]:
+        """Estado completo de los grupos, para enviarlo desde un proceso hijo"""
+        return [group.export() for group in self._groups.values()]
+
+    def as_list(self) -> List[Dict[str, Any]]:
+        """Grupos para los reportes, del que tiene más filas al que tiene menos"""
+        groups = sorted(self._groups.values(), key=lambda group: (group.severity != 'error', -group.count))
+        return [group.as_dict() for group in groups]
+
+    def __len__(self) -> int:
+        return len(self._groups)
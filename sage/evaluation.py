@@ -0,0 +1,146 @@
+"""
+Contexto de evaluación de reglas: máscaras de no nulos y vistas filtradas
+compartidas por campo, y tiempos de evaluación por regla
+"""
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .arrow_engine import null_mask
+
+
+@dataclass
+class AllocationStats:
+    """Contadores de asignaciones durante la evaluación de reglas de campo"""
+    rule_evaluations: int = 0   # Reglas de campo evaluadas (antes: una copia del DataFrame por cada una)
+    masks_computed: int = 0     # Máscaras de no nulos calculadas
+    masks_reused: int = 0       # Veces que se reutilizó una máscara ya calculada
+    views_shared: int = 0       # Vistas sin copia: el campo no tiene nulos y se comparten los datos del original
+    views_copied: int = 0       # Vistas que necesitaron copiar las filas con valor
+    views_reused: int = 0       # Veces que una regla reutilizó una vista ya construida
+    bytes_copied: int = 0       # Bytes copiados al construir vistas
+
+    def merge(self, other: Dict[str, int]) -> None:
+        """Suma los contadores de otro proceso (ver AllocationStats.as_dict)"""
+        for key, value in other.items():
+            setattr(self, key, getattr(self, key) + value)
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class RuleTiming:
+    """Tiempo acumulado de una regla con un motor (eval, numpy, hash, arrow, re)"""
+    rule: str
+    engine: str
+    level: str = ''        # field, row, catalog o package
+    scope: str = ''        # Catálogo (y campo) o paquete al que pertenece la regla
+    evaluations: int = 0
+    rows: int = 0          # Filas sobre las que se evaluó
+    failures: int = 0      # Filas que no cumplieron la regla
+    seconds: float = 0.0
+
+
+class RuleTimings:
+    """Tiempos de evaluación, filas y fallas por regla y motor, para encontrar las reglas lentas"""
+
+    def __init__(self):
+        self._timings: Dict[Tuple[str, str, str, str], RuleTiming] = {}
+
+    def add(self, rule: str, engine: str, seconds: float, evaluations: int = 1, rows: int = 0,
+            failures: int = 0, level: str = '', scope: str = '') -> None:
+        key = (level, scope, rule, engine)
+        timing = self._timings.get(key)
+        if timing is None:
+            timing = self._timings[key] = RuleTiming(rule, engine, level, scope)
+        timing.evaluations += evaluations
+        timing.rows += rows
+        timing.failures += failures
+        timing.seconds += seconds
+
+    def merge(self, other: List[Dict[str, Any]]) -> None:
+        """Suma los tiempos de otro proceso (ver RuleTimings.as_list)"""
+        for timing in other:
+            self.add(**timing)
+
+    def as_list(self) -> List[Dict[str, Any]]:
+        """Tiempos de la regla más lenta a la más rápida"""
+        timings = sorted(self._timings.values(), key=lambda t: t.seconds, reverse=True)
+        return [{**asdict(t), 'seconds': round(t.seconds, 6)} for t in timings]
+
+    def __len__(self) -> int:
+        return len(self._timings)
+
+
+class EvaluationContext:
+    """
+    Caché por catálogo (o por bloque, en streaming) de lo que comparten las reglas de un campo.
+
+    Antes cada regla de campo hacía df.dropna(subset=[campo]), copiando el
+    DataFrame completo una vez por regla. El contexto calcula la máscara de
+    no nulos de cada campo una sola vez y construye una única vista filtrada
+    por campo: una copia superficial del DataFrame si el campo no tiene nulos
+    (comparte los datos; con copy-on-write una regla que la modifique no toca
+    el original), o una copia de las filas con valor limitada a las columnas
+    que leen sus reglas.
+
+    Se libera con release() al terminar el catálogo.
+    """
+
+    def __init__(self, df: pd.DataFrame, stats: Optional[AllocationStats] = None):
+        self.df = df
+        self.stats = stats if stats is not None else AllocationStats()
+        self._masks: Dict[str, np.ndarray] = {}
+        self._views: Dict[Tuple[str, Optional[Tuple[str, ...]]], pd.DataFrame] = {}
+
+    def not_null(self, field_name: str) -> np.ndarray:
+        """Máscara de filas con valor en el campo"""
+        mask = self._masks.get(field_name)
+        if mask is None:
+            mask = ~null_mask(self.df[field_name])
+            self._masks[field_name] = mask
+            self.stats.masks_computed += 1
+        else:
+            self.stats.masks_reused += 1
+        return mask
+
+    def filtered(self, field_name: str, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Filas con valor en el campo (equivale a df.dropna(subset=[field_name]))
+
+        Args:
+            columns: Columnas que necesitan las reglas (None: todas). El campo se incluye siempre.
+        """
+        key = (field_name, tuple(sorted(columns)) if columns is not None else None)
+        view = self._views.get(key)
+        if view is not None:
+            # Cada regla recibe su propia copia superficial: lo que una le asigne
+            # a la vista no lo ve la siguiente regla del mismo campo
+            self.stats.views_reused += 1
+            return view.copy(deep=False)
+
+        mask = self.not_null(field_name)
+        if mask.all():
+            # Copia superficial: no copia los datos, pero lo que una regla le
+            # asigne no llega al DataFrame que validan los demás campos
+            view = self.df.copy(deep=False)
+            self.stats.views_shared += 1
+        else:
+            if columns is None:
+                view = self.df[mask]
+            else:
+                wanted = set(columns) | {field_name}
+                view = self.df.loc[mask, [column for column in self.df.columns if column in wanted]]
+            self.stats.views_copied += 1
+            self.stats.bytes_copied += int(view.memory_usage(index=True, deep=False).sum())
+        self._views[key] = view
+        return view.copy(deep=False)
+
+    def release(self) -> None:
+        """Libera las máscaras y vistas del catálogo"""
+        self._masks.clear()
+        self._views.clear()
+        self.df = None
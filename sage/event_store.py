@@ -0,0 +1,141 @@
+"""
+Almacén de eventos de una ejecución (SageLogger.events y validation_failures)
+
+Un archivo con millones de filas inválidas produce millones de eventos. En
+lugar de guardarlos todos en listas, el almacén conserva en memoria solo los
+últimos WINDOW y agrega los anteriores, como una línea JSON compacta cada uno,
+a un archivo del directorio de la ejecución (events.jsonl). Recorrerlo lee
+primero el archivo y luego la ventana en memoria, en el orden en que se
+registraron, de modo que los reportes se generan leyendo un evento a la vez y
+la memoria no crece con la cantidad de eventos.
+"""
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .utils import env_int
+
+
+def json_safe(value: Any) -> Any:
+    """
+    Valor equivalente que se puede escribir en JSON y leer de vuelta igual:
+    tuplas como listas, escalares de numpy como números de Python, excepciones
+    con to_dict() como diccionario y cualquier otro objeto como texto
+    """
+    if value is None or (isinstance(value, (str, bool, int, float)) and not hasattr(value, 'item')):
+        return value  # numpy.float64 hereda de float, pero se convierte más abajo
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): json_safe(item) for key, item in value.items()}
+    if hasattr(value, 'to_dict') and callable(value.to_dict) and isinstance(value, Exception):
+        return value.to_dict()
+    if hasattr(value, 'item') and callable(value.item):  # Escalares de numpy
+        try:
+            return json_safe(value.item())
+        except (TypeError, ValueError):
+            pass
+    return str(value)
+
+
+class EventStore:
+    """Lista de eventos con los más recientes en memoria y el resto en un archivo JSONL"""
+
+    WINDOW = 1000  # Eventos que se conservan en memoria antes de pasarlos al archivo
+
+    def __init__(self, path: Optional[str] = None, window: Optional[int] = None):
+        """
+        Args:
+            path: Archivo JSONL donde se agregan los eventos; None los guarda todos en memoria
+            window: Por defecto SAGE_EVENT_WINDOW o WINDOW
+        """
+        self.path = path
+        self.window = max(window or env_int('SAGE_EVENT_WINDOW', self.WINDOW) or self.WINDOW, 1)
+        self._memory: List[Dict[str, Any]] = []
+        self._spilled = 0  # Eventos ya escritos en el archivo
+        self._handle = None
+
+    @classmethod
+    def from_file(cls, path: str) -> 'EventStore':
+        """Almacén con los eventos de un archivo JSONL escrito por write_jsonl (solo lectura)"""
+        store = cls(path)
+        with open(path, encoding='utf-8') as f:
+            store._spilled = sum(1 for _ in f)
+        return store
+
+    def append(self, event: Dict[str, Any]) -> None:
+        self._memory.append(event)
+        if self.path is not None and len(self._memory) >= self.window:
+            self._spill()
+
+    def extend(self, events: Iterable[Dict[str, Any]]) -> None:
+        for event in events:
+            self.append(event)
+
+    def _spill(self) -> None:
+        """Agrega al archivo los eventos de la ventana en memoria"""
+        if self._handle is None:
+            # El primer volcado vacía el archivo (de una ejecución anterior en el mismo directorio)
+            self._handle = open(self.path, 'a' if self._spilled else 'w', encoding='utf-8')
+        self._handle.write(''.join(json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n'
+                                   for event in self._memory))
+        self._spilled += len(self._memory)
+        self._memory = []
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._memory)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        memory = list(self._memory)  # Los eventos que lleguen mientras se recorre no se incluyen
+        spilled = self._spilled
+        if spilled:
+            if self._handle is not None:
+                self._handle.flush()
+            with open(self.path, encoding='utf-8') as f:
+                for _, line in zip(range(spilled), f):
+                    yield json.loads(line)
+        yield from memory
+
+    def rebuild(self, *sources: Iterable[Dict[str, Any]]) -> None:
+        """
+        Reemplaza el contenido por los eventos de `sources`, en orden (pueden incluir
+        este mismo almacén); se escriben en un archivo nuevo que reemplaza al actual
+        """
+        temp = EventStore(self.path + '.tmp' if self.path is not None else None, self.window)
+        for source in sources:
+            temp.extend(source)
+        temp.close()
+        self.close()
+        if self.path is not None:
+            if temp._spilled:
+                os.replace(temp.path, self.path)
+            elif self._spilled:
+                os.remove(self.path)
+        self._memory, self._spilled = temp._memory, temp._spilled
+
+    def persist(self) -> None:
+        """Pasa al archivo también la ventana en memoria, para que quede con todos los eventos"""
+        if self.path is not None and self._memory:
+            self._spill()
+        self.close()
+
+    def write_jsonl(self, path: str) -> None:
+        """Escribe todos los eventos en un archivo JSONL, uno a la vez"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for event in self:
+                f.write(json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+    def close(self) -> None:
+        """Cierra el archivo; si se agregan más eventos, se vuelve a abrir"""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def remove(self) -> None:
+        """Cierra y borra el archivo (p. ej. al reemplazar el almacén)"""
+        self.close()
+        if self.path is not None and self._spilled:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
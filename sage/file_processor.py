@@ -1,31 +1,116 @@
 """File processing functionality for SAGE"""
 import os
+import codecs
 import zipfile
-import tempfile
+import io
+import time
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Set, Union
 from .models import SageConfig, Catalog, Package, ValidationRule, Severity
 from .logger import SageLogger
 from .exceptions import FileProcessingError
+from .rule_compiler import compile_rule
+from .rule_analysis import merge_package_columns, merge_rule_columns
+from .error_groups import ErrorGroups
+from .evaluation import AllocationStats, EvaluationContext, RuleTimings
+from .profiling import MemoryProfile, StageTimings, timed_stage
+from . import arrow_engine
+from .ingest import LATIN1_FALLBACK, SAMPLE_SIZE, csv_read_options, first_row, sniff_encoding
+from .byte_ranges import ByteRange, split_csv
+from . import coercion
+from .categorical import compact_text, concat_frames, decode_value, has_categorical
+from .incremental import IncrementalStore, PrefixState, scan_prefix
+from .package_sql import PackageSQL
+from .parallel import (CatalogResult, CatalogTask, RangeTask, WorkerOutput, process_pool, validate_catalog_task,
+                       validate_range_task)
+from .streaming import CatalogStreamState
+from .uniqueness import UniquenessIndex
+from .utils import env_flag, env_int, get_peak_rss_mb
+
+class ZipMember:
+    """
+    Miembro de un archivo ZIP que se lee directamente del archivo comprimido,
+    sin extraerlo a disco. Cada open() devuelve un flujo nuevo que descomprime
+    el miembro al vuelo.
+    """
+
+    def __init__(self, zip_ref: zipfile.ZipFile, name: str):
+        self.zip_ref = zip_ref
+        self.name = name
+
+    def open(self):
+        return self.zip_ref.open(self.name)
+
+    def __str__(self):
+        return self.name
+
+    def __reduce__(self):
+        # Al enviarlo a otro proceso se reabre el ZIP a partir de su ruta
+        return (_open_zip_member, (self.zip_ref.filename, self.name))
+
+
+def _open_zip_member(zip_path: str, name: str) -> ZipMember:
+    return ZipMember(zipfile.ZipFile(zip_path, 'r'), name)
+
+
+def open_source(source):
+    """Abre en modo binario una ruta de archivo, un miembro de ZIP o un rango de bytes"""
+    if isinstance(source, (ZipMember, ByteRange)):
+        return source.open()
+    return open(source, 'rb')
+
+
+def read_csv_source(source, **kwargs) -> pd.DataFrame:
+    """pd.read_csv sobre una ruta o un miembro de ZIP (abriendo un flujo nuevo en cada lectura)"""
+    with open_source(source) as f:
+        return pd.read_csv(f, **kwargs)
+
 
 def detect_bom(file_path):
     """
     Detecta si un archivo tiene BOM (Byte Order Mark)
 
     Args:
-        file_path: Ruta al archivo a comprobar
+        file_path: Ruta al archivo a comprobar o miembro de ZIP (ZipMember);
+            solo se leen los primeros bytes del flujo
 
     Returns:
         bool: True si el archivo tiene BOM, False en caso contrario
     """
     try:
-        with open(file_path, 'rb') as f:
+        with open_source(file_path) as f:
             # BOM UTF-8: EF BB BF
             return f.read(3) == b'\xef\xbb\xbf'
     except Exception:
         return False
 
+def detect_encoding(file_path, block_size=1024 * 1024):
+    """
+    Detecta la codificación de un CSV recorriéndolo por bloques sin cargarlo en memoria
+
+    Args:
+        file_path: Ruta al archivo a comprobar o miembro de ZIP (ZipMember)
+        block_size: Tamaño de cada bloque leído
+
+    Returns:
+        str: 'utf-8-sig' si tiene BOM, 'utf-8' si todo el archivo es UTF-8 válido, 'latin1' en otro caso
+    """
+    if detect_bom(file_path):
+        return 'utf-8-sig'
+
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        with open_source(file_path) as f:
+            while True:
+                block = f.read(block_size)
+                if not block:
+                    decoder.decode(b'', final=True)
+                    return 'utf-8'
+                decoder.decode(block)
+    except UnicodeDecodeError:
+        return 'latin1'
+
 def create_column_names(n_columns):
     """
     Crear nombres de columnas en formato COLUMNA_N
@@ -51,6 +136,18 @@ class FileProcessor:
     MAX_ERRORS_PER_RULE = 10       # Máximo número de errores a mostrar por regla
     SMALL_FILE_THRESHOLD = 30      # Número de filas bajo el cual un archivo se considera "pequeño"
 
+    # Validación por bloques (streaming) de archivos CSV
+    STREAMING_CHUNK_SIZE = 100_000     # Filas por bloque si el YAML no indica chunk_size
+    STREAMING_MIN_CHUNK_SIZE = 1_000   # Evita bloques tan pequeños que distorsionen los límites de errores
+
+    # Validación en paralelo de un CSV grande, dividido en rangos de bytes
+    PARALLEL_CSV_MIN_MB = 256          # Tamaño desde el cual un CSV se divide entre procesos (con SAGE_PARALLEL_CSV_WORKERS > 1)
+
+    # Compactación a categóricos de los campos texto con pocos valores distintos (SAGE_CATEGORICAL_TEXT=1)
+    CATEGORICAL_MAX_RATIO = 0.05       # Máximo de valores distintos por fila para compactar un campo
+    CATEGORICAL_MIN_ROWS = 1_000       # En tablas (o bloques) más chicas no vale la pena
+    CATEGORICAL_SAMPLE_ROWS = 10_000   # Filas de la muestra con que se estima la cardinalidad
+
     # Mapeo de tipos SAGE a tipos pandas
     TYPE_MAPPING = {
         'texto': str,
@@ -71,9 +168,57 @@ class FileProcessor:
         self.field_rules_skipped = {}   # {field_name: {rule_name: error_count}}
         self.row_rules_skipped = {}     # {catalog_name: {rule_name: error_count}}
         self.catalog_rules_skipped = {} # {catalog_name: {rule_name: error_count}}
-
-    def _validate_data_types(self, df: pd.DataFrame, catalog: Catalog) -> pd.DataFrame:
-        """Validate and convert data types according to field specifications"""
+        # field_rules_skipped se agrupa por nombre de campo para el reporte; el descarte
+        # se aplica por catálogo, para no omitir la regla en otro catálogo con el mismo campo
+        self._skipped_field_rules: Set[Tuple[str, str, str]] = set()
+
+        # Streaming de CSV: se activa por catálogo (file_format.streaming) o globalmente con SAGE_STREAMING_CSV
+        self.streaming_enabled = env_flag('SAGE_STREAMING_CSV')
+        self.streaming_chunk_size = env_int('SAGE_STREAMING_CHUNK_SIZE', self.STREAMING_CHUNK_SIZE)
+        # Si es False, en modo streaming solo se materializan los catálogos que lo necesitan
+        # (reglas de catálogo o de paquete); main.py lo desactiva cuando no habrá materializaciones
+        self.retain_dataframes = True
+        self.last_peak_rss_mb = None
+        self.coercion_failures = {}  # {archivo: {campo: máscara de valores que no se pudieron convertir}}
+        self.date_formats = coercion.DateFormatCache()  # Formato de fecha inferido por (archivo, campo)
+        self.allocation_stats = AllocationStats()  # Asignaciones al evaluar reglas de campo (ver EvaluationContext)
+        self.rule_timings = RuleTimings()  # Tiempo de evaluación por regla y motor
+        self.error_groups = ErrorGroups()  # Filas que fallaron por (archivo, campo, regla), con ejemplos
+        # Seguir evaluando las reglas descartadas por exceso de errores para contar todas sus filas
+        self.error_groups_full = env_flag('SAGE_ERROR_GROUPS_FULL')
+        # Tiempo por etapa; se comparte con el logger para descontar el registro de eventos de cada etapa
+        self.stage_timings = getattr(logger, 'stage_timings', None) or StageTimings()
+        self.memory = MemoryProfile()  # Huella de los DataFrames después de leer, convertir y validar
+
+        # Procesos para validar en paralelo los catálogos de un ZIP (0 o 1: secuencial)
+        self.parallel_workers = env_int('SAGE_PARALLEL_CATALOGS', 0)
+        # Procesos para validar por rangos un CSV suelto de al menos parallel_csv_min_mb (0 o 1: desactivado,
+        # el valor por defecto: cambia la memoria y la CPU que usa cada validación, así que se activa explícitamente)
+        self.parallel_csv_workers = env_int('SAGE_PARALLEL_CSV_WORKERS', 0)
+        self.parallel_csv_min_mb = env_int('SAGE_PARALLEL_CSV_MIN_MB', self.PARALLEL_CSV_MIN_MB)
+        # Campos texto de baja cardinalidad como categóricos (también en self.dataframes y las materializaciones)
+        self.categorical_text = env_flag('SAGE_CATEGORICAL_TEXT')
+        # Prefijos validados de los catálogos con file_format.incremental (None: desactivado con SAGE_INCREMENTAL=0)
+        self.incremental_store = IncrementalStore.from_env()
+
+        # Motor de lectura de CSV: se elige por catálogo (file_format.engine) o globalmente con SAGE_ENGINE
+        engine = os.environ.get('SAGE_ENGINE', '').strip().lower()
+        self.engine = engine if engine in arrow_engine.ENGINES else arrow_engine.ENGINE_PANDAS
+
+    @timed_stage('conversion')
+    def _validate_data_types(self, df: pd.DataFrame, catalog: Catalog,
+                             state: Optional[CatalogStreamState] = None) -> pd.DataFrame:
+        """
+        Validate and convert data types according to field specifications
+
+        Cada campo se convierte de una vez con el módulo coercion; las celdas con
+        valor que no se pudieron convertir quedan nulas y se reportan en bloque
+        como errores de tipo. Deja en self.coercion_failures, por archivo y campo,
+        la máscara de esas filas para las validaciones siguientes.
+        """
+        self._record_memory(catalog, 'after_read', df)
+        coercion_failures = self.coercion_failures[catalog.filename] = {}
+        is_large_file = self._is_large_file(df, state)
         for field in catalog.fields:
             if field.type not in self.TYPE_MAPPING:
                 raise FileProcessingError(
@@ -81,210 +226,130 @@ class FileProcessor:
                     f"Los tipos soportados son: {', '.join(self.TYPE_MAPPING.keys())}"
                 )
 
-            try:
-                # Intentar convertir al tipo especificado
-                target_type = self.TYPE_MAPPING[field.type]
-
-                # Para campos de texto, reemplazar NaN por None antes de convertir
-                if field.type == 'texto':
-                    df[field.name] = df[field.name].replace({np.nan: None})
-
-                # Convertir la columna al tipo especificado
-                if field.type == 'fecha':
-                    # Para fechas, usar pd.to_datetime en lugar de astype
-                    df[field.name] = pd.to_datetime(df[field.name], errors='coerce')
-                elif field.type in ['entero', 'decimal'] and not field.required:
-                    # Para campos numéricos opcionales, usar pd.to_numeric con coerce
-                    # para convertir a numéricos pero preservar NaN donde corresponda
-                    df[field.name] = pd.to_numeric(df[field.name], errors='coerce')
-
-                    # Si es campo entero, convertir a entero los números sin decimales
-                    if field.type == 'entero':
-                        # Verificar si cada valor es efectivamente un entero
-                        mask = df[field.name].notna() & df[field.name].apply(lambda x: float(x).is_integer() if pd.notnull(x) and not isinstance(x, bool) else False)
-                        if mask.any():
-                            df.loc[mask, field.name] = df.loc[mask, field.name].astype('Int64')
-                elif field.type == 'entero':
-                    # Si es campo entero, convertir a entero los números sin decimales
-                    mask = df[field.name].notna()
-                    if mask.any():
-                        # Convertir solo valores numéricos que son enteros
-                        numeric_mask = mask & df[field.name].apply(lambda x: isinstance(x, (int, float)) and float(x).is_integer())
-                        if numeric_mask.any():
-                            df.loc[numeric_mask, field.name] = df.loc[numeric_mask, field.name].astype('int64')
-                else:
-                    df[field.name] = df[field.name].astype(target_type)
-
-            except (ValueError, TypeError) as e:
-                # Identificar las filas con errores de tipo
-                if field.type in ['decimal', 'entero']:
-                    # Si el campo es opcional, permitir valores NaN y cadenas vacías
-                    if not field.required:
-                        # Convertir a numérico con coerce, pero considerar válidos los NaN/vacíos originales
-                        numeric_values = pd.to_numeric(df[field.name], errors='coerce')
-                        # Solo marcar como inválidos los valores que no son numéricos y no son NaN/vacíos originales
-                        invalid_mask = numeric_values.isna() & ~(
-                            df[field.name].isna() | 
-                            (df[field.name] == '') | 
-                            (df[field.name] == 'nan') | 
-                            (df[field.name].astype(str) == 'nan')
-                        )
-                    else:
-                        # Si el campo es requerido, cualquier NaN o valor no numérico es inválido
-                        invalid_mask = pd.to_numeric(df[field.name], errors='coerce').isna()
-
-                    invalid_rows = df[invalid_mask]
-                elif field.type == 'fecha':
-                    # Para fechas, usar pd.to_datetime con coerce para detectar valores inválidos
-                    invalid_mask = pd.to_datetime(df[field.name], errors='coerce').isna()
-                    invalid_rows = df[invalid_mask]
-                elif field.type == 'texto':
-                    # Para texto, verificar los valores que no son str o son NaN
-                    invalid_mask = df[field.name].apply(lambda x: x is not None and not isinstance(x, str))
-                    invalid_rows = df[invalid_mask]
-                elif field.type == 'booleano':
-                    # Para booleanos, permitir valores "verdaderos": True, 1, "1", "true", "True", etc.
-                    # y valores "falsos": False, 0, "0", "false", "False", etc.
-                    # Todo lo demás se considera inválido
-                    invalid_mask = df[field.name].apply(lambda x: not isinstance(x, bool) and
-                                                     not (isinstance(x, (int, float)) and (x == 0 or x == 1)) and
-                                                     not (isinstance(x, str) and x.lower() in ["true", "false", "1", "0"]))
-                    invalid_rows = df[invalid_mask]
-                else:
-                    # Para cualquier otro tipo, intentar una conversión forzada y capturar errores
-                    invalid_rows = pd.DataFrame()  # DataFrame vacío por defecto
-                    try:
-                        invalid_mask = df[field.name].apply(lambda x: not isinstance(x, target_type))
-                        invalid_rows = df[invalid_mask]
-                    except TypeError:
-                        # Si hay error en la conversión, reportar que no se puede validar este tipo
-                        self.logger.warning(
-                            f"No se puede validar el tipo '{field.type}' de manera efectiva. Verificando valores manualmente.",
-                            file=catalog.filename,
-                            field=field.name
-                        )
-
-                # Para archivos grandes, limitar el número de errores de tipo a reportar
-                is_large_file = len(df) > self.SMALL_FILE_THRESHOLD
-                error_count = 0
-
-                for idx, row in invalid_rows.iterrows():
-                    self.error_count += 1
-                    error_count += 1
+            # Columnas que el parser ya entregó con su tipo final no se vuelven a convertir
+            if self._has_final_type(df.get(field.name), field):
+                continue
 
-                    # Solo registrar los primeros MAX_ERRORS_PER_RULE errores para archivos grandes
-                    if not is_large_file or error_count <= self.MAX_ERRORS_PER_RULE:
-                        self.logger.error(
-                            f"Error de tipo de dato: el valor '{row[field.name]}' no es del tipo {field.type}",
-                            file=catalog.filename,
-                            line=idx + 2,
-                            field=field.name,
-                            value=row[field.name]
-                        )
+            original = df[field.name]
+            df[field.name], failures = self._coerce(original, field, catalog)
+            if not failures.any():
+                continue
+            coercion_failures[field.name] = failures
+
+            # Para archivos grandes solo se formatean los errores que se van a mostrar
+            positions = np.flatnonzero(failures)
+            self._group_failures(catalog.filename, field.name, 'type', 'error',
+                                 f"Error de tipo de dato: el valor no es del tipo {field.type}",
+                                 df.index[positions], original.iloc[positions])
+            shown = positions[:self.MAX_ERRORS_PER_RULE] if is_large_file else positions
+            values = original.iloc[shown].tolist()
+            self._emit_counted_errors(
+                [f"Error de tipo de dato: el valor '{value}' no es del tipo {field.type}" for value in values],
+                df.index[shown],
+                values,
+                is_large_file,
+                check=('type', field.name),
+                state=state,
+                total=len(positions),
+                file=catalog.filename,
+                field=field.name
+            )
 
-                # Si hay más errores de los que mostramos, indicarlo
-                if is_large_file and error_count > self.MAX_ERRORS_PER_RULE:
-                    self.logger.warning(
-                        f"Se encontraron {error_count} errores de tipo para el campo '{field.name}'. "
-                        f"Solo se mostraron los primeros {self.MAX_ERRORS_PER_RULE} para mejorar el rendimiento.",
-                        file=catalog.filename,
-                        field=field.name
-                    )
+        if self.categorical_text:
+            self._compact_text_fields(df, catalog)
+        self._record_memory(catalog, 'after_conversion', df)
+        return df
 
+    def _compact_text_fields(self, df: pd.DataFrame, catalog: Catalog) -> None:
+        """Convierte a categóricos los campos texto con pocos valores distintos por fila (ver categorical)"""
+        if len(df) < self.CATEGORICAL_MIN_ROWS:
+            return
+        for field in catalog.fields:
+            if field.type == 'texto' and field.name in df.columns:
+                compact = compact_text(df[field.name], self.CATEGORICAL_MAX_RATIO, self.CATEGORICAL_SAMPLE_ROWS)
+                if compact is not None:
+                    df[field.name] = compact
+
+    @timed_stage('conversion')
+    def _convert_data_types(self, df: pd.DataFrame, catalog: Catalog) -> pd.DataFrame:
+        """Convierte los tipos como _validate_data_types, sin reportar errores (filas ya validadas)"""
+        for field in catalog.fields:
+            if field.type in self.TYPE_MAPPING and not self._has_final_type(df.get(field.name), field):
+                df[field.name] = self._coerce(df[field.name], field, catalog)[0]
+        if self.categorical_text:
+            self._compact_text_fields(df, catalog)
         return df
 
-    def _get_file_type(self, file_path: str) -> Optional[str]:
+    def _coerce(self, column: pd.Series, field, catalog: Catalog) -> coercion.Coerced:
+        """Convierte la columna al tipo del campo (ver coercion)"""
+        if field.type == 'fecha':
+            return coercion.to_date(column, self.date_formats, (catalog.filename, field.name))
+        if field.type == 'entero':
+            return coercion.to_integer(column, lambda values: self._to_numeric(values, catalog))
+        if field.type == 'decimal':
+            return coercion.to_decimal(column, lambda values: self._to_numeric(values, catalog))
+        if field.type == 'booleano':
+            return coercion.to_boolean(column)
+        return coercion.to_text(column)
+
+    def _record_memory(self, catalog: Catalog, stage: str, df: pd.DataFrame) -> None:
+        """Mide la huella en memoria del DataFrame del catálogo (ver MemoryProfile)"""
+        with self.stage_timings.measure('memory'):
+            self.memory.record(catalog.filename, stage, df)
+
+    def _get_file_type(self, file_path: Union[str, ZipMember]) -> Optional[str]:
         """Determine file type from extension"""
-        _, ext = os.path.splitext(file_path)
+        _, ext = os.path.splitext(str(file_path))
         ext = ext.lower()
         return self.SUPPORTED_EXTENSIONS.get(ext)
 
-    def _read_file(self, file_path: str, catalog: Catalog) -> pd.DataFrame:
-        """Read a file based on its extension and catalog configuration"""
+    @timed_stage('read')
+    def _read_file(self, file_path: Union[str, ZipMember], catalog: Catalog) -> pd.DataFrame:
+        """Read a file (or a ZIP member) based on its extension and catalog configuration"""
         file_type = self._get_file_type(file_path)
         if not file_type:
             raise FileProcessingError(
-                f"Formato de archivo no soportado: {os.path.splitext(file_path)[1]}. "
+                f"Formato de archivo no soportado: {os.path.splitext(str(file_path))[1]}. "
                 f"Los formatos soportados son: CSV (.csv) y Excel (.xlsx, .xls)"
             )
 
         # Verificar que el tipo de archivo coincida con la configuración
         if file_type != catalog.file_format.type:
             raise FileProcessingError(
-                f"El tipo de archivo {file_type} ({os.path.basename(file_path)}) "
+                f"El tipo de archivo {file_type} ({os.path.basename(str(file_path))}) "
                 f"no coincide con la configuración del catálogo que espera {catalog.file_format.type}"
             )
 
         try:
+            file_columns = None
             if file_type == 'CSV':
-                # Detectar BOM en el archivo CSV
-                has_bom = detect_bom(file_path)
-                encoding = 'utf-8-sig' if has_bom else 'utf-8'
+                # Una sola lectura: codificación, BOM y columnas se detectan sobre una
+                # muestra del inicio y los tipos salen de los campos del catálogo
+                df = None
+                if self._engine_for(catalog) == arrow_engine.ENGINE_PYARROW:
+                    df, file_columns = self._read_csv_arrow(file_path, catalog)
+                if df is None:
+                    options = self._csv_read_options(file_path, catalog)
+                    file_columns = options.pop('file_columns')
+                    df = read_csv_source(
+                        file_path,
+                        delimiter=catalog.file_format.delimiter,
+                        header=0 if catalog.file_format.header else None,
+                        encoding_errors=LATIN1_FALLBACK,
+                        **options
+                    )
 
-                # Para archivos sin encabezado, necesitamos crear nombres de columnas personalizados
+                # Para archivos sin encabezado, crear nombres de columnas personalizados
                 if not catalog.file_format.header:
-                    # Primero determinar el número de columnas
-                    try:
-                        df_temp = pd.read_csv(
-                            file_path, 
-                            delimiter=catalog.file_format.delimiter, 
-                            header=None, 
-                            encoding=encoding, 
-                            nrows=1
-                        )
-                    except UnicodeDecodeError:
-                        # Si falla, intentar con latin1
-                        df_temp = pd.read_csv(
-                            file_path, 
-                            delimiter=catalog.file_format.delimiter, 
-                            header=None, 
-                            encoding='latin1', 
-                            nrows=1
-                        )
-                        encoding = 'latin1'
-
-                    # Obtener el número de columnas y crear los nombres
-                    n_columns = len(df_temp.columns)
-                    column_names = create_column_names(n_columns)
-
-                    # Cargar el CSV completo con los nombres de columnas personalizados
-                    try:
-                        df = pd.read_csv(
-                            file_path,
-                            delimiter=catalog.file_format.delimiter,
-                            header=None,
-                            encoding=encoding,
-                            names=column_names
-                        )
-                    except Exception:
-                        # Si falla, intentar con latin1
-                        df = pd.read_csv(
-                            file_path,
-                            delimiter=catalog.file_format.delimiter,
-                            header=None,
-                            encoding='latin1',
-                            names=column_names
-                        )
-                else:
-                    # Con encabezado, usar el método estándar
-                    try:
-                        df = pd.read_csv(
-                            file_path,
-                            delimiter=catalog.file_format.delimiter,
-                            header=0,
-                            encoding=encoding
-                        )
-                    except UnicodeDecodeError:
-                        # Si falla, intentar con latin1
-                        df = pd.read_csv(
-                            file_path,
-                            delimiter=catalog.file_format.delimiter,
-                            header=0,
-                            encoding='latin1'
-                        )
+                    df.columns = create_column_names(len(df.columns))
             elif file_type == 'EXCEL':
+                # openpyxl necesita acceso aleatorio: un miembro de ZIP se descomprime en memoria
+                excel_source = file_path
+                if isinstance(file_path, ZipMember):
+                    with file_path.open() as f:
+                        excel_source = io.BytesIO(f.read())
                 df = pd.read_excel(
-                    file_path,
+                    excel_source,
                     header=0 if catalog.file_format.header else None,
                     engine='openpyxl'  # Especificar el engine explícitamente
                 )
@@ -295,74 +360,8 @@ class FileProcessor:
                     column_names = create_column_names(n_columns)
                     df.columns = column_names
 
-            # Preprocesar campos numéricos antes de validación
-            for field in catalog.fields:
-                if field.type == 'entero':
-                    # Detectar y convertir números que son efectivamente enteros
-                    mask = df[field.name].notna()
-                    if mask.any():
-                        df.loc[mask, field.name] = pd.to_numeric(df.loc[mask, field.name], downcast='integer')
-
-            # Nuevo código: Adaptar dataframe al esquema del catálogo
-            # Obtener los nombres de campos definidos en el YAML
-            yaml_field_names = [field.name for field in catalog.fields]
-
-            # Verificar si hay más columnas en el CSV que en el YAML
-            if len(df.columns) > len(yaml_field_names):
-                # Comportamiento por defecto: reportar error pero continuar
-                error_msg = (f"Error de estructura en el archivo {os.path.basename(file_path)}: "
-                            f"El archivo tiene {len(df.columns)} columnas pero la definición YAML tiene {len(yaml_field_names)} campos. "
-                            f"El número de columnas debe coincidir exactamente con la definición.")
-                self.logger.error(error_msg, file=catalog.filename)
-                self.error_count += 1
-
-                # Registrar el error de formato para el reporte
-                self.logger.register_format_error(
-                    message="Error de columnas: demasiadas columnas en el archivo", 
-                    file=catalog.filename,
-                    expected=f"{len(yaml_field_names)} columnas",
-                    found=f"{len(df.columns)} columnas"
-                )
-
-                # Continuar con el proceso seleccionando solo las columnas que necesitamos
-                if not catalog.file_format.header:
-                    # Para archivos sin encabezado, seleccionar las primeras N columnas
-                    df = df.iloc[:, :len(yaml_field_names)]
-                    # Renombrar las columnas según los nombres del YAML
-                    df.columns = yaml_field_names
-                else:
-                    # Si tiene encabezado, seleccionar las columnas por los nombres del YAML que existan
-                    # y descartar las demás
-                    existing_fields = [field for field in yaml_field_names if field in df.columns]
-                    df = df[existing_fields]
-
-            # Si hay menos columnas en el CSV que en el YAML
-            if len(df.columns) < len(yaml_field_names):
-                # Comportamiento por defecto: reportar error pero continuar
-                error_msg = (f"Error de estructura en el archivo {os.path.basename(file_path)}: "
-                            f"El archivo tiene {len(df.columns)} columnas pero la definición YAML tiene {len(yaml_field_names)} campos. "
-                            f"El número de columnas debe coincidir exactamente con la definición.")
-                self.logger.error(error_msg, file=catalog.filename)
-                self.error_count += 1
-
-                # Registrar el error de formato para el reporte
-                self.logger.register_format_error(
-                    message="Error de columnas: faltan columnas en el archivo", 
-                    file=catalog.filename,
-                    expected=f"{len(yaml_field_names)} columnas",
-                    found=f"{len(df.columns)} columnas"
-                )
-
-                # Continuar con el proceso añadiendo columnas faltantes con valores null
-                for field_name in yaml_field_names:
-                    if field_name not in df.columns:
-                        df[field_name] = None
-
-            # Si el archivo no tiene encabezado, renombrar las columnas con los nombres definidos en el YAML
-            if not catalog.file_format.header:
-                # Asegurarnos de que tengamos la misma cantidad de columnas
-                if len(df.columns) == len(yaml_field_names):
-                    df.columns = yaml_field_names
+            # Adaptar el DataFrame al esquema del catálogo
+            df = self._adapt_to_schema(df, catalog, file_path, file_columns=file_columns)
 
             # Validar y convertir tipos de datos
             df = self._validate_data_types(df, catalog)
@@ -370,10 +369,387 @@ class FileProcessor:
 
         except Exception as e:
             raise FileProcessingError(
-                f"Error al leer el archivo {os.path.basename(file_path)}: {str(e)}\n"
+                f"Error al leer el archivo {os.path.basename(str(file_path))}: {str(e)}\n"
                 "Asegúrate de que el archivo tenga el formato correcto y no esté dañado."
             )
 
+    def _csv_sample(self, file_path: Union[str, ZipMember], catalog: Catalog) -> Tuple[str, Optional[List[str]]]:
+        """Codificación y campos de la primera línea, a partir de una muestra del inicio del archivo"""
+        with open_source(file_path) as f:
+            sample = f.read(SAMPLE_SIZE)
+        encoding = sniff_encoding(sample)
+        return encoding, first_row(sample, encoding, catalog.file_format.delimiter)
+
+    def _csv_read_options(self, file_path: Union[str, ZipMember], catalog: Catalog) -> Dict:
+        """Opciones de pd.read_csv (codificación, tipos y columnas) a partir de una muestra del archivo"""
+        encoding, columns = self._csv_sample(file_path, catalog)
+        options = csv_read_options(catalog, columns)
+        options['encoding'] = encoding
+        return options
+
+    def _engine_for(self, catalog: Catalog) -> str:
+        """Motor de lectura del catálogo: el de su file_format o, si no indica uno, el global"""
+        engine = catalog.file_format.engine or self.engine
+        if engine == arrow_engine.ENGINE_PYARROW and not arrow_engine.arrow_available():
+            return arrow_engine.ENGINE_PANDAS
+        return engine
+
+    def _read_csv_arrow(self, file_path: Union[str, ZipMember],
+                        catalog: Catalog) -> Tuple[Optional[pd.DataFrame], Optional[int]]:
+        """
+        Lee el CSV con el motor pyarrow
+
+        Returns:
+            Tuple: (DataFrame, columnas del archivo). El DataFrame es None si Arrow no
+            pudo leer el archivo (por ejemplo, UTF-8 con bytes latin1 más adelante);
+            en ese caso se usa el lector de pandas, que tolera esas secuencias.
+        """
+        encoding, columns = self._csv_sample(file_path, catalog)
+        try:
+            with open_source(file_path) as f:
+                df = arrow_engine.read_csv_arrow(f, catalog, columns, encoding)
+        except arrow_engine.pa.ArrowInvalid as e:
+            self.logger.message(
+                f"El motor pyarrow no pudo leer {catalog.filename} ({e}); se usa el lector de pandas"
+            )
+            return None, None
+        return df, len(columns) if columns is not None else None
+
+    def _to_numeric(self, column: pd.Series, catalog: Catalog) -> pd.Series:
+        """pd.to_numeric(errors='coerce'); con el motor pyarrow, el texto se convierte con kernels de Arrow"""
+        if self._engine_for(catalog) == arrow_engine.ENGINE_PYARROW and arrow_engine.is_arrow_string(column):
+            return arrow_engine.to_numeric(column)
+        return pd.to_numeric(column, errors='coerce')
+
+    @classmethod
+    def _has_final_type(cls, column: Optional[pd.Series], field) -> bool:
+        """Indica si la columna ya tiene el tipo al que _validate_data_types la convertiría"""
+        if column is None:
+            return False
+        if field.type == 'decimal' and field.required:
+            return pd.api.types.is_float_dtype(column)  # Se convierte con astype(float)
+        if field.type == 'entero':
+            # Los decimales se revisan: 2.5 no es un entero
+            return pd.api.types.is_integer_dtype(column) and not pd.api.types.is_bool_dtype(column)
+        if field.type == 'decimal':
+            return cls._is_numeric_column(column)
+        if field.type == 'texto':
+            return coercion.is_final_text(column)
+        if field.type == 'booleano':
+            return pd.api.types.is_bool_dtype(column)
+        return False
+
+    @staticmethod
+    def _is_numeric_column(column: Optional[pd.Series]) -> bool:
+        """Indica si una columna ya tiene un tipo numérico (no booleano)"""
+        return (column is not None and pd.api.types.is_numeric_dtype(column)
+                and not pd.api.types.is_bool_dtype(column))
+
+    def _adapt_to_schema(self, df: pd.DataFrame, catalog: Catalog, file_path: Union[str, ZipMember],
+                         report_structure: bool = True, file_columns: Optional[int] = None) -> pd.DataFrame:
+        """
+        Adapta el DataFrame leído al esquema del catálogo (número y nombres de columnas)
+
+        Args:
+            report_structure: Si es False, aplica la misma adaptación sin volver a
+                registrar el error de estructura (bloques siguientes en modo streaming)
+            file_columns: Columnas que tiene el archivo, si el lector ya descartó
+                las que no están en el catálogo (usecols)
+        """
+        # Nuevo código: Adaptar dataframe al esquema del catálogo
+        # Obtener los nombres de campos definidos en el YAML
+        yaml_field_names = [field.name for field in catalog.fields]
+
+        # Verificar si hay más columnas en el CSV que en el YAML
+        if file_columns is None or file_columns < len(df.columns):
+            file_columns = len(df.columns)
+        if file_columns > len(yaml_field_names):
+            if report_structure:
+                self._report_structure_error(df, catalog, file_path, yaml_field_names,
+                                             "Error de columnas: demasiadas columnas en el archivo",
+                                             found_columns=file_columns)
+
+            # Continuar con el proceso seleccionando solo las columnas que necesitamos
+            if not catalog.file_format.header:
+                # Para archivos sin encabezado, seleccionar las primeras N columnas
+                df = df.iloc[:, :len(yaml_field_names)]
+                # Renombrar las columnas según los nombres del YAML
+                df.columns = yaml_field_names
+            else:
+                # Si tiene encabezado, seleccionar las columnas por los nombres del YAML que existan
+                # y descartar las demás
+                existing_fields = [field for field in yaml_field_names if field in df.columns]
+                df = df[existing_fields]
+
+        # Si hay menos columnas en el CSV que en el YAML
+        if len(df.columns) < len(yaml_field_names):
+            if report_structure:
+                self._report_structure_error(df, catalog, file_path, yaml_field_names,
+                                             "Error de columnas: faltan columnas en el archivo")
+
+            # Continuar con el proceso añadiendo columnas faltantes con valores null
+            for field_name in yaml_field_names:
+                if field_name not in df.columns:
+                    df[field_name] = None
+
+        # Si el archivo no tiene encabezado, renombrar las columnas con los nombres definidos en el YAML
+        if not catalog.file_format.header:
+            # Asegurarnos de que tengamos la misma cantidad de columnas
+            if len(df.columns) == len(yaml_field_names):
+                df.columns = yaml_field_names
+
+        return df
+
+    def _report_structure_error(self, df: pd.DataFrame, catalog: Catalog, file_path: Union[str, ZipMember],
+                                yaml_field_names: List[str], format_message: str,
+                                found_columns: Optional[int] = None) -> None:
+        """Registra una discrepancia entre las columnas del archivo y las del YAML"""
+        if found_columns is None:
+            found_columns = len(df.columns)
+        # Comportamiento por defecto: reportar error pero continuar
+        error_msg = (f"Error de estructura en el archivo {os.path.basename(str(file_path))}: "
+                    f"El archivo tiene {found_columns} columnas pero la definición YAML tiene {len(yaml_field_names)} campos. "
+                    f"El número de columnas debe coincidir exactamente con la definición.")
+        self.logger.error(error_msg, file=catalog.filename)
+        self.error_count += 1
+
+        # Registrar el error de formato para el reporte
+        self.logger.register_format_error(
+            message=format_message,
+            file=catalog.filename,
+            expected=f"{len(yaml_field_names)} columnas",
+            found=f"{found_columns} columnas"
+        )
+
+    def _evaluate_rule(self, rule: ValidationRule, df_value, level: str = '', scope: str = '') -> object:
+        """
+        Evalúa la expresión de una regla sobre un DataFrame (o diccionario de DataFrames)
+
+        Usa el objeto de código compilado al cargar el YAML; si la regla no fue
+        compilada (por ejemplo, construida a mano), la compila a través de la caché.
+        Las reglas con kernel (ver rule_kernels) se evalúan sin pasar por eval.
+
+        Args:
+            level: Nivel de la regla (field, row, catalog, package), para rule_timings
+            scope: Catálogo (y campo) o paquete de la regla, para rule_timings
+        """
+        if isinstance(df_value, pd.DataFrame):
+            rows = len(df_value)
+        else:
+            rows = sum(len(df) for df in df_value.values() if df is not None) if isinstance(df_value, dict) else 0
+        if rule.kernel is not None and isinstance(df_value, pd.DataFrame):
+            start = time.perf_counter()
+            try:
+                return rule.kernel(df_value)
+            except Exception as e:
+                raise Exception(f"Error evaluando regla {rule.name}: {str(e)}")
+            finally:
+                self.rule_timings.add(rule.name, rule.kernel.engine, time.perf_counter() - start,
+                                      rows=rows, level=level, scope=scope)
+
+        code = rule.code
+        if code is None:
+            code = compile_rule(rule.rule, getattr(self.config, 'yaml_hash', ''))
+            rule.code = code
+
+        # Usamos eval() regular en lugar de pd.eval() para permitir acceso a métodos completos de pandas
+        try:
+            # Crear un entorno de ejecución con acceso a pandas, numpy y str
+            eval_globals = {
+                'df': df_value,
+                'np': np,
+                'pd': pd,
+                'str': str  # Añadir str explícitamente para que esté disponible
+            }
+            start = time.perf_counter()
+            try:
+                return eval(code, eval_globals, {})
+            except Exception:
+                # Lo que una columna categórica no admite (comparar con <, sumar texto, fillna
+                # con un valor nuevo) se repite con las columnas decodificadas
+                if not has_categorical(df_value):
+                    raise
+                eval_globals['df'] = decode_value(df_value)
+                return eval(code, eval_globals, {})
+            finally:
+                self.rule_timings.add(rule.name, 'eval', time.perf_counter() - start,
+                                      rows=rows, level=level, scope=scope)
+        except NameError as e:
+            # Capturar errores específicos de nombres no definidos para dar mejor feedback
+            raise NameError(f"Error evaluando regla {rule.name}: {str(e)}")
+        except Exception as e:
+            # Otras excepciones durante la evaluación
+            raise Exception(f"Error evaluando regla {rule.name}: {str(e)}")
+
+    def _count_failures(self, rule: ValidationRule, failures: int, level: str, scope: str) -> None:
+        """Suma a rule_timings las filas que no cumplieron la regla en su última evaluación"""
+        engine = rule.kernel.engine if rule.kernel is not None and level != 'package' else 'eval'
+        self.rule_timings.add(rule.name, engine, 0.0, evaluations=0, failures=failures, level=level, scope=scope)
+
+    @staticmethod
+    def _index_to_lines(index) -> List[int]:
+        """Convierte un índice de filas del DataFrame en números de línea del archivo"""
+        return (np.asarray(index, dtype=np.int64) + 2).tolist()  # +2 por el encabezado y el índice base 0
+
+    def _group_failures(self, filename: str, field_name: Optional[str], rule: str, severity: str, message: str,
+                        index, values=None) -> None:
+        """
+        Suma las filas que fallaron una verificación a su grupo de errores (ver ErrorGroups),
+        antes del límite de errores mostrados: el grupo cuenta todas
+        """
+        if len(index):
+            lines = np.asarray(index, dtype=np.int64) + 2  # Como _index_to_lines, sin armar la lista
+            self.error_groups.add(filename, field_name, rule, severity, message, lines, values)
+
+    def _skip_rule(self, filename: str, field_name: Optional[str], rule: ValidationRule) -> bool:
+        """
+        Indica si una regla descartada por exceso de errores se omite en este bloque.
+        Con error_groups_full (SAGE_ERROR_GROUPS_FULL=1) se sigue evaluando, solo para
+        que su grupo cuente todas las filas; si no, el conteo del grupo queda como mínimo.
+        """
+        if self.error_groups_full:
+            return False
+        self.error_groups.mark_partial(filename, field_name, rule.name)
+        return True
+
+    def _group_rule_failures(self, rule: ValidationRule, invalid_rows: pd.DataFrame, filename: str,
+                             field_name: Optional[str], level: str) -> None:
+        """Grupo de errores de una regla de campo o de fila (con los valores del campo, si tiene)"""
+        if rule.severity not in (Severity.ERROR, Severity.WARNING):
+            return
+        message = (f"{level} validation failed: {rule.description}" if rule.severity == Severity.ERROR
+                   else f"{level} validation warning: {rule.description}")
+        values = invalid_rows[field_name] if field_name is not None else None
+        self._group_failures(filename, field_name, rule.name, rule.severity.value, message, invalid_rows.index, values)
+
+    def _emit_counted_errors(self, message, index, values, is_large_file: bool,
+                             check: Optional[Tuple[str, str]] = None,
+                             state: Optional[CatalogStreamState] = None,
+                             record_details: Optional[Dict[str, list]] = None,
+                             total: Optional[int] = None, **kwargs) -> int:
+        """
+        Cuenta todas las filas inválidas como errores y registra en bloque solo
+        las primeras MAX_ERRORS_PER_RULE cuando el archivo es grande.
+
+        Args:
+            check: Tipo de verificación y campo, por ejemplo ('required', 'codigo')
+            state: Estado de streaming; si se indica, el límite de errores mostrados
+                se reparte entre bloques y el aviso de errores omitidos se difiere
+            record_details: Detalles por fila, por ejemplo {'first_line': [...]}
+            total: Filas inválidas, si `index` trae solo las primeras (llamada diferida)
+
+        Returns:
+            int: Número de filas inválidas contadas
+        """
+        if total is None:
+            total = len(index)
+        if total == 0:
+            return 0
+
+        tally = state.counted_checks.setdefault(check, [0, 0]) if state is not None else [0, 0]
+        if is_large_file:
+            shown = max(0, min(len(index), self.MAX_ERRORS_PER_RULE - tally[1]))
+        else:
+            shown = len(index)
+        tally[0] += total
+        tally[1] += shown
+
+        if self._defer(state, '_emit_counted_errors',
+                       message=message if isinstance(message, str) else list(message)[:shown],
+                       index=index[:shown], values=values[:shown] if values is not None else None,
+                       is_large_file=is_large_file, check=check,
+                       record_details={k: v[:shown] for k, v in record_details.items()} if record_details else None,
+                       total=total, **kwargs):
+            return total
+        self.error_count += total
+
+        if shown:
+            messages = message if isinstance(message, str) else list(message)[:shown]
+            self.logger.log_batch(
+                messages,
+                "error",
+                self._index_to_lines(index[:shown]),
+                values[:shown] if values is not None else None,
+                record_details={k: v[:shown] for k, v in record_details.items()} if record_details else None,
+                **kwargs
+            )
+
+        # Si hay más errores de los que mostramos, indicarlo
+        if state is None and check is not None and is_large_file and total > self.MAX_ERRORS_PER_RULE:
+            self._warn_omitted_errors(check, total, kwargs.get('file'))
+        return total
+
+    @staticmethod
+    def _defer(state: Optional[CatalogStreamState], method: str, **kwargs) -> bool:
+        """
+        En un proceso hijo que valida un rango de bytes, guarda la llamada en
+        state.deferred para que el proceso principal la repita en orden de archivo
+
+        Returns:
+            bool: True si la llamada quedó diferida
+        """
+        if state is None or state.deferred is None:
+            return False
+        state.deferred.append((method, kwargs))
+        return True
+
+    def _warn_omitted_errors(self, check: Tuple[str, str], total: int, filename: Optional[str]) -> None:
+        """Avisa que solo se mostraron los primeros errores de una verificación"""
+        kind, field_name = check
+        descriptions = {
+            'type': f"errores de tipo para el campo '{field_name}'",
+            'required': f"valores nulos para el campo requerido '{field_name}'",
+            'unique': f"valores duplicados para el campo único '{field_name}'",
+            'unique_key': f"combinaciones duplicadas para la clave única ({field_name})"
+        }
+        self.logger.warning(
+            f"Se encontraron {total} {descriptions[kind]}. "
+            f"Solo se mostraron los primeros {self.MAX_ERRORS_PER_RULE} para mejorar el rendimiento.",
+            file=filename,
+            field=field_name
+        )
+
+    def _emit_rule_failures(self, validation_rule: ValidationRule, invalid_rows: pd.DataFrame, is_large_file: bool,
+                            message: str, value_column: Optional[str] = None,
+                            state: Optional[CatalogStreamState] = None, **kwargs) -> bool:
+        """
+        Registra en bloque las filas que no cumplen una regla de campo o de fila.
+
+        Los errores se cortan en MAX_ERRORS_PER_RULE para archivos grandes; las
+        advertencias se registran todas, igual que en el recorrido fila a fila.
+
+        Returns:
+            bool: True si la regla alcanzó el límite de errores y debe omitirse
+        """
+        total = len(invalid_rows)
+        if total == 0 or validation_rule.severity not in (Severity.ERROR, Severity.WARNING):
+            return False
+
+        key = (value_column or '', validation_rule.name)
+        already_shown = state.rule_errors.get(key, 0) if state is not None else 0
+        shown_total = already_shown
+        if validation_rule.severity == Severity.ERROR:
+            # En streaming el límite se reparte entre los bloques del archivo
+            shown = min(total, self.MAX_ERRORS_PER_RULE - already_shown) if is_large_file else total
+            if state is not None:
+                state.rule_errors[key] = already_shown + shown
+            self.error_count += shown
+            shown_total = already_shown + shown
+        else:
+            shown = total
+            self.warning_count += shown
+
+        index = invalid_rows.index[:shown]
+        values = invalid_rows[value_column].iloc[:shown].tolist() if value_column else None
+        self.logger.log_batch(
+            message,
+            validation_rule.severity.value,
+            self._index_to_lines(index),
+            values,
+            **kwargs
+        )
+        return validation_rule.severity == Severity.ERROR and is_large_file and shown_total >= self.MAX_ERRORS_PER_RULE
+
     def _handle_series_result(self, result: Union[pd.Series, bool], df: pd.DataFrame) -> pd.DataFrame:
         """Maneja resultados que pueden ser Series o booleanos"""
         if isinstance(result, pd.Series):
@@ -386,232 +762,282 @@ class FileProcessor:
             raise ValueError(f"Resultado de validación no soportado: {type(result)}")
 
     def validate_field(self, df: pd.DataFrame, field_name: str, rules: List[ValidationRule],
-                       catalog_name: str) -> None:
-        """Validate a single field according to its rules"""
-        is_large_file = len(df) > self.SMALL_FILE_THRESHOLD
+                       catalog_name: str, is_large_file: Optional[bool] = None,
+                       state: Optional[CatalogStreamState] = None,
+                       context: Optional[EvaluationContext] = None) -> None:
+        """
+        Validate a single field according to its rules
+
+        Las reglas se evalúan sobre la vista filtrada del campo que guarda `context`
+        (una por campo, compartida por todas sus reglas); sin contexto se usa uno
+        propio que se libera al terminar.
+        """
+        if is_large_file is None:
+            is_large_file = len(df) > self.SMALL_FILE_THRESHOLD
+        if context is None:
+            local_context = EvaluationContext(df, self.allocation_stats)
+            try:
+                return self.validate_field(df, field_name, rules, catalog_name, is_large_file, state, local_context)
+            finally:
+                local_context.release()
+
+        # Columnas que leen las reglas del campo: la vista filtrada solo copia esas
+        columns = merge_rule_columns(rules)
 
         # Inicializar el diccionario para este campo si aún no existe
         if is_large_file and field_name not in self.field_rules_skipped:
             self.field_rules_skipped[field_name] = {}
 
         for rule in rules:
-            # Verificar si la regla ya ha sido descartada por exceso de errores
-            if is_large_file and rule.name in self.field_rules_skipped.get(field_name, {}):
+            # Verificar si la regla ya ha sido descartada por exceso de errores en este catálogo
+            if (is_large_file and (catalog_name, field_name, rule.name) in self._skipped_field_rules
+                    and self._skip_rule(catalog_name, field_name, rule)):
                 continue
 
             try:
-                # Contador de errores para esta regla específica
-                rule_error_count = 0
-
-                # Filtrar el DataFrame para excluir filas con valores NaN en este campo
-                # Esto evita que se apliquen reglas de validación a campos opcionales vacíos
-                df_filtered = df.dropna(subset=[field_name])
-
+                # Excluir filas con valores NaN en este campo, para que no se apliquen
+                # reglas de validación a campos opcionales vacíos
                 # Si todas las filas tienen NaN en este campo, no hay nada que validar
-                if len(df_filtered) == 0:
+                if not context.not_null(field_name).any():
                     continue
+                df_filtered = context.filtered(field_name, columns)
+                self.allocation_stats.rule_evaluations += 1
 
-                # Usamos eval() regular en lugar de pd.eval() para permitir acceso a métodos completos de pandas
-                try:
-                    # Crear un entorno de ejecución con acceso a pandas, numpy y str
-                    eval_globals = {
-                        'df': df_filtered,  # Usar el DataFrame filtrado sin NaNs
-                        'np': np,
-                        'pd': pd,
-                        'str': str  # Añadir str explícitamente para que esté disponible
-                    }
-                    result = eval(rule.rule, eval_globals, {})
-                except NameError as e:
-                    # Capturar errores específicos de nombres no definidos para dar mejor feedback
-                    raise NameError(f"Error evaluando regla {rule.name}: {str(e)}")
-                except Exception as e:
-                    # Otras excepciones durante la evaluación
-                    raise Exception(f"Error evaluando regla {rule.name}: {str(e)}")
+                scope = f"{catalog_name}/{field_name}"
+                result = self._evaluate_rule(rule, df_filtered, 'field', scope)
 
                 invalid_rows = self._handle_series_result(result, df_filtered)
+                self._count_failures(rule, len(invalid_rows), 'field', scope)
+                self._group_rule_failures(rule, invalid_rows, catalog_name, field_name, 'Field')
 
-                if len(invalid_rows) > 0:
-                    for idx, row in invalid_rows.iterrows():
-                        value = row[field_name]
-
-                        if rule.severity == Severity.ERROR:
-                            self.error_count += 1
-                            rule_error_count += 1
-                            self.logger.error(
-                                f"Field validation failed: {rule.description}",
-                                file=catalog_name,
-                                line=idx + 2,  # +2 for header and 0-based index
-                                value=value,
-                                rule=rule.rule
-                            )
-                        elif rule.severity == Severity.WARNING:
-                            self.warning_count += 1
-                            self.logger.warning(
-                                f"Field validation warning: {rule.description}",
-                                file=catalog_name,
-                                line=idx + 2,
-                                value=value,
-                                rule=rule.rule
-                            )
-
-                        # Para archivos grandes, limitar el número de errores por regla
-                        if is_large_file and rule.severity == Severity.ERROR and rule_error_count >= self.MAX_ERRORS_PER_RULE:
-                            # Registrar esta regla como descartada
-                            self.field_rules_skipped[field_name][rule.name] = rule_error_count
-
-                            # Registrar un aviso de que se omitieron errores adicionales
-                            self.logger.warning(
-                                f"Se encontraron al menos {rule_error_count} errores para la regla '{rule.name}' en '{field_name}'. "
-                                f"Se omitieron errores adicionales para mejorar el rendimiento.",
-                                file=catalog_name,
-                                rule=rule.name,
-                                field=field_name
-                            )
-                            break
+                self._report_field_rule(rule, invalid_rows, field_name, catalog_name, is_large_file, state)
             except Exception as e:
                 raise FileProcessingError(f"Error evaluating rule {rule.name}: {str(e)}")
 
-    def validate_catalog(self, df: pd.DataFrame, catalog: Catalog) -> None:
-        """Validate an entire catalog"""
-        # Validate required fields
-        is_large_file = len(df) > self.SMALL_FILE_THRESHOLD
+    @timed_stage('field_rules')
+    def _report_field_rule(self, rule: ValidationRule, invalid_rows: pd.DataFrame, field_name: str,
+                           catalog_name: str, is_large_file: bool,
+                           state: Optional[CatalogStreamState] = None) -> None:
+        """Registra las filas que no cumplen una regla de campo y la descarta si alcanzó el límite de errores"""
+        if is_large_file and (catalog_name, field_name, rule.name) in self._skipped_field_rules:
+            return
+        if self._defer_rule_failures(state, '_report_field_rule', rule, invalid_rows[[field_name]], is_large_file,
+                                     (field_name, rule.name), field_name=field_name, catalog_name=catalog_name):
+            return
+
+        message = (f"Field validation failed: {rule.description}" if rule.severity == Severity.ERROR
+                   else f"Field validation warning: {rule.description}")
+        if self._emit_rule_failures(rule, invalid_rows, is_large_file, message,
+                                    value_column=field_name, state=state,
+                                    file=catalog_name, rule=rule.rule):
+            # Registrar esta regla como descartada
+            self.field_rules_skipped.setdefault(field_name, {})[rule.name] = self.MAX_ERRORS_PER_RULE
+            self._skipped_field_rules.add((catalog_name, field_name, rule.name))
+
+            # Registrar un aviso de que se omitieron errores adicionales
+            self.logger.warning(
+                f"Se encontraron al menos {self.MAX_ERRORS_PER_RULE} errores para la regla '{rule.name}' en '{field_name}'. "
+                f"Se omitieron errores adicionales para mejorar el rendimiento.",
+                file=catalog_name,
+                rule=rule.name,
+                field=field_name
+            )
 
+    def _defer_rule_failures(self, state: Optional[CatalogStreamState], method: str, rule: ValidationRule,
+                             invalid_rows: pd.DataFrame, is_large_file: bool, key: Tuple[str, str],
+                             **kwargs) -> bool:
+        """
+        Difiere las filas que no cumplen una regla (ver _defer); de los errores de
+        un archivo grande solo guarda los MAX_ERRORS_PER_RULE primeros del rango
+
+        Returns:
+            bool: True si la llamada quedó diferida
+        """
+        if state is None or state.deferred is None:
+            return False
+        if rule.severity == Severity.ERROR and is_large_file:
+            kept = state.rule_errors.get(key, 0)
+            invalid_rows = invalid_rows.iloc[:max(0, self.MAX_ERRORS_PER_RULE - kept)]
+            state.rule_errors[key] = kept + len(invalid_rows)
+        if len(invalid_rows) and rule.severity in (Severity.ERROR, Severity.WARNING):
+            self._defer(state, method, rule=rule, invalid_rows=invalid_rows, is_large_file=is_large_file, **kwargs)
+        return True
+
+    def validate_catalog(self, df: pd.DataFrame, catalog: Catalog,
+                         state: Optional[CatalogStreamState] = None) -> None:
+        """
+        Validate an entire catalog
+
+        En modo streaming se llama una vez por bloque con `state`; en ese caso las
+        reglas de catálogo no se aplican aquí, sino sobre la tabla materializada.
+        """
+        # Validate required fields
+        is_large_file = self._is_large_file(df, state)
+        # Los índices de unicidad viven en el estado de streaming para cubrir todos los bloques
+        indexes = state.unique_indexes if state is not None else {}
+        # Máscaras y vistas filtradas compartidas por las reglas de cada campo
+        context = EvaluationContext(df, self.allocation_stats)
+        try:
+            self._validate_catalog_fields(df, catalog, is_large_file, state, indexes, context)
+        finally:
+            context.release()
+
+        self._validate_row_rules(df, catalog, is_large_file, state)
+
+        if state is None:
+            self._validate_catalog_rules(df, catalog, is_large_file)
+        self._record_memory(catalog, 'after_validation', df)
+
+    @timed_stage('field_rules')
+    def _validate_catalog_fields(self, df: pd.DataFrame, catalog: Catalog, is_large_file: bool,
+                                 state: Optional[CatalogStreamState],
+                                 indexes: Dict[Tuple[str, ...], UniquenessIndex],
+                                 context: EvaluationContext) -> None:
+        """Verificaciones de campo (requerido, único, reglas) y claves únicas compuestas"""
+        # Las máscaras son del catálogo: las de otro catálogo con un campo del mismo
+        # nombre ocultarían los errores de requerido
+        coercion_failures = self.coercion_failures.get(catalog.filename, {})
         for field in catalog.fields:
-            # Pre-procesar campos numéricos antes de la validación
-            if field.type == 'entero':
-                # Detectar y convertir números que son efectivamente enteros
-                mask = df[field.name].notna() & df[field.name].apply(lambda x: float(x).is_integer() if pd.notnull(x) and not isinstance(x, bool) else True)
-                df.loc[mask, field.name] = df.loc[mask, field.name].astype('Int64')  # Usar Int64 para permitir NaN
+            # Sin pasar por _validate_data_types (validate_catalog llamado directamente)
+            # un campo entero puede seguir como texto
+            if field.type == 'entero' and not self._is_numeric_column(df[field.name]):
+                df[field.name] = coercion.to_integer(df[field.name])[0]
 
             if field.required:
-                mask = df[field.name].isnull()
-                missing = df[mask]
-                if not missing.empty:
-                    error_count = 0
-
-                    for idx, row in missing.iterrows():
-                        self.error_count += 1
-                        error_count += 1
-
-                        # Solo registrar los primeros MAX_ERRORS_PER_RULE errores para archivos grandes
-                        if not is_large_file or error_count <= self.MAX_ERRORS_PER_RULE:
-                            self.logger.error(
-                                f"Required field '{field.name}' is missing",
-                                file=catalog.filename,
-                                line=idx + 2
-                            )
-
-                    # Si hay más errores de los que mostramos, indicarlo
-                    if is_large_file and error_count > self.MAX_ERRORS_PER_RULE:
-                        self.logger.warning(
-                            f"Se encontraron {error_count} valores nulos para el campo requerido '{field.name}'. "
-                            f"Solo se mostraron los primeros {self.MAX_ERRORS_PER_RULE} para mejorar el rendimiento.",
-                            file=catalog.filename,
-                            field=field.name
-                        )
+                mask = ~context.not_null(field.name)
+                failures = coercion_failures.get(field.name)
+                if failures is not None and len(failures) == len(mask):
+                    mask &= ~failures  # Ya se reportaron como errores de tipo
+                self._group_failures(catalog.filename, field.name, 'required', 'error',
+                                     f"Required field '{field.name}' is missing", df.index[mask])
+                self._emit_counted_errors(
+                    f"Required field '{field.name}' is missing",
+                    df.index[mask],
+                    None,
+                    is_large_file,
+                    check=('required', field.name),
+                    state=state,
+                    file=catalog.filename
+                )
 
             # Validate unique fields
             if field.unique:
-                duplicates = df[df[field.name].duplicated()]
-                if not duplicates.empty:
-                    error_count = 0
-
-                    for idx, row in duplicates.iterrows():
-                        self.error_count += 1
-                        error_count += 1
-
-                        # Solo registrar los primeros MAX_ERRORS_PER_RULE errores para archivos grandes
-                        if not is_large_file or error_count <= self.MAX_ERRORS_PER_RULE:
-                            self.logger.error(
-                                f"Field '{field.name}' must be unique",
-                                file=catalog.filename,
-                                line=idx + 2,
-                                value=row[field.name]
-                            )
-
-                    # Si hay más errores de los que mostramos, indicarlo
-                    if is_large_file and error_count > self.MAX_ERRORS_PER_RULE:
-                        self.logger.warning(
-                            f"Se encontraron {error_count} valores duplicados para el campo único '{field.name}'. "
-                            f"Solo se mostraron los primeros {self.MAX_ERRORS_PER_RULE} para mejorar el rendimiento.",
-                            file=catalog.filename,
-                            field=field.name
-                        )
+                self._check_unique(df, [field.name], f"Field '{field.name}' must be unique",
+                                   ('unique', field.name), is_large_file, catalog.filename, state, indexes)
 
             # Apply field validation rules
-            self.validate_field(df, field.name, field.validation_rules, catalog.filename)
+            self.validate_field(df, field.name, field.validation_rules, catalog.filename, is_large_file, state,
+                                context)
+
+        # Validate composite unique keys
+        for key_fields in catalog.unique_keys:
+            key_label = ', '.join(key_fields)
+            self._check_unique(df, key_fields, f"Fields ({key_label}) must be unique together",
+                               ('unique_key', key_label), is_large_file, catalog.filename, state, indexes)
+
+    @timed_stage('field_rules')
+    def _check_unique(self, df: pd.DataFrame, key_fields: List[str], message: str, check: Tuple[str, str],
+                      is_large_file: bool, filename: str, state: Optional[CatalogStreamState] = None,
+                      indexes: Optional[Dict[Tuple[str, ...], UniquenessIndex]] = None) -> None:
+        """
+        Reporta las filas cuya clave ya apareció antes. En un proceso hijo que valida
+        un rango solo se difieren las columnas de la clave: los duplicados entre
+        rangos se buscan en el proceso principal, en orden de archivo.
+        """
+        if self._defer(state, '_check_unique', df=df[key_fields], key_fields=key_fields, message=message,
+                       check=check, is_large_file=is_large_file, filename=filename):
+            return
+        if indexes is None:
+            indexes = state.unique_indexes if state is not None else {}
+        index, values, first_lines = self._find_duplicates(df, key_fields, indexes)
+        self._group_failures(filename, check[1], check[0], 'error', message, index, values)
+        self._emit_counted_errors(
+            message,
+            index,
+            values,
+            is_large_file,
+            check=check,
+            state=state,
+            record_details={'first_line': first_lines},
+            file=filename
+        )
 
-        # Apply row validations
-        is_large_file = len(df) > self.SMALL_FILE_THRESHOLD
+    def _is_large_file(self, df: pd.DataFrame, state: Optional[CatalogStreamState] = None) -> bool:
+        """Indica si el archivo supera SMALL_FILE_THRESHOLD, contando los bloques ya procesados"""
+        rows_before = state.rows_seen if state is not None else 0
+        return rows_before + len(df) > self.SMALL_FILE_THRESHOLD
+
+    def _find_duplicates(self, df: pd.DataFrame, key_fields: List[str],
+                         indexes: Dict[Tuple[str, ...], UniquenessIndex]) -> Tuple[pd.Index, list, List[int]]:
+        """
+        Busca las filas cuya clave (uno o varios campos) ya apareció antes,
+        en este DataFrame o en bloques anteriores registrados en `indexes`
+
+        Returns:
+            Tuple: Índice de las filas repetidas, sus valores y la línea donde
+            se vio cada clave por primera vez
+        """
+        unique_index = indexes.setdefault(tuple(key_fields), UniquenessIndex(key_fields))
+        positions, first_lines = unique_index.add(df, self._index_to_lines(df.index))
+        if len(key_fields) == 1:
+            values = df[key_fields[0]].iloc[positions].tolist()
+        else:
+            values = [', '.join(map(str, row)) for row in df[key_fields].iloc[positions].itertuples(index=False)]
+        return df.index[positions], values, first_lines.tolist()
 
+    @timed_stage('row_rules')
+    def _validate_row_rules(self, df: pd.DataFrame, catalog: Catalog, is_large_file: bool,
+                            state: Optional[CatalogStreamState] = None) -> None:
+        """Apply row-level validation rules"""
         # Inicializar el diccionario para este catálogo si aún no existe
         if is_large_file and catalog.filename not in self.row_rules_skipped:
             self.row_rules_skipped[catalog.filename] = {}
 
         for rule in catalog.row_validation:
             # Verificar si la regla ya ha sido descartada por exceso de errores
-            if is_large_file and rule.name in self.row_rules_skipped.get(catalog.filename, {}):
+            if (is_large_file and rule.name in self.row_rules_skipped.get(catalog.filename, {})
+                    and self._skip_rule(catalog.filename, None, rule)):
                 continue
 
             try:
-                # Contador de errores para esta regla específica
-                rule_error_count = 0
-
-                # Usamos eval() regular en lugar de pd.eval() para permitir acceso a métodos completos de pandas
-                try:
-                    # Crear un entorno de ejecución con acceso a pandas, numpy y str
-                    eval_globals = {
-                        'df': df,
-                        'np': np,
-                        'pd': pd,
-                        'str': str  # Añadir str explícitamente para que esté disponible
-                    }
-                    result = eval(rule.rule, eval_globals, {})
-                except NameError as e:
-                    # Capturar errores específicos de nombres no definidos para dar mejor feedback
-                    raise NameError(f"Error evaluando regla {rule.name}: {str(e)}")
-                except Exception as e:
-                    # Otras excepciones durante la evaluación
-                    raise Exception(f"Error evaluando regla {rule.name}: {str(e)}")
+                result = self._evaluate_rule(rule, df, 'row', catalog.filename)
 
                 invalid_rows = self._handle_series_result(result, df)
+                self._count_failures(rule, len(invalid_rows), 'row', catalog.filename)
+                self._group_rule_failures(rule, invalid_rows, catalog.filename, None, 'Row')
 
-                for idx, row in invalid_rows.iterrows():
-                    if rule.severity == Severity.ERROR:
-                        self.error_count += 1
-                        rule_error_count += 1
-                        self.logger.error(
-                            f"Row validation failed: {rule.description}",
-                            file=catalog.filename,
-                            line=idx + 2,
-                            rule=rule.rule
-                        )
-                    elif rule.severity == Severity.WARNING:
-                        self.warning_count += 1
-                        self.logger.warning(
-                            f"Row validation warning: {rule.description}",
-                            file=catalog.filename,
-                            line=idx + 2,
-                            rule=rule.rule
-                        )
-
-                    # Para archivos grandes, limitar el número de errores por regla
-                    if is_large_file and rule.severity == Severity.ERROR and rule_error_count >= self.MAX_ERRORS_PER_RULE:
-                        # Registrar esta regla como descartada
-                        self.row_rules_skipped[catalog.filename][rule.name] = rule_error_count
-
-                        # Registrar un aviso de que se omitieron errores adicionales
-                        self.logger.warning(
-                            f"Se encontraron al menos {rule_error_count} errores para la regla de fila '{rule.name}'. "
-                            f"Se omitieron errores adicionales para mejorar el rendimiento.",
-                            file=catalog.filename,
-                            rule=rule.name
-                        )
-                        break
+                self._report_row_rule(rule, invalid_rows, catalog.filename, is_large_file, state)
             except Exception as e:
                 raise FileProcessingError(f"Error evaluating row rule {rule.name}: {str(e)}")
 
-        # Apply catalog validations
+    @timed_stage('row_rules')
+    def _report_row_rule(self, rule: ValidationRule, invalid_rows: pd.DataFrame, filename: str,
+                         is_large_file: bool, state: Optional[CatalogStreamState] = None) -> None:
+        """Registra las filas que no cumplen una regla de fila y la descarta si alcanzó el límite de errores"""
+        if is_large_file and rule.name in self.row_rules_skipped.get(filename, {}):
+            return
+        if self._defer_rule_failures(state, '_report_row_rule', rule, invalid_rows[[]], is_large_file,
+                                     ('', rule.name), filename=filename):
+            return
+
+        message = (f"Row validation failed: {rule.description}" if rule.severity == Severity.ERROR
+                   else f"Row validation warning: {rule.description}")
+        if self._emit_rule_failures(rule, invalid_rows, is_large_file, message, state=state,
+                                    file=filename, rule=rule.rule):
+            # Registrar esta regla como descartada
+            self.row_rules_skipped.setdefault(filename, {})[rule.name] = self.MAX_ERRORS_PER_RULE
+
+            # Registrar un aviso de que se omitieron errores adicionales
+            self.logger.warning(
+                f"Se encontraron al menos {self.MAX_ERRORS_PER_RULE} errores para la regla de fila '{rule.name}'. "
+                f"Se omitieron errores adicionales para mejorar el rendimiento.",
+                file=filename,
+                rule=rule.name
+            )
+
+    @timed_stage('catalog_rules')
+    def _validate_catalog_rules(self, df: pd.DataFrame, catalog: Catalog, is_large_file: bool) -> None:
+        """Apply catalog-level validation rules, which need the whole table"""
         # Inicializar el diccionario para este catálogo si aún no existe
         if is_large_file and catalog.filename not in self.catalog_rules_skipped:
             self.catalog_rules_skipped[catalog.filename] = {}
@@ -625,24 +1051,10 @@ class FileProcessor:
                 # Contador de errores para esta regla específica
                 rule_error_count = 0
 
-                # Usamos eval() regular en lugar de pd.eval() para permitir acceso a métodos completos de pandas
-                try:
-                    # Crear un entorno de ejecución con acceso a pandas, numpy y str
-                    eval_globals = {
-                        'df': df,
-                        'np': np,
-                        'pd': pd,
-                        'str': str  # Añadir str explícitamente para que esté disponible
-                    }
-                    result = eval(rule.rule, eval_globals, {})
-                except NameError as e:
-                    # Capturar errores específicos de nombres no definidos para dar mejor feedback
-                    raise NameError(f"Error evaluando regla {rule.name}: {str(e)}")
-                except Exception as e:
-                    # Otras excepciones durante la evaluación
-                    raise Exception(f"Error evaluando regla {rule.name}: {str(e)}")
+                result = self._evaluate_rule(rule, df, 'catalog', catalog.filename)
 
                 invalid_rows = self._handle_series_result(result, df)
+                self._count_failures(rule, len(invalid_rows), 'catalog', catalog.filename)
 
                 if len(invalid_rows) > 0:
                     if rule.severity == Severity.ERROR:
@@ -679,67 +1091,499 @@ class FileProcessor:
                     self.logger.error(f"DEBUG - Evaluando regla '{rule_name}' con {cols_count} columnas. Regla: '{rule_rule}'")
                 raise FileProcessingError(f"Error evaluating catalog rule {rule_name}: {str(e)}")
 
+    def _use_streaming(self, file_path: Union[str, ZipMember], catalog: Catalog) -> bool:
+        """Indica si el catálogo debe validarse por bloques"""
+        if self._get_file_type(file_path) != 'CSV' or catalog.file_format.type != 'CSV':
+            return False
+        return bool(catalog.file_format.streaming or self.streaming_enabled)
+
+    def _process_catalog_streaming(self, file_path: Union[str, ZipMember], catalog: Catalog,
+                                   keep_dataframe: bool, keep_columns: Optional[List[str]] = None
+                                   ) -> Tuple[Optional[pd.DataFrame], int]:
+        """
+        Lee y valida un CSV por bloques con memoria acotada
+
+        Las reglas de campo y de fila se aplican a cada bloque; las verificaciones
+        de requerido y único arrastran su estado entre bloques. La tabla completa
+        solo se materializa si la necesitan las reglas de catálogo o el llamador.
+
+        Args:
+            keep_dataframe: Si es True, devuelve el DataFrame
+            keep_columns: Columnas del DataFrame devuelto (None: todas)
+
+        Returns:
+            Tuple[Optional[pd.DataFrame], int]: (DataFrame materializado o None, registros)
+        """
+        chunk_size = max(catalog.file_format.chunk_size or self.streaming_chunk_size,
+                         self.STREAMING_MIN_CHUNK_SIZE)
+        materialize = keep_dataframe or bool(catalog.catalog_validation)
+        materialize_columns = self._materialized_columns(catalog, keep_dataframe, keep_columns)
+        state = CatalogStreamState()
+
+        self.logger.message(
+            f"Validando {catalog.filename} en modo streaming (bloques de {chunk_size} filas)"
+        )
+        self._stream_chunks(file_path, catalog, state, chunk_size, materialize, materialize_columns)
+        df = self._finish_streamed_catalog(catalog, state, materialize, materialize_columns,
+                                           keep_dataframe, keep_columns)
+
+        self.last_peak_rss_mb = get_peak_rss_mb()
+        self.logger.message(
+            f"Streaming de {catalog.filename}: {state.rows_seen} registros en {state.chunks_processed} bloques. "
+            f"Memoria pico (RSS): {self.last_peak_rss_mb} MB"
+        )
+        return df, state.rows_seen
+
+    def _use_incremental(self, file_path: Union[str, ZipMember], catalog: Catalog) -> bool:
+        """Indica si el catálogo se valida en modo incremental (CSV en disco con emisor conocido)"""
+        if not catalog.file_format.incremental or self.incremental_store is None:
+            return False
+        if not isinstance(file_path, str) or self._get_file_type(file_path) != 'CSV':
+            return False
+        if getattr(self.logger, 'emisor_id', None) is None:
+            self.logger.message(f"Validación incremental de {catalog.filename} desactivada: "
+                                f"no se conoce el emisor; se valida el archivo completo")
+            return False
+        return True
+
+    def _process_catalog_incremental(self, file_path: str, catalog: Catalog, keep_dataframe: bool,
+                                     keep_columns: Optional[List[str]] = None
+                                     ) -> Tuple[Optional[pd.DataFrame], int, Dict]:
+        """
+        Valida un CSV acumulativo: si empieza con las filas ya validadas en el envío
+        anterior del emisor, solo valida las filas agregadas (ver incremental)
+
+        Las filas nuevas se validan por bloques, continuando la numeración de
+        líneas y con los índices de claves únicas de las filas anteriores. Los
+        errores y advertencias de las filas anteriores se suman de nuevo. Las
+        reglas de catálogo necesitan la tabla completa: las filas anteriores se
+        leen y convierten, sin validarlas.
+
+        Returns:
+            Tuple: (DataFrame materializado o None, registros, estadísticas del modo incremental)
+        """
+        store = self.incremental_store
+        emisor_id = self.logger.emisor_id
+        yaml_hash = getattr(self.config, 'yaml_hash', '')
+        chunk_size = max(catalog.file_format.chunk_size or self.streaming_chunk_size,
+                         self.STREAMING_MIN_CHUNK_SIZE)
+        materialize = keep_dataframe or bool(catalog.catalog_validation)
+        materialize_columns = self._materialized_columns(catalog, keep_dataframe, keep_columns)
+
+        previous = store.load(emisor_id, catalog.filename)
+        if previous is not None and previous.yaml_hash != yaml_hash:
+            reason = "cambió el YAML"
+            previous = None
+        else:
+            reason = "no hay filas validadas de envíos anteriores"
+        matches, size, digest = scan_prefix(file_path, previous)
+        indexes = store.load_indexes(emisor_id, catalog.filename, previous) if matches else None
+        if previous is not None and not matches:
+            reason = "el archivo no empieza con las filas del envío anterior"
+        elif matches and indexes is None:
+            reason = "no se pudo leer el índice de claves únicas"
+
+        state = CatalogStreamState()
+        initial_errors, initial_warnings = self.error_count, self.warning_count
+        if indexes is not None:
+            self.logger.message(
+                f"Validación incremental de {catalog.filename}: {previous.rows} registros ya validados "
+                f"en el envío anterior; se validan solo los registros agregados"
+            )
+            self.date_formats = coercion.DateFormatCache({
+                **self.date_formats.as_dict(),
+                **{(catalog.filename, name): date_format for name, date_format in previous.date_formats.items()}
+            })
+            self.error_count += previous.errors
+            self.warning_count += previous.warnings
+            if materialize:
+                prefix = CatalogStreamState()
+                self._stream_chunks(file_path, catalog, prefix, chunk_size, True, materialize_columns,
+                                    ByteRange(file_path, 0, previous.bytes, 0, previous.rows, catalog.file_format.header),
+                                    validate=False)
+                state.materialized = prefix.materialized
+            state.rows_seen = previous.rows
+            state.unique_indexes = indexes
+            if size > previous.bytes:
+                # Las filas del rango se cuentan al leerlo
+                self._stream_chunks(file_path, catalog, state, chunk_size, materialize, materialize_columns,
+                                    ByteRange(file_path, previous.bytes, size, previous.rows, 0, False))
+            validated_rows = state.rows_seen - previous.rows
+        else:
+            self.logger.message(f"Validación incremental de {catalog.filename}: {reason}; "
+                                f"se valida el archivo completo")
+            self._stream_chunks(file_path, catalog, state, chunk_size, materialize, materialize_columns)
+            validated_rows = state.rows_seen
+
+        # Errores por fila de todo el archivo (sin las reglas de catálogo, que se aplican cada vez)
+        row_errors, row_warnings = self.error_count - initial_errors, self.warning_count - initial_warnings
+        df = self._finish_streamed_catalog(catalog, state, materialize, materialize_columns,
+                                           keep_dataframe, keep_columns)
+        store.save(emisor_id, catalog.filename, PrefixState(
+            rows=state.rows_seen, bytes=size, sha256=digest, yaml_hash=yaml_hash,
+            errors=row_errors, warnings=row_warnings,
+            date_formats={name: date_format for (filename, name), date_format in self.date_formats.as_dict().items()
+                          if filename == catalog.filename}
+        ), state.unique_indexes)
+
+        self.last_peak_rss_mb = get_peak_rss_mb()
+        return df, state.rows_seen, {'validated_rows': validated_rows, 'reused_rows': state.rows_seen - validated_rows}
+
+    @timed_stage('read')
+    def _stream_chunks(self, file_path: Union[str, ZipMember], catalog: Catalog, state: CatalogStreamState,
+                       chunk_size: int, materialize: bool, materialize_columns: Optional[List[str]],
+                       byte_range: Optional[ByteRange] = None, validate: bool = True) -> None:
+        """
+        Lee el CSV por bloques y valida cada uno, acumulando en `state`
+
+        Args:
+            byte_range: Si se indica, solo se lee ese rango del archivo; sus filas
+                continúan la numeración desde byte_range.first_row
+            validate: Si es False, solo convierte los tipos (filas ya validadas, ver incremental)
+        """
+        try:
+            options = self._csv_read_options(file_path, catalog)
+            file_columns = options.pop('file_columns')
+            header = 0 if catalog.file_format.header else None
+            if byte_range is not None and header is not None and not byte_range.header:
+                # Los rangos siguientes no traen el encabezado: se usan sus nombres
+                header = None
+                options['names'] = self._csv_sample(file_path, catalog)[1]
+            with open_source(byte_range or file_path) as source, pd.read_csv(
+                source,
+                delimiter=catalog.file_format.delimiter,
+                header=header,
+                encoding_errors=LATIN1_FALLBACK,
+                chunksize=chunk_size,
+                **options
+            ) as reader:
+                for chunk in reader:
+                    if not catalog.file_format.header:
+                        chunk.columns = create_column_names(len(chunk.columns))
+                    if byte_range is not None:
+                        chunk.index = pd.RangeIndex(state.rows_seen, state.rows_seen + len(chunk))
+
+                    first_chunk = state.chunks_processed == 0 and (byte_range is None or byte_range.start == 0)
+                    chunk = self._adapt_to_schema(chunk, catalog, file_path,
+                                                  report_structure=first_chunk and validate,
+                                                  file_columns=file_columns)
+                    if validate:
+                        chunk = self._validate_data_types(chunk, catalog, state)
+                        self.validate_catalog(chunk, catalog, state)
+                    else:
+                        chunk = self._convert_data_types(chunk, catalog)
+
+                    state.rows_seen += len(chunk)
+                    state.chunks_processed += 1
+                    if materialize:
+                        state.materialized.append(self._project_columns(chunk, materialize_columns))
+        except FileProcessingError:
+            raise
+        except Exception as e:
+            raise FileProcessingError(
+                f"Error al leer el archivo {os.path.basename(str(file_path))}: {str(e)}\n"
+                "Asegúrate de que el archivo tenga el formato correcto y no esté dañado."
+            )
+
+    @timed_stage('materialization')
+    def _finish_streamed_catalog(self, catalog: Catalog, state: CatalogStreamState, materialize: bool,
+                                 materialize_columns: Optional[List[str]], keep_dataframe: bool,
+                                 keep_columns: Optional[List[str]]) -> Optional[pd.DataFrame]:
+        """Cierra la validación por bloques: avisos de errores omitidos y reglas de catálogo sobre la tabla completa"""
+        # Avisos de errores omitidos, ahora que se conocen los totales de todos los bloques
+        for check, (total, shown) in state.counted_checks.items():
+            if total > shown:
+                self._warn_omitted_errors(check, total, catalog.filename)
+
+        df = None
+        if materialize:
+            if state.materialized:
+                df = concat_frames(state.materialized)
+            else:
+                df = self._project_columns(pd.DataFrame(columns=[field.name for field in catalog.fields]),
+                                           materialize_columns)
+            state.materialized.clear()
+            self._validate_catalog_rules(df, catalog, state.rows_seen > self.SMALL_FILE_THRESHOLD)
+            df = self._project_columns(df, keep_columns) if keep_dataframe else None
+        return df
+
+    def _split_for_parallel(self, file_path: Union[str, ZipMember], catalog: Catalog) -> Optional[List[ByteRange]]:
+        """
+        Rangos de bytes para validar un CSV en paralelo, o None si el archivo no
+        califica (no es un CSV en disco, es menor que parallel_csv_min_mb o no se
+        puede dividir de forma segura)
+        """
+        if self.parallel_csv_workers <= 1 or not isinstance(file_path, str):
+            return None
+        if self._get_file_type(file_path) != 'CSV' or catalog.file_format.type != 'CSV':
+            return None
+        if os.path.getsize(file_path) < self.parallel_csv_min_mb * 1024 * 1024:
+            return None
+        # Los rangos siguientes al primero se leen con los nombres del encabezado
+        _, columns = self._csv_sample(file_path, catalog)
+        if catalog.file_format.header and columns is None:
+            return None
+        return split_csv(file_path, self.parallel_csv_workers, catalog.file_format.header)
+
+    def _validate_byte_range(self, byte_range: ByteRange, catalog: Catalog, chunk_size: int, materialize: bool,
+                             materialize_columns: Optional[List[str]]
+                             ) -> Tuple[Optional[pd.DataFrame], int, int, List[Tuple[str, Dict]]]:
+        """
+        Valida un rango de un CSV en un proceso hijo (ver validate_range_task)
+
+        Returns:
+            Tuple: (filas materializadas o None, registros, bloques, llamadas diferidas)
+        """
+        state = CatalogStreamState(rows_seen=byte_range.first_row, deferred=[])
+        self._stream_chunks(byte_range.path, catalog, state, chunk_size, materialize, materialize_columns,
+                            byte_range)
+        df = concat_frames(state.materialized) if state.materialized else None
+        return df, state.rows_seen - byte_range.first_row, state.chunks_processed, state.deferred
+
+    def _process_catalog_ranges(self, file_path: str, catalog: Catalog, ranges: List[ByteRange],
+                                keep_dataframe: bool, keep_columns: Optional[List[str]] = None
+                                ) -> Optional[Tuple[Optional[pd.DataFrame], int]]:
+        """
+        Valida un CSV grande repartiendo sus rangos de bytes entre procesos
+
+        Cada proceso valida su rango por bloques; el proceso principal reproduce
+        sus eventos en orden de archivo y repite las llamadas diferidas (límites
+        de errores mostrados, requeridos y únicos) con un único estado, igual que
+        en modo streaming. Las reglas de catálogo se aplican a la tabla unida.
+
+        Returns:
+            Optional[Tuple[Optional[pd.DataFrame], int]]: (DataFrame materializado
+            o None, registros), o None si algún rango falló y el archivo debe
+            validarse en un solo proceso
+        """
+        chunk_size = max(catalog.file_format.chunk_size or self.streaming_chunk_size,
+                         self.STREAMING_MIN_CHUNK_SIZE)
+        materialize = keep_dataframe or bool(catalog.catalog_validation)
+        materialize_columns = self._materialized_columns(catalog, keep_dataframe, keep_columns)
+        workers = min(self.parallel_csv_workers, len(ranges))
+
+        # Cada rango empieza en medio del archivo: el formato de las fechas se infiere
+        # una vez del primer bloque, como en la validación en un solo proceso
+        date_formats = self._head_date_formats(file_path, catalog, chunk_size)
+        tasks = [RangeTask(self.config, catalog, byte_range, chunk_size, materialize, materialize_columns,
+                           self.engine, date_formats) for byte_range in ranges]
+        with process_pool(workers) as executor:
+            results = list(executor.map(validate_range_task, tasks))
+
+        for byte_range, result in zip(ranges, results):
+            if result.error is not None or result.rows != byte_range.rows:
+                reason = result.error or f"se leyeron {result.rows} registros y se esperaban {byte_range.rows}"
+                self.logger.message(
+                    f"No se pudo validar {catalog.filename} por rangos ({reason}); se valida en un solo proceso"
+                )
+                return None
+
+        state = CatalogStreamState()
+        for result in results:
+            self._merge_worker_output(result)
+            with self.stage_timings.measure('field_rules'):
+                for method, kwargs in result.deferred:
+                    getattr(self, method)(state=state, **kwargs)
+            state.rows_seen += result.rows
+            state.chunks_processed += result.chunks
+            if result.df is not None:
+                state.materialized.append(result.df)
+        df = self._finish_streamed_catalog(catalog, state, materialize, materialize_columns,
+                                           keep_dataframe, keep_columns)
+
+        self.last_peak_rss_mb = get_peak_rss_mb()
+        self.logger.message(
+            f"Validación en paralelo de {catalog.filename}: {state.rows_seen} registros en {len(ranges)} rangos "
+            f"con {workers} procesos. Memoria pico (RSS) del proceso principal: {self.last_peak_rss_mb} MB"
+        )
+        return df, state.rows_seen
+
+    def _head_date_formats(self, file_path: str, catalog: Catalog, rows: int) -> Dict:
+        """Formatos de los campos fecha inferidos de las primeras `rows` filas del archivo"""
+        positions = [i for i, field in enumerate(catalog.fields) if field.type == 'fecha']
+        if not positions:
+            return {}
+        options = self._csv_read_options(file_path, catalog)
+        options.pop('file_columns')
+        try:
+            head = pd.read_csv(file_path, delimiter=catalog.file_format.delimiter,
+                               header=0 if catalog.file_format.header else None,
+                               encoding_errors=LATIN1_FALLBACK, nrows=rows, **options)
+        except (ValueError, OSError):
+            return {}  # Cada rango infiere sus formatos
+        for i in positions:
+            field = catalog.fields[i]
+            column = field.name if catalog.file_format.header else i  # Sin encabezado, por posición
+            if column in head.columns:
+                self.date_formats.infer((catalog.filename, field.name), head[column])
+        return self.date_formats.as_dict()
+
+    @staticmethod
+    def _materialized_columns(catalog: Catalog, keep_dataframe: bool,
+                              keep_columns: Optional[List[str]]) -> Optional[List[str]]:
+        """Columnas que se guardan de cada bloque: las que leen las reglas de catálogo y las que se devuelven"""
+        if keep_dataframe and keep_columns is None:
+            return None
+        needed = merge_rule_columns(catalog.catalog_validation)
+        if needed is None:
+            return None
+        needed.update(keep_columns or [])
+        return [field.name for field in catalog.fields if field.name in needed]
+
+    @timed_stage('package_rules')
     def validate_package(self, package: Package) -> None:
-        """Apply package-level validations"""
-        for rule in package.package_validation:
-            try:
-                # Usamos eval() regular en lugar de pd.eval() para permitir acceso a métodos completos de pandas
-                try:
-                    # Crear un entorno de ejecución con acceso a pandas, numpy y str
-                    eval_globals = {
-                        'df': self.dataframes,
-                        'np': np,
-                        'pd': pd,
-                        'str': str  # Añadir str explícitamente para que esté disponible
-                    }
-                    result = eval(rule.rule, eval_globals, {})
-                except NameError as e:
-                    # Capturar errores específicos de nombres no definidos para dar mejor feedback
-                    raise NameError(f"Error evaluando regla {rule.name}: {str(e)}")
-                except Exception as e:
-                    # Otras excepciones durante la evaluación
-                    raise Exception(f"Error evaluando regla {rule.name}: {str(e)}")
-
-                # Para Series, procesamos cada valor que no cumple
+        """
+        Apply package-level validations
+
+        Las reglas en SQL se ejecutan en una conexión DuckDB con los catálogos
+        validados registrados como tablas (ver package_sql), abierta solo si el
+        paquete tiene alguna.
+        """
+        sql_engine = None
+        try:
+            for rule in package.package_validation:
+                if rule.sql and sql_engine is None:
+                    sql_engine = PackageSQL(self.dataframes)
+                self._validate_package_rule(rule, package, sql_engine)
+        finally:
+            if sql_engine is not None:
+                sql_engine.close()
+
+    def _validate_package_rule(self, rule: ValidationRule, package: Package, sql_engine: Optional[PackageSQL]) -> None:
+        """Evalúa una regla de paquete y reporta las claves (o filas) que no la cumplen"""
+        try:
+            details = {}
+            if rule.sql:
+                start = time.perf_counter()
+                failures, details['values'] = sql_engine.failing_keys(rule.rule)
+                rows = sum(len(df) for df in self.dataframes.values() if df is not None)
+                self.rule_timings.add(rule.name, 'duckdb', time.perf_counter() - start,
+                                      rows=rows, failures=failures, level='package', scope=package.name)
+            else:
+                result = self._evaluate_rule(rule, self.dataframes, 'package', package.name)
                 if isinstance(result, pd.Series):
+                    # Para Series, se reportan los índices de los valores que no cumplen
                     failed_mask = ~result  # Usar negación bitwise en lugar de 'not'
-                    if failed_mask.any():
-                        if rule.severity == Severity.ERROR:
-                            self.error_count += 1
-                            self.logger.error(
-                                f"Package validation failed: {rule.description}",
-                                rule=rule.rule,
-                                values=result[failed_mask].index.tolist()
-                            )
-                        else:
-                            self.warning_count += 1
-                            self.logger.warning(
-                                f"Package validation warning: {rule.description}",
-                                rule=rule.rule,
-                                values=result[failed_mask].index.tolist()
-                            )
-
-                # Para resultados escalares (True/False)
+                    failures = int(failed_mask.sum())
+                    details['values'] = result[failed_mask].index.tolist()
                 elif isinstance(result, bool):
-                    if not result:
-                        if rule.severity == Severity.ERROR:
-                            self.error_count += 1
-                            self.logger.error(
-                                f"Package validation failed: {rule.description}",
-                                rule=rule.rule
-                            )
-                        else:
-                            self.warning_count += 1
-                            self.logger.warning(
-                                f"Package validation warning: {rule.description}",
-                                rule=rule.rule
-                            )
+                    # Para resultados escalares (True/False)
+                    failures = int(not result)
+                else:
+                    return
+                self._count_failures(rule, failures, 'package', package.name)
 
-            except Exception as e:
-                raise FileProcessingError(
-                    f"Error evaluating package rule {rule.name}: {str(e)}\n"
-                    "Asegúrate de que la regla sea válida y los catálogos requeridos existan."
-                )
+            if failures:
+                if rule.severity == Severity.ERROR:
+                    self.error_count += 1
+                    self.logger.error(f"Package validation failed: {rule.description}", rule=rule.rule, **details)
+                else:
+                    self.warning_count += 1
+                    self.logger.warning(f"Package validation warning: {rule.description}", rule=rule.rule, **details)
+
+        except Exception as e:
+            raise FileProcessingError(
+                f"Error evaluating package rule {rule.name}: {str(e)}\n"
+                "Asegúrate de que la regla sea válida y los catálogos requeridos existan."
+            )
+
+    def _validate_catalog_file(self, file_path: Union[str, ZipMember], catalog_name: str, catalog: Catalog,
+                               keep_dataframe: bool, keep_columns: Optional[List[str]] = None
+                               ) -> Tuple[Optional[pd.DataFrame], int, int, int, Dict]:
+        """
+        Lee y valida un catálogo de un paquete
+
+        Args:
+            keep_dataframe: Si es False, el DataFrame no se devuelve
+            keep_columns: Columnas del DataFrame devuelto (None: todas)
+
+        Returns:
+            Tuple: DataFrame (None si no hace falta conservarlo), registros,
+            errores, advertencias y estadísticas adicionales del archivo
+        """
+        extra_stats = {}
+        if self._use_streaming(file_path, catalog):
+            self.logger.message(f"Processing catalog: {catalog_name}")
+
+            # Store initial error and warning counts
+            initial_errors = self.error_count
+            initial_warnings = self.warning_count
+
+            df, file_records = self._process_catalog_streaming(file_path, catalog, keep_dataframe, keep_columns)
+            extra_stats['peak_rss_mb'] = self.last_peak_rss_mb
+        else:
+            df = self._read_file(file_path, catalog)
+            self.logger.message(f"Processing catalog: {catalog_name}")
+
+            # Store initial error and warning counts
+            initial_errors = self.error_count
+            initial_warnings = self.warning_count
+
+            self.validate_catalog(df, catalog)
+            file_records = len(df)
+            df = self._project_columns(df, keep_columns) if keep_dataframe else None
+
+        # Calculate errors/warnings for this file
+        file_errors = self.error_count - initial_errors
+        file_warnings = self.warning_count - initial_warnings
+        return df, file_records, file_errors, file_warnings, extra_stats
+
+    def _retained_columns(self, package: Package, catalog_name: str) -> Tuple[bool, Optional[List[str]]]:
+        """
+        Qué se conserva del DataFrame de un catálogo después de validarlo
+
+        Con retain_dataframes se conserva completo (materializaciones); si no, solo
+        las columnas que leen las reglas de paquete, según el análisis de sus expresiones.
+
+        Returns:
+            Tuple[bool, Optional[List[str]]]: (conservar el DataFrame, columnas o None para todas)
+        """
+        if self.retain_dataframes:
+            return True, None
+        if not package.package_validation:
+            return False, None
+        dependencies = merge_package_columns(package.package_validation)
+        if dependencies is None:
+            return True, None
+        if catalog_name not in dependencies:
+            return False, None
+        return True, dependencies[catalog_name]
+
+    @staticmethod
+    def _project_columns(df: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+        """Deja solo `columns` (las que existan); None las conserva todas"""
+        if columns is None:
+            return df
+        return df[[column for column in df.columns if column in columns]]
+
+    def _merge_parallel_result(self, result: CatalogResult) -> Tuple[Optional[pd.DataFrame], int, int, int, Dict]:
+        """
+        Incorpora el resultado de un catálogo validado en un proceso hijo:
+        reproduce sus eventos en el logger y suma sus contadores
+
+        Raises:
+            FileProcessingError: Si la lectura o validación falló en el proceso hijo
+        """
+        self._merge_worker_output(result)
+        if result.error is not None:
+            raise FileProcessingError(result.error)
+        return result.df, result.file_records, result.file_errors, result.file_warnings, result.extra_stats
+
+    def _merge_worker_output(self, result: WorkerOutput) -> None:
+        """Reproduce los eventos de un proceso hijo en el logger y suma sus contadores y estadísticas"""
+        self.logger.replay(result.records)
+        self.logger.format_errors.extend(result.format_errors)
+        self.error_count += result.error_count
+        self.warning_count += result.warning_count
+        self.allocation_stats.merge(result.allocation_stats)
+        self.memory.merge(result.memory)
+        self.rule_timings.merge(result.rule_timings)
+        self.error_groups.merge(result.error_groups)
+        for merged, skipped in ((self.field_rules_skipped, result.field_rules_skipped),
+                                (self.row_rules_skipped, result.row_rules_skipped),
+                                (self.catalog_rules_skipped, result.catalog_rules_skipped)):
+            for key, rules in skipped.items():
+                merged.setdefault(key, {}).update(rules)
 
     def process_zip_file(self, zip_path: str, package_name: str) -> Tuple[int, int]:
         """Process a ZIP file containing multiple catalogs"""
@@ -753,115 +1597,140 @@ class FileProcessor:
         # Lista para almacenar las estadísticas de cada archivo para el DataFrame resumen
         files_summary_data = []
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Extract ZIP contents
-            try:
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(temp_dir)
-            except Exception as e:
-                raise FileProcessingError(f"Error extracting ZIP file: {str(e)}")
-
-            # Process each catalog in the package
-            for catalog_name in package.catalogs:
-                catalog = self.config.catalogs.get(catalog_name)
-                if not catalog:
-                    raise FileProcessingError(f"Catalog '{catalog_name}' not found in configuration")
-
-                file_path = os.path.join(temp_dir, catalog.filename)
-                if not os.path.exists(file_path):
-                    # Registrar el archivo faltante en el logger
-                    self.logger.register_missing_file(catalog.filename, package_name)
-                    # Lanzar la excepción pero continuar con otros archivos
-                    self.error_count += 1
-                    self.logger.error(
-                        f"Required file '{catalog.filename}' not found in ZIP package",
-                        file=catalog.filename,
-                        package=package_name
-                    )
-                    # Añadir entrada para archivo faltante en el resumen
-                    files_summary_data.append({
-                        'archivo': catalog.filename,
-                        'catalogo': catalog_name,
-                        'registros': 0,
-                        'errores': 1,
-                        'advertencias': 0,
-                        'estado': 'Faltante'
-                    })
-                    continue
-
-                try:
-                    df = self._read_file(file_path, catalog)
-                    self.logger.message(f"Processing catalog: {catalog_name}")
-
-                    # Store initial error and warning counts
-                    initial_errors = self.error_count
-                    initial_warnings = self.warning_count
-
-                    self.validate_catalog(df, catalog)
+        # El ZIP se abre una sola vez y cada catálogo se lee como un flujo
+        # directamente del archivo, sin extraerlo a disco
+        try:
+            zip_ref = zipfile.ZipFile(zip_path, 'r')
+            zip_members = set(zip_ref.namelist())
+        except Exception as e:
+            raise FileProcessingError(f"Error reading ZIP file: {str(e)}")
+
+        with zip_ref:
+            # Qué conservar de cada catálogo para las reglas de paquete (o las materializaciones)
+            retained = {name: self._retained_columns(package, name) for name in package.catalogs}
+
+            # Lanzar en paralelo los catálogos presentes; los resultados se
+            # incorporan después en el orden del paquete
+            executor = None
+            futures = {}
+            pending = [
+                (name, self.config.catalogs[name], ZipMember(zip_ref, self.config.catalogs[name].filename))
+                for name in package.catalogs
+                if name in self.config.catalogs and self.config.catalogs[name].filename in zip_members
+            ]
+            if self.parallel_workers > 1 and len(pending) > 1:
+                workers = min(self.parallel_workers, len(pending))
+                executor = process_pool(workers)
+                self.logger.message(f"Procesando {len(pending)} catálogos en paralelo con {workers} procesos")
+                for name, catalog, file_path in pending:
+                    keep_dataframe, keep_columns = retained[name]
+                    futures[name] = executor.submit(validate_catalog_task, CatalogTask(
+                        self.config, name, file_path, keep_dataframe,
+                        self.streaming_enabled, self.streaming_chunk_size, self.engine, keep_columns
+                    ))
 
-                    # Calculate records and errors/warnings for this file
-                    file_records = len(df)
-                    file_errors = self.error_count - initial_errors
-                    file_warnings = self.warning_count - initial_warnings
+            try:
+                # Process each catalog in the package
+                for catalog_name in package.catalogs:
+                    catalog = self.config.catalogs.get(catalog_name)
+                    if not catalog:
+                        raise FileProcessingError(f"Catalog '{catalog_name}' not found in configuration")
+
+                    file_path = ZipMember(zip_ref, catalog.filename)
+                    if catalog.filename not in zip_members:
+                        # Registrar el archivo faltante en el logger
+                        self.logger.register_missing_file(catalog.filename, package_name)
+                        # Lanzar la excepción pero continuar con otros archivos
+                        self.error_count += 1
+                        self.logger.error(
+                            f"Required file '{catalog.filename}' not found in ZIP package",
+                            file=catalog.filename,
+                            package=package_name
+                        )
+                        # Añadir entrada para archivo faltante en el resumen
+                        files_summary_data.append({
+                            'archivo': catalog.filename,
+                            'catalogo': catalog_name,
+                            'registros': 0,
+                            'errores': 1,
+                            'advertencias': 0,
+                            'estado': 'Faltante'
+                        })
+                        continue
 
-                    # Log summary for this file in a clean format
-                    success_rate = ((file_records - file_errors) / file_records * 100) if file_records > 0 else 0
-                    summary = f"""Summary for {catalog.filename}:
+                    try:
+                        if catalog_name in futures:
+                            df, file_records, file_errors, file_warnings, extra_stats = \
+                                self._merge_parallel_result(futures[catalog_name].result())
+                        else:
+                            keep_dataframe, keep_columns = retained[catalog_name]
+                            df, file_records, file_errors, file_warnings, extra_stats = \
+                                self._validate_catalog_file(file_path, catalog_name, catalog,
+                                                            keep_dataframe, keep_columns)
+
+                        # Log summary for this file in a clean format
+                        success_rate = ((file_records - file_errors) / file_records * 100) if file_records > 0 else 0
+                        summary = f"""Summary for {catalog.filename}:
 Total records: {file_records}
 Errors: {file_errors}
 Warnings: {file_warnings}
 Success rate: {success_rate:.2f}%
 
 """
-                    self.logger.message(summary)
-
-                    # Registrar estadísticas de este archivo para el reporte
-                    self.logger.register_file_stats(
-                        catalog.filename, 
-                        file_records, 
-                        file_errors, 
-                        file_warnings
-                    )
+                        self.logger.message(summary)
+
+                        # Registrar estadísticas de este archivo para el reporte
+                        self.logger.register_file_stats(
+                            catalog.filename, 
+                            file_records, 
+                            file_errors, 
+                            file_warnings,
+                            **extra_stats
+                        )
 
-                    # Añadir información a la lista para el DataFrame resumen
-                    files_summary_data.append({
-                        'archivo': catalog.filename,
-                        'catalogo': catalog_name,
-                        'registros': file_records,
-                        'errores': file_errors,
-                        'advertencias': file_warnings,
-                        'estado': 'Procesado'
-                    })
+                        # Añadir información a la lista para el DataFrame resumen
+                        files_summary_data.append({
+                            'archivo': catalog.filename,
+                            'catalogo': catalog_name,
+                            'registros': file_records,
+                            'errores': file_errors,
+                            'advertencias': file_warnings,
+                            'estado': 'Procesado'
+                        })
 
-                    total_records += file_records
+                        total_records += file_records
 
-                    # Store DataFrame for package-level validations
-                    self.dataframes[catalog_name] = df
+                        # Store DataFrame for package-level validations
+                        if df is not None:
+                            self.dataframes[catalog_name] = df
 
-                except Exception as e:
-                    # Registrar el error pero continuar con otros archivos
-                    self.error_count += 1
-                    error_msg = f"Error processing catalog '{catalog_name}': {str(e)}"
-                    self.logger.error(error_msg, file=catalog.filename, exception=e)
-
-                    # Registrar estadísticas con 0 registros procesados correctamente
-                    self.logger.register_file_stats(
-                        catalog.filename, 
-                        0,  # ningún registro procesado correctamente
-                        1,  # un error crítico
-                        0   # sin advertencias
-                    )
+                    except Exception as e:
+                        # Registrar el error pero continuar con otros archivos
+                        self.error_count += 1
+                        error_msg = f"Error processing catalog '{catalog_name}': {str(e)}"
+                        self.logger.error(error_msg, file=catalog.filename, exception=e)
+
+                        # Registrar estadísticas con 0 registros procesados correctamente
+                        self.logger.register_file_stats(
+                            catalog.filename, 
+                            0,  # ningún registro procesado correctamente
+                            1,  # un error crítico
+                            0   # sin advertencias
+                        )
                     
-                    # Añadir información a la lista para el DataFrame resumen
-                    files_summary_data.append({
-                        'archivo': catalog.filename,
-                        'catalogo': catalog_name,
-                        'registros': 0,
-                        'errores': 1,
-                        'advertencias': 0,
-                        'estado': 'Error'
-                    })
-                    continue  # Continuar con el siguiente catálogo
+                        # Añadir información a la lista para el DataFrame resumen
+                        files_summary_data.append({
+                            'archivo': catalog.filename,
+                            'catalogo': catalog_name,
+                            'registros': 0,
+                            'errores': 1,
+                            'advertencias': 0,
+                            'estado': 'Error'
+                        })
+                        continue  # Continuar con el siguiente catálogo
+            finally:
+                if executor is not None:
+                    executor.shutdown(cancel_futures=True)
 
             # Apply package-level validations
             self.validate_package(package)
@@ -1046,24 +1915,50 @@ Warnings: {self.warning_count}
     def _process_single_file(self, file_path: str, catalog) -> Tuple[int, int]:
         """Procesa un archivo individual usando un catálogo específico"""
         try:
-            df = self._read_file(file_path, catalog)
-            self.last_processed_df = df
-            cols_count = len(df.columns)
-            column_names = ", ".join(df.columns.tolist())
+            extra_stats = {}
+            # Un CSV acumulativo se valida por bloques a partir de las filas agregadas
+            incremental = self._use_incremental(file_path, catalog)
+            # Un CSV grande se divide en rangos de bytes que se validan en paralelo
+            ranges = None if incremental else self._split_for_parallel(file_path, catalog)
+            if incremental or ranges or self._use_streaming(file_path, catalog):
+                self.logger.message(f"Processing file: {file_path}")
+
+                # Store initial error and warning counts
+                initial_errors = self.error_count
+                initial_warnings = self.warning_count
+
+                processed = None
+                if incremental:
+                    df, file_records, extra_stats['incremental'] = self._process_catalog_incremental(
+                        file_path, catalog, self.retain_dataframes
+                    )
+                    processed = df, file_records
+                elif ranges:
+                    processed = self._process_catalog_ranges(file_path, catalog, ranges, self.retain_dataframes)
+                if processed is None:
+                    processed = self._process_catalog_streaming(file_path, catalog, self.retain_dataframes)
+                df, file_records = processed
+                self.last_processed_df = df
+                extra_stats['peak_rss_mb'] = self.last_peak_rss_mb
+            else:
+                df = self._read_file(file_path, catalog)
+                self.last_processed_df = df
+                cols_count = len(df.columns)
+                column_names = ", ".join(df.columns.tolist())
 
-            # Información detallada sobre el archivo y su estructura
-            self.logger.message(f"Processing file: {file_path}")
-            self.logger.message(f"DataFrame columns count: {cols_count}")
-            self.logger.message(f"DataFrame columns: {column_names}")
+                # Información detallada sobre el archivo y su estructura
+                self.logger.message(f"Processing file: {file_path}")
+                self.logger.message(f"DataFrame columns count: {cols_count}")
+                self.logger.message(f"DataFrame columns: {column_names}")
 
-            # Store initial error and warning counts
-            initial_errors = self.error_count
-            initial_warnings = self.warning_count
+                # Store initial error and warning counts
+                initial_errors = self.error_count
+                initial_warnings = self.warning_count
 
-            self.validate_catalog(df, catalog)
+                self.validate_catalog(df, catalog)
+                file_records = len(df)
 
-            # Calculate records and errors/warnings for this file
-            file_records = len(df)
+            # Calculate errors/warnings for this file
             file_errors = self.error_count - initial_errors
             file_warnings = self.warning_count - initial_warnings
 
@@ -1083,7 +1978,8 @@ Success rate: {success_rate:.2f}%
                 os.path.basename(file_path), 
                 file_records, 
                 file_errors, 
-                file_warnings
+                file_warnings,
+                **extra_stats
             )
 
             # También mostrar resumen para archivos individuales
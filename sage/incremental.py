@@ -0,0 +1,158 @@
+"""
+Validación incremental de archivos acumulativos (file_format.incremental)
+
+Algunos emisores envían cada día el archivo completo, con las filas nuevas al
+final. Por emisor y catálogo se guarda la huella del prefijo ya validado
+(filas, bytes y SHA-256 de esos bytes) y el índice de claves únicas de sus
+filas. Si el archivo siguiente empieza con el mismo prefijo, solo se validan
+las filas agregadas, y las claves únicas se buscan también en el índice
+guardado; si no, se valida el archivo completo y se guarda su huella.
+"""
+import hashlib
+import json
+import os
+import re
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .uniqueness import UniquenessIndex
+from .utils import env_flag
+
+HASH_BLOCK_SIZE = 1 << 20  # Bloques de 1 MB al calcular la huella
+STATE_FILE = 'state.json'
+
+
+@dataclass
+class PrefixState:
+    """Huella de las filas ya validadas de un catálogo para un emisor"""
+    rows: int                  # Filas de datos del prefijo
+    bytes: int                 # Tamaño del prefijo (el archivo validado completo)
+    sha256: str                # Hash del prefijo
+    yaml_hash: str             # Un YAML distinto invalida el prefijo: sus reglas eran otras
+    errors: int = 0            # Errores y advertencias de las filas del prefijo, que se
+    warnings: int = 0          # vuelven a contar en cada ejecución (sin reglas de catálogo)
+    date_formats: Dict[str, Optional[str]] = field(default_factory=dict)  # {campo: formato inferido}
+    index_file: Optional[str] = None  # Archivo .npz con el índice de claves únicas
+    index_fields: List[List[str]] = field(default_factory=list)  # Campos de cada índice guardado
+
+
+def scan_prefix(path: str, previous: Optional[PrefixState]) -> Tuple[bool, int, str]:
+    """
+    Recorre el archivo una vez calculando su hash, y verifica si empieza con el prefijo anterior
+
+    El hash del prefijo se toma a mitad del recorrido, de modo que el mismo hash
+    continúa hasta el final del archivo y queda como huella del siguiente prefijo.
+    Si el prefijo no terminaba en un salto de línea, el archivo nuevo tiene que
+    continuar con uno: si no, la última fila validada cambió.
+
+    Returns:
+        Tuple[bool, int, str]: (el archivo extiende el prefijo anterior, tamaño, hash del archivo)
+    """
+    digest = hashlib.sha256()
+    size = 0
+    boundary = previous.bytes if previous is not None else None
+    matches = False
+    last_byte = b'\n'  # Último byte del prefijo
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            if boundary is not None and size <= boundary < size + len(block):
+                head = block[:boundary - size]
+                digest.update(head)
+                if head:
+                    last_byte = head[-1:]
+                next_byte = block[boundary - size:boundary - size + 1]
+                matches = digest.hexdigest() == previous.sha256 and (last_byte == b'\n' or next_byte in b'\r\n')
+                digest.update(block[boundary - size:])
+                boundary = None
+            else:
+                digest.update(block)
+                if boundary is not None and block:
+                    last_byte = block[-1:]
+            size += len(block)
+    if boundary is not None and boundary == size:
+        # El archivo es igual al prefijo (sin filas nuevas)
+        matches = digest.hexdigest() == previous.sha256
+    return matches, size, digest.hexdigest()
+
+
+class IncrementalStore:
+    """Prefijos validados e índices de claves únicas, en un directorio por emisor y catálogo"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @classmethod
+    def from_env(cls) -> Optional['IncrementalStore']:
+        """
+        Almacén configurado por entorno, o None si la validación incremental está
+        desactivada (SAGE_INCREMENTAL=0). SAGE_INCREMENTAL_DIR indica el directorio
+        (por defecto executions/.incremental).
+        """
+        if not env_flag('SAGE_INCREMENTAL', True):
+            return None
+        return cls(os.environ.get('SAGE_INCREMENTAL_DIR') or os.path.join(os.getcwd(), 'executions', '.incremental'))
+
+    def _dir(self, emisor_id: int, filename: str) -> str:
+        return os.path.join(self.directory, str(emisor_id), re.sub(r'[^\w.-]', '_', filename))
+
+    def load(self, emisor_id: int, filename: str) -> Optional[PrefixState]:
+        """Huella del prefijo validado, o None si no hay una (o está dañada)"""
+        try:
+            with open(os.path.join(self._dir(emisor_id, filename), STATE_FILE), encoding='utf-8') as f:
+                return PrefixState(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def load_indexes(self, emisor_id: int, filename: str,
+                     state: PrefixState) -> Optional[Dict[Tuple[str, ...], UniquenessIndex]]:
+        """Índices de claves únicas de las filas del prefijo, o None si no se pudieron leer"""
+        if state.index_file is None:
+            return {}
+        try:
+            with np.load(os.path.join(self._dir(emisor_id, filename), state.index_file)) as arrays:
+                return {
+                    tuple(fields): UniquenessIndex.from_arrays(
+                        fields, arrays[f'{i}_hashes'], arrays[f'{i}_lines'],
+                        [arrays[f'{i}_key{j}'] for j in range(len(fields))]
+                    )
+                    for i, fields in enumerate(state.index_fields)
+                }
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, emisor_id: int, filename: str, state: PrefixState,
+             indexes: Dict[Tuple[str, ...], UniquenessIndex]) -> None:
+        """
+        Guarda la huella y los índices. El índice se escribe con un nombre nuevo y
+        state.json se reemplaza al final, para que nunca apunte a un índice a medio escribir.
+        """
+        directory = self._dir(emisor_id, filename)
+        os.makedirs(directory, exist_ok=True)
+        previous = self.load(emisor_id, filename)
+
+        arrays = {}
+        state.index_fields = []
+        for i, (fields, index) in enumerate(indexes.items()):
+            hashes, lines, keys = index.to_arrays()
+            arrays[f'{i}_hashes'], arrays[f'{i}_lines'] = hashes, lines
+            for j, column in enumerate(keys):
+                arrays[f'{i}_key{j}'] = column.astype(str)
+            state.index_fields.append(list(fields))
+        state.index_file = None
+        if arrays:
+            state.index_file = f'keys-{uuid.uuid4().hex}.npz'
+            np.savez(os.path.join(directory, state.index_file), **arrays)
+
+        temp_path = os.path.join(directory, f'{STATE_FILE}.{os.getpid()}.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(state), f)
+        os.replace(temp_path, os.path.join(directory, STATE_FILE))
+
+        if previous is not None and previous.index_file and previous.index_file != state.index_file:
+            try:
+                os.remove(os.path.join(directory, previous.index_file))
+            except OSError:
+                pass
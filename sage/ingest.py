@@ -0,0 +1,84 @@
+"""Lectura de CSV en una sola pasada: detección de codificación por muestra y opciones del parser"""
+import codecs
+import csv
+import io
+from typing import Any, Dict, List, Optional
+
+from .models import Catalog
+
+SAMPLE_SIZE = 64 * 1024  # Bytes leídos del inicio del archivo para detectar codificación y columnas
+
+# Manejador de errores de decodificación: si una secuencia no es UTF-8 válida se
+# interpreta como latin1. Así un archivo UTF-8 con algunos bytes latin1 más
+# adelante no obliga a releerlo completo con otra codificación.
+LATIN1_FALLBACK = 'sage_latin1_fallback'
+codecs.register_error(LATIN1_FALLBACK, lambda e: (e.object[e.start:e.end].decode('latin1'), e.end))
+
+# Tipos que el parser debe leer como texto (sin inferir números)
+TEXT_TYPES = {'texto', 'fecha'}
+
+
+def sniff_encoding(sample: bytes) -> str:
+    """
+    Detecta la codificación a partir de los primeros bytes del archivo
+
+    Returns:
+        str: 'utf-8-sig' si hay BOM, 'utf-8' si la muestra es UTF-8 válida, 'latin1' en otro caso
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        # final=False: la muestra puede cortar un carácter multibyte al final
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin1'
+
+
+def first_row(sample: bytes, encoding: str, delimiter: str) -> Optional[List[str]]:
+    """
+    Devuelve los campos de la primera línea de la muestra (encabezado o primera fila)
+
+    Returns:
+        Optional[List[str]]: Campos de la primera línea, o None si no entra completa en la muestra
+    """
+    text = sample.decode(encoding, errors=LATIN1_FALLBACK)
+    if '\n' not in text and len(sample) >= SAMPLE_SIZE:
+        return None
+    try:
+        return next(csv.reader(io.StringIO(text), delimiter=delimiter))
+    except (StopIteration, csv.Error):
+        return None
+
+
+def csv_read_options(catalog: Catalog, columns: Optional[List[str]]) -> Dict[str, Any]:
+    """
+    Deriva de los campos del catálogo los tipos y la proyección de columnas para pd.read_csv
+
+    Los campos de texto y fecha se leen como str (la fecha se convierte una sola vez
+    después); los numéricos se dejan al parser, que los convierte al leer. Si el
+    archivo trae más columnas que el YAML, solo se leen las del catálogo.
+
+    Args:
+        catalog: Catálogo con la definición de campos
+        columns: Campos de la primera línea del archivo (ver first_row), si se conocen
+
+    Returns:
+        Dict[str, Any]: Opciones para pd.read_csv y 'file_columns' con el número
+        de columnas del archivo (None si no se pudo determinar)
+    """
+    field_names = [field.name for field in catalog.fields]
+    options: Dict[str, Any] = {'file_columns': len(columns) if columns is not None else None}
+
+    if catalog.file_format.header:
+        options['dtype'] = {field.name: str for field in catalog.fields if field.type in TEXT_TYPES}
+        if columns is not None and len(columns) > len(field_names):
+            wanted = set(field_names)
+            options['usecols'] = lambda column: column in wanted
+    elif columns is not None:
+        # Sin encabezado los campos se asignan por posición
+        options['dtype'] = {i: str for i, field in enumerate(catalog.fields)
+                            if field.type in TEXT_TYPES and i < len(columns)}
+        if len(columns) > len(field_names):
+            options['usecols'] = list(range(len(field_names)))
+    return options
@@ -0,0 +1,182 @@
+"""
+Escritura con búfer de las salidas de SageLogger (report.html y output.log)
+
+Antes cada evento abría el archivo en modo append, escribía su bloque y lo
+cerraba: un archivo con 50.000 advertencias significaba 100.000 aperturas.
+Cada salida mantiene ahora un único handle abierto y acumula los bloques en
+memoria hasta juntar FLUSH_BYTES caracteres o hasta que pasen FLUSH_SECONDS
+desde la última escritura a disco. El contenido es exactamente el mismo: solo
+cambia cuántas veces se llega al disco.
+
+En modo asíncrono (SAGE_LOG_ASYNC=1) el formato de los eventos, la escritura
+y la consola quedan además a cargo de un hilo de fondo (BackgroundLogWriter).
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, List, Optional
+
+from .utils import env_int
+
+
+class BufferedLogWriter:
+    """Archivo de texto con un handle persistente y escrituras en bloques"""
+
+    FLUSH_BYTES = 256 * 1024  # Caracteres acumulados antes de escribir a disco
+    FLUSH_SECONDS = 1.0       # Tiempo máximo que un bloque espera en memoria
+
+    def __init__(self, path: str, mode: str = 'w', flush_bytes: int = None, flush_seconds: float = None):
+        """
+        Args:
+            mode: 'w' crea (o vacía) el archivo, 'a' agrega al final
+            flush_bytes: Tamaño del búfer; por defecto SAGE_LOG_BUFFER_KB o FLUSH_BYTES
+                (0 escribe cada bloque apenas llega)
+        """
+        self.path = path
+        if flush_bytes is None:
+            flush_bytes = env_int('SAGE_LOG_BUFFER_KB', self.FLUSH_BYTES // 1024) * 1024
+        self.flush_bytes = max(flush_bytes, 0)
+        self.flush_seconds = self.FLUSH_SECONDS if flush_seconds is None else flush_seconds
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self._handle = open(path, mode, encoding='utf-8')
+
+    @property
+    def closed(self) -> bool:
+        return self._handle is None
+
+    def write(self, text: str) -> None:
+        """
+        Agrega texto a la salida. Con el archivo ya cerrado (eventos posteriores
+        al resumen) se escribe directamente, abriéndolo en modo append como antes.
+        """
+        if not text:
+            return
+        if self._handle is None:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(text)
+            return
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self.flush_bytes or time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self) -> None:
+        """Escribe a disco lo acumulado en el búfer"""
+        if self._handle is None:
+            return
+        if self._buffer:
+            self._handle.write(''.join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+        self._handle.flush()  # Visible para quien lea el archivo mientras se valida
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Escribe lo pendiente y cierra el handle (se puede llamar más de una vez)"""
+        if self._handle is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._handle.close()
+            self._handle = None
+
+
+class BackgroundLogWriter:
+    """
+    Hilo que formatea y escribe los eventos del logger fuera del hilo de validación
+
+    Los lotes de eventos se encolan ya con su marca de tiempo y el hilo los pasa,
+    en el mismo orden, a `handler`. La cola está acotada por cantidad de eventos
+    (MAX_PENDING): si el hilo no alcanza a la validación, put() espera a que se
+    libere lugar. Ningún evento se descarta, porque los reportes los necesitan
+    todos; la cola solo limita la memoria que pueden ocupar los pendientes.
+    """
+
+    MAX_PENDING = 50_000  # Eventos encolados como máximo antes de que put() espere
+
+    def __init__(self, handler: Callable[[Any], None], on_idle: Optional[Callable[[], None]] = None,
+                 max_pending: int = None, idle_seconds: float = BufferedLogWriter.FLUSH_SECONDS):
+        """
+        Args:
+            handler: Procesa un elemento encolado (en el hilo de fondo)
+            on_idle: Se llama cuando la cola pasa idle_seconds vacía, p. ej. para
+                escribir a disco lo que quedó en los búferes
+            max_pending: Por defecto SAGE_LOG_QUEUE_EVENTS o MAX_PENDING
+        """
+        self.handler = handler
+        self.on_idle = on_idle
+        self.max_pending = max_pending or env_int('SAGE_LOG_QUEUE_EVENTS', self.MAX_PENDING) or self.MAX_PENDING
+        self.idle_seconds = idle_seconds
+        self.seconds = 0.0      # Tiempo de trabajo del hilo (formato, archivos y consola)
+        self.waits = 0          # Veces que put() esperó por la cola llena
+        self.error = None       # Primera excepción del handler, que se propaga en stop()
+        self._items = deque()   # (elemento, cantidad de eventos)
+        self._pending = 0
+        self._busy = False
+        self._stopping = False
+        self._condition = threading.Condition()
+        # daemon: un logger que nunca se cierra no impide que el proceso termine
+        self._thread = threading.Thread(target=self._run, name='sage-logger', daemon=True)
+        self._thread.start()
+
+    def put(self, item: Any, events: int = 1) -> None:
+        """Encola un elemento; si la cola está llena, espera a que el hilo la vacíe"""
+        with self._condition:
+            if self._pending and self._pending + events > self.max_pending:
+                self.waits += 1
+                while self._pending and self._pending + events > self.max_pending and self._thread.is_alive():
+                    self._condition.wait()
+            self._items.append((item, events))
+            self._pending += events
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._items and not self._stopping:
+                    if not self._condition.wait(self.idle_seconds) and self.on_idle is not None:
+                        self._call(self.on_idle)
+                if not self._items:
+                    return
+                item, events = self._items.popleft()
+                self._busy = True
+            self._call(self.handler, item)
+            with self._condition:
+                self._pending -= events
+                self._busy = False
+                self._condition.notify_all()
+
+    def _call(self, function: Callable, *args) -> None:
+        start = time.perf_counter()
+        try:
+            function(*args)
+        except Exception as e:  # Se guarda la primera y el hilo sigue con los demás eventos
+            if self.error is None:
+                self.error = e
+        finally:
+            self.seconds += time.perf_counter() - start
+
+    def drain(self) -> None:
+        """Espera a que el hilo procese todo lo encolado"""
+        with self._condition:
+            while (self._items or self._busy) and self._thread.is_alive():
+                self._condition.wait()
+
+    def stop(self) -> None:
+        """
+        Procesa lo pendiente y termina el hilo
+
+        Raises:
+            Exception: La primera excepción que lanzó el handler, si hubo alguna
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
@@ -4,12 +4,26 @@ import json
 import traceback
 from datetime import datetime
 import uuid
+from html import escape
+from itertools import islice
 from typing import Optional, Dict, List, Any
 from urllib.parse import urlparse
-from rich.console import Console
-from rich.theme import Theme
-from rich.text import Text
-from rich.traceback import Traceback
+from .event_store import EventStore, json_safe
+from .log_writer import BackgroundLogWriter, BufferedLogWriter
+from .profiling import MEMORY_STAGES, STAGES, StageTimings, timed_stage
+from .utils import env_flag
+
+# Niveles de salida por consola, de menos a más: nada, solo el resumen final,
+# además los errores y advertencias, o todos los eventos
+CONSOLE_LEVELS = ('off', 'summary', 'warnings', 'all')
+
+
+class PlainConsole:
+    """Consola de texto plano del modo headless: no importa ni inicializa rich"""
+
+    def print(self, text: str = "") -> None:
+        print(text, flush=True)
+
 
 class SageLogger:
     ICONS = {
@@ -29,7 +43,22 @@ class SageLogger:
         "rule": "📏"
     }
 
-    def __init__(self, log_dir: str, casilla_id: Optional[int] = None, emisor_id: Optional[int] = None, metodo_envio: Optional[str] = None):
+    # Marcadores de report.json que se reemplazan por los fallos y eventos del almacén
+    FAILURES_MARKER = "@@sage:validation_failures@@"
+    EVENTS_MARKER = "@@sage:events@@"
+
+    def __init__(self, log_dir: str, casilla_id: Optional[int] = None, emisor_id: Optional[int] = None, metodo_envio: Optional[str] = None,
+                 async_logging: Optional[bool] = None, console: Optional[str] = None, headless: Optional[bool] = None):
+        """
+        Args:
+            async_logging: Formatear y escribir los eventos en un hilo de fondo (ver
+                log_writer.BackgroundLogWriter); por defecto según SAGE_LOG_ASYNC
+            console: Qué se imprime en consola (ver CONSOLE_LEVELS); por defecto
+                SAGE_CONSOLE, o 'all' ('off' en modo headless)
+            headless: Ejecución sin terminal (p. ej. dentro de sage_daemon2): rich no se
+                importa y lo que el nivel de consola indique se imprime como texto plano;
+                por defecto según SAGE_HEADLESS
+        """
         self.log_dir = log_dir
         self.report_html = os.path.join(log_dir, "report.html")  # HTML para navegador (renombrado de output.log)
         self.output_log = os.path.join(log_dir, "output.log")    # Log de sistema en texto plano
@@ -46,23 +75,59 @@ class SageLogger:
         self.field_rules_skipped = {}  # {field_name: {rule_name: error_count}}
         self.row_rules_skipped = {}  # {catalog_name: {rule_name: error_count}}
         self.catalog_rules_skipped = {}  # {catalog_name: {rule_name: error_count}}
+        self.rule_timings = []  # Tiempo por regla y motor, de la más lenta a la más rápida
+        self.error_groups = []  # Filas que fallaron por (archivo, campo, regla), con ejemplos (ver error_groups)
+        self.stage_timings = StageTimings()  # Tiempo por etapa, compartido con FileProcessor
+        self.memory = {}  # Pico de RSS y huella de los DataFrames (ver register_memory)
+        self.cached_from = None  # Ejecución cuyo resultado se reutilizó (ver reuse_result)
+
+        # Estructuras de datos para el reporte JSON: los últimos eventos en memoria y el
+        # resto en events.jsonl y validation_failures.jsonl (ver event_store)
+        self.events = EventStore(os.path.join(log_dir, "events.jsonl"))  # Todos los eventos (errores, advertencias, mensajes)
+        self.validation_failures = EventStore(os.path.join(log_dir, "validation_failures.jsonl"))  # Fallos en validaciones
+        # Con SAGE_REPORT_ROW_DETAIL=0 report.json no repite fallos y eventos fila a fila:
+        # los grupos de errores son el resumen y el detalle queda en los archivos JSONL
+        self.inline_row_detail = env_flag('SAGE_REPORT_ROW_DETAIL', True)
+
+        # Inicializar el log de sistema (texto plano); report.html y output.log se
+        # escriben en bloques a través de un handle abierto por salida (ver log_writer)
+        self._text_out = BufferedLogWriter(self.output_log, "w")
+        header = f"=== SAGE Log Inicio: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')} ===\n"
+        header += f"Directorio: {self.log_dir}\n"
+        if self.casilla_id:
+            header += f"Casilla ID: {self.casilla_id}\n"
+        if self.emisor_id:
+            header += f"Emisor ID: {self.emisor_id}\n"
+        if self.metodo_envio:
+            header += f"Método de envío: {self.metodo_envio}\n"
+        self._text_out.write(header + "=" * 60 + "\n\n")
+        self.headless = headless if headless is not None else env_flag('SAGE_HEADLESS', False)
+        if console is None:
+            console = os.environ.get('SAGE_CONSOLE', '').strip().lower()
+            if console not in CONSOLE_LEVELS:
+                console = 'off' if self.headless else 'all'
+        elif console not in CONSOLE_LEVELS:
+            raise ValueError(f"Nivel de consola inválido: '{console}'. Debe ser uno de: {', '.join(CONSOLE_LEVELS)}")
+        self.console_level = console
+        self.console = None
+        if console != 'off':
+            self.console = PlainConsole() if self.headless else self._rich_console()
+
+        # Initialize log file with HTML structure
+        self._initialize_log_file()
 
-        # Estructuras de datos para el reporte JSON
-        self.events = []  # Lista de todos los eventos (errores, advertencias, mensajes)
-        self.validation_failures = []  # Lista detallada de fallos en validaciones
-
-        # Inicializar el log de sistema (texto plano)
-        with open(self.output_log, "w", encoding="utf-8") as f:
-            f.write(f"=== SAGE Log Inicio: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')} ===\n")
-            f.write(f"Directorio: {self.log_dir}\n")
-            if self.casilla_id:
-                f.write(f"Casilla ID: {self.casilla_id}\n")
-            if self.emisor_id:
-                f.write(f"Emisor ID: {self.emisor_id}\n")
-            if self.metodo_envio:
-                f.write(f"Método de envío: {self.metodo_envio}\n")
-            f.write("=" * 60 + "\n\n")
-        self.console = Console(theme=Theme({
+        # En modo asíncrono log() solo encola los eventos; el hilo de fondo se detiene
+        # (después de procesar todo lo encolado) en summary() o al cerrar el log
+        self._background = None
+        if async_logging if async_logging is not None else env_flag('SAGE_LOG_ASYNC', False):
+            self._background = BackgroundLogWriter(self._emit_records, on_idle=self._flush_outputs)
+
+    @staticmethod
+    def _rich_console():
+        """Consola de rich, importado solo cuando hace falta (no en modo headless)"""
+        from rich.console import Console
+        from rich.theme import Theme
+        return Console(theme=Theme({
             "error": "red",
             "warning": "yellow",
             "message": "blue",
@@ -72,8 +137,11 @@ class SageLogger:
             "detail": "dim"
         }))
 
-        # Initialize log file with HTML structure
-        self._initialize_log_file()
+    def _prints_event(self, severity: str) -> bool:
+        """Indica si un evento con esta severidad se imprime en consola"""
+        if self.console is None:
+            return False
+        return self.console_level == 'all' or (self.console_level == 'warnings' and severity in ('error', 'warning'))
 
     def __del__(self):
         """Ensure HTML structure is closed when logger is destroyed"""
@@ -208,27 +276,35 @@ class SageLogger:
 <body>
 <div class="log-container">
 """
-        with open(self.report_html, "w", encoding="utf-8") as f:
-            f.write(html_header)
+        self._html_out = BufferedLogWriter(self.report_html, "w")
+        self._html_out.write(html_header)
 
     def _close_log_file(self):
-        """Close the HTML structure in the log file"""
+        """Close the HTML structure in the log file and flush and close both outputs"""
         try:
-            with open(self.report_html, "a", encoding="utf-8") as f:
-                f.write("\n</div>\n</body>\n</html>")
+            self._stop_background()
+        except Exception:
+            pass  # Los errores del hilo de fondo se propagan en summary(); al cerrar se ignoran
+        try:
+            self._html_out.write("\n</div>\n</body>\n</html>")
+            self._html_out.close()
         except:
             pass  # Ignore errors when closing file during cleanup
 
         # También cerrar el log de texto
         try:
             elapsed_time = datetime.now() - self.start_time
-            with open(self.output_log, "a", encoding="utf-8") as f:
-                f.write(f"\n=== SAGE Log Fin: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===\n")
-                f.write(f"Tiempo transcurrido: {elapsed_time}\n")
-                f.write("=" * 60 + "\n")
+            self._text_out.write(f"\n=== SAGE Log Fin: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===\n"
+                                 f"Tiempo transcurrido: {elapsed_time}\n" + "=" * 60 + "\n")
+            self._text_out.close()
         except:
             pass
 
+        # Los eventos ya volcados quedan completos en events.jsonl y validation_failures.jsonl
+        for store in (getattr(self, 'events', None), getattr(self, 'validation_failures', None)):
+            if isinstance(store, EventStore):
+                store.close()
+
     def _get_severity_colors(self, severity: str) -> dict:
         """Get color scheme based on severity"""
         colors = {
@@ -300,44 +376,144 @@ class SageLogger:
 
     def log(self, message: str, severity: str, **kwargs):
         """Log a message with severity and details"""
+        self._write_records([(message, severity, kwargs)])
+
+    def log_batch(self, message, severity: str, lines, values=None, record_details=None, **kwargs):
+        """
+        Registra en una sola llamada un lote de eventos con la misma severidad
+
+        Equivale a llamar a log() una vez por elemento de `lines`, pero abre
+        cada archivo de salida una sola vez para todo el lote.
+
+        Args:
+            message: Mensaje común o secuencia con un mensaje por evento
+            severity: Severidad de los eventos
+            lines: Números de línea de cada evento
+            values: Valores asociados a cada evento (opcional)
+            record_details: Detalles adicionales por evento, {clave: lista de valores} (opcional)
+            **kwargs: Detalles comunes a todos los eventos (file, rule, field...)
+
+        Returns:
+            int: Número de eventos registrados
+        """
+        lines = list(lines)
+        if not lines:
+            return 0
+        values = list(values) if values is not None else None
+        messages = [message] * len(lines) if isinstance(message, str) else list(message)
+        file_value = kwargs.pop('file', None)
+        field_value = kwargs.pop('field', None)
+
+        records = []
+        for i, line in enumerate(lines):
+            # Mismo orden que las llamadas fila a fila: file, line, field, value, ...
+            details = {'file': file_value} if file_value is not None else {}
+            details['line'] = line
+            if field_value is not None:
+                details['field'] = field_value
+            if values is not None:
+                details['value'] = values[i]
+            if record_details:
+                for key, items in record_details.items():
+                    details[key] = items[i]
+            details.update(kwargs)
+            records.append((messages[i], severity, details))
+
+        self._write_records(records)
+        return len(records)
+
+    def replay(self, records):
+        """Escribe eventos (message, severity, kwargs) registrados por otro logger, p. ej. en un proceso hijo"""
+        if records:
+            self._write_records(records)
+
+    @timed_stage('logging')
+    def _write_records(self, records):
+        """Escribe una lista de eventos (message, severity, kwargs) en todas las salidas, o la encola en modo asíncrono"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         timestamp_iso = datetime.now().isoformat()
+        if self._background is not None:
+            self._background.put((records, timestamp, timestamp_iso), len(records))
+        else:
+            self._emit_records((records, timestamp, timestamp_iso))
+
+    def _emit_records(self, item):
+        """Formatea los eventos de un lote y los escribe en report.html, output.log, la consola y el reporte JSON"""
+        records, timestamp, timestamp_iso = item
+        html_blocks = []
+        text_blocks = []
+        for message, severity, kwargs in records:
+            # Format message and any file paths in kwargs
+            formatted_message = self._format_message(message)
+            if 'file' in kwargs:
+                kwargs['file'] = self._format_file_path(kwargs['file'])
+
+            html_blocks.append(self._format_message_block(formatted_message, severity, timestamp, **kwargs))
+
+            text = f"{timestamp} [{severity.upper()}] {message}\n"
+            if kwargs:
+                for key, value in kwargs.items():
+                    if value is not None:
+                        text += f"  {key}: {value}\n"
+                text += "\n"
+            text_blocks.append(text)
 
-        # Format message and any file paths in kwargs
-        formatted_message = self._format_message(message)
-        if 'file' in kwargs:
-            kwargs['file'] = self._format_file_path(kwargs['file'])
+            # Print to console with rich formatting (según el nivel de consola)
+            if self._prints_event(severity):
+                icon = self.ICONS.get(severity, "")
+                self.console.print(f"\n{timestamp} {icon} {severity.upper()}")
+                self.console.print(formatted_message)
+
+                if kwargs:
+                    for key, value in kwargs.items():
+                        if value is not None:
+                            self.console.print(f"  {key}: {value}")
+
+            self._capture_event(message, severity, timestamp_iso, kwargs)
 
         # Write to report HTML
-        with open(self.report_html, "a", encoding="utf-8") as f:
-            message_block = self._format_message_block(formatted_message, severity, timestamp, **kwargs)
-            f.write(message_block)
+        self._html_out.write("".join(html_blocks))
 
         # También escribir al log de texto plano
-        with open(self.output_log, "a", encoding="utf-8") as f:
-            f.write(f"{timestamp} [{severity.upper()}] {message}\n")
-            if kwargs:
-                for key, value in kwargs.items():
-                    if value is not None:
-                        f.write(f"  {key}: {value}\n")
-                f.write("\n")
+        self._text_out.write("".join(text_blocks))
 
-        # Print to console with rich formatting
-        icon = self.ICONS.get(severity, "")
-        self.console.print(f"\n{timestamp} {icon} {severity.upper()}")
-        self.console.print(formatted_message)
+    def _flush_outputs(self) -> None:
+        """Escribe a disco lo acumulado en los búferes de report.html y output.log"""
+        self._html_out.flush()
+        self._text_out.flush()
 
-        if kwargs:
-            for key, value in kwargs.items():
-                if value is not None:
-                    self.console.print(f"  {key}: {value}")
+    def drain(self) -> None:
+        """En modo asíncrono, espera a que el hilo de fondo procese los eventos encolados"""
+        if getattr(self, '_background', None) is not None:
+            self._background.drain()
 
-        # Capturar el evento para el reporte JSON
+    def _stop_background(self) -> None:
+        """
+        Procesa los eventos encolados y detiene el hilo de fondo; los eventos
+        posteriores (p. ej. los de materializaciones) se escriben directamente.
+        El tiempo de trabajo del hilo se reporta en la etapa logging_background.
+        """
+        background = getattr(self, '_background', None)
+        if background is None:
+            return
+        self._background = None
+        try:
+            background.stop()
+        finally:
+            self.stage_timings.add('logging_background', background.seconds)
+            if background.waits:
+                self._emit_records(([(f"La cola de eventos se llenó {background.waits} veces: la validación "
+                                      f"esperó al hilo de registro", "message", {})],
+                                    datetime.now().strftime("%Y-%m-%d %H:%M:%S"), datetime.now().isoformat()))
+
+    def _capture_event(self, message: str, severity: str, timestamp_iso: str, kwargs: Dict[str, Any]) -> None:
+        """Captura un evento para el reporte JSON"""
         event_data = {
             "timestamp": timestamp_iso,
             "severity": severity,
             "message": message,  # Guardamos el mensaje original sin formato
-            "details": {k: v for k, v in kwargs.items() if v is not None}
+            # Valores que se leen igual desde events.jsonl que desde memoria
+            "details": json_safe({k: v for k, v in kwargs.items() if v is not None})
         }
         self.events.append(event_data)
 
@@ -348,7 +524,7 @@ class SageLogger:
                 "severity": severity,
                 "message": message,
                 "type": "validation_error",
-                **{k: v for k, v in kwargs.items() if v is not None and k in ["file", "line", "column", "field", "rule", "value", "expected", "found", "row"]}
+                **json_safe({k: v for k, v in kwargs.items() if v is not None and k in ["file", "line", "column", "field", "rule", "value", "expected", "found", "row"]})
             }
             self.validation_failures.append(validation_data)
 
@@ -421,6 +597,7 @@ class SageLogger:
                              casilla_id, emisor_id, metodo_envio)
                         VALUES 
                             (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        RETURNING id
                         """,
                         (
                             os.path.basename(yaml_path),
@@ -433,6 +610,9 @@ class SageLogger:
                             validated_emisor_id,
                             self.metodo_envio
                         ))
+                    execution_id = cur.fetchone()[0]
+                    self._log_memory_to_db(cur, execution_id)
+                    self._log_cached_from_to_db(cur, execution_id)
 
                     conn.commit()
 
@@ -459,8 +639,65 @@ class SageLogger:
             except Exception as e:
                 self.warning(f"No se pudo registrar la ejecución: {str(e)}")
 
+    def _log_memory_to_db(self, cur, execution_id: int) -> None:
+        """
+        Guarda las métricas de memoria en las columnas de ejecuciones_yaml agregadas por
+        sql/migrations/add_memory_metrics_to_ejecuciones_yaml.sql. Si la migración no
+        se aplicó, la ejecución se registra igual, sin las métricas.
+        """
+        if not self.memory:
+            return
+        totals = self.memory.get('totals', {})
+        cur.execute("SAVEPOINT metricas_memoria")
+        try:
+            cur.execute("""
+                UPDATE ejecuciones_yaml
+                SET pico_memoria_mb = %s, memoria_lectura_mb = %s, memoria_conversion_mb = %s,
+                    memoria_validacion_mb = %s, tamano_archivo_bytes = %s
+                WHERE id = %s
+                """,
+                (
+                    self.memory.get('peak_rss_mb'),
+                    totals.get('after_read'),
+                    totals.get('after_conversion'),
+                    totals.get('after_validation'),
+                    self.memory.get('input_bytes'),
+                    execution_id
+                ))
+            cur.execute("RELEASE SAVEPOINT metricas_memoria")
+        except Exception as e:
+            cur.execute("ROLLBACK TO SAVEPOINT metricas_memoria")
+            self.message(f"No se guardaron las métricas de memoria (¿falta aplicar la migración "
+                         f"add_memory_metrics_to_ejecuciones_yaml.sql?): {str(e)}")
+
+    def _log_cached_from_to_db(self, cur, execution_id: int) -> None:
+        """
+        Enlaza la ejecución con la ejecución original cuyo resultado reutilizó, en la
+        columna agregada por sql/migrations/add_result_cache_to_ejecuciones_yaml.sql
+        """
+        if not self.cached_from:
+            return
+        cur.execute("SAVEPOINT ejecucion_origen")
+        try:
+            cur.execute("""
+                UPDATE ejecuciones_yaml
+                SET ejecucion_origen_id = (
+                    SELECT id FROM ejecuciones_yaml WHERE ruta_directorio = %s ORDER BY id DESC LIMIT 1
+                )
+                WHERE id = %s
+                """,
+                (self.cached_from['log_directory'], execution_id))
+            cur.execute("RELEASE SAVEPOINT ejecucion_origen")
+        except Exception as e:
+            cur.execute("ROLLBACK TO SAVEPOINT ejecucion_origen")
+            self.message(f"No se guardó la ejecución de origen (¿falta aplicar la migración "
+                         f"add_result_cache_to_ejecuciones_yaml.sql?): {str(e)}")
+
     def summary(self, total_records: int, errors: int, warnings: int):
         """Print a summary of the validation results, generate results.txt and log to database"""
+        # Todos los eventos encolados deben estar escritos antes del resumen y los reportes
+        self._stop_background()
+
         # Guardar los totales como atributos del logger para que estén disponibles para el reporte por email
         self.total_records = total_records
         self.total_errors = errors
@@ -513,17 +750,17 @@ class SageLogger:
         </div>
         """
 
-        with open(self.report_html, "a", encoding="utf-8") as f:
-            f.write(summary_html)
+        self._html_out.write(summary_html)
 
         # También escribir la información del resumen al log de texto
-        with open(self.output_log, "a", encoding="utf-8") as f:
-            f.write(f"\n=== RESUMEN FINAL ===\n")
-            f.write(f"Registros totales: {total_records}\n")
-            f.write(f"Errores: {errors}\n")
-            f.write(f"Advertencias: {warnings}\n")
-            f.write(f"Tasa de éxito: {success_rate:.1f}%\n")
-            f.write("=" * 30 + "\n")
+        self._text_out.write(
+            f"\n=== RESUMEN FINAL ===\n"
+            f"Registros totales: {total_records}\n"
+            f"Errores: {errors}\n"
+            f"Advertencias: {warnings}\n"
+            f"Tasa de éxito: {success_rate:.1f}%\n"
+            + "=" * 30 + "\n"
+        )
 
         # Log execution to database before closing HTML
         self._log_execution_to_db(total_records, errors, warnings)
@@ -534,12 +771,13 @@ class SageLogger:
         self._close_log_file()  # Close HTML structure after summary
 
         # Also print to console
-        self.console.print("\n🎯 Resumen Final")
-        self.console.print(f"  📝 Registros Totales: {total_records}")
-        self.console.print(f"  ❌ Errores: {errors}")
-        self.console.print(f"  ⚠️ Advertencias: {warnings}")
-        if total_records > 0:
-            self.console.print(f"  ✨ Tasa de Éxito: {success_rate:.1f}%")
+        if self.console is not None:
+            self.console.print("\n🎯 Resumen Final")
+            self.console.print(f"  📝 Registros Totales: {total_records}")
+            self.console.print(f"  ❌ Errores: {errors}")
+            self.console.print(f"  ⚠️ Advertencias: {warnings}")
+            if total_records > 0:
+                self.console.print(f"  ✨ Tasa de Éxito: {success_rate:.1f}%")
 
         # Generar el archivo results.txt y report.json
         self.generate_results_txt(total_records, errors, warnings)
@@ -660,14 +898,54 @@ class SageLogger:
 
         return " ".join(words)
 
-    def register_file_stats(self, filename: str, records: int, errors: int, warnings: int):
-        """Registra estadísticas de un archivo procesado"""
+    def register_file_stats(self, filename: str, records: int, errors: int, warnings: int, **extra):
+        """Registra estadísticas de un archivo procesado (extra: métricas adicionales, p. ej. peak_rss_mb)"""
         self.file_stats[filename] = {
             'records': records,
             'errors': errors,
-            'warnings': warnings
+            'warnings': warnings,
+            **extra
         }
 
+    def register_rule_timings(self, timings: List[Dict[str, Any]]):
+        """Registra los tiempos de evaluación por regla (ver evaluation.RuleTimings.as_list)"""
+        self.rule_timings = timings
+
+    def register_memory(self, memory: Dict[str, Any]):
+        """Registra el pico de RSS y la huella de los DataFrames por archivo y momento (ver main.memory_report)"""
+        self.memory = memory
+
+    def register_error_groups(self, groups: List[Dict[str, Any]]):
+        """Registra los grupos de errores de la validación (ver ErrorGroups.as_list)"""
+        self.error_groups = groups
+
+    RESULT_ATTRIBUTES = ('file_stats', 'missing_files', 'format_errors', 'validation_failures',
+                         'field_rules_skipped', 'row_rules_skipped', 'catalog_rules_skipped', 'events',
+                         'error_groups')
+
+    def result_snapshot(self) -> Dict[str, Any]:
+        """
+        Resultados de la validación que guarda la caché de resultados (ver result_cache);
+        events y validation_failures son los EventStore, que la caché copia evento a evento
+        """
+        self.drain()
+        return {name: getattr(self, name) for name in self.RESULT_ATTRIBUTES}
+
+    def reuse_result(self, result: Dict[str, Any], cached_from: Dict[str, Any]):
+        """
+        Toma los resultados de una ejecución anterior con el mismo archivo y YAML
+        (ver result_snapshot), para que los reportes de esta ejecución los repitan
+        y la enlacen con la original
+        """
+        self.drain()
+        for name in self.RESULT_ATTRIBUTES:
+            if name not in ('events', 'validation_failures'):
+                setattr(self, name, result.get(name, getattr(self, name)))
+        if result.get('validation_failures') is not None:
+            self.validation_failures.rebuild(result['validation_failures'])
+        self.events.rebuild(result.get('events', []), self.events)
+        self.cached_from = cached_from
+
     def register_format_error(self, message: str, file: str = None, expected: str = None, found: str = None):
         """Registra un error de formato específico (como discrepancia de columnas)"""
         error_info = {
@@ -688,6 +966,7 @@ class SageLogger:
             'package': package
         })
 
+    @timed_stage('report')
     def generate_email_html(self):
         """
         Genera un HTML simplificado y compatible con lectores de correo electrónico.
@@ -741,8 +1020,38 @@ class SageLogger:
             </div>
         """
 
+        # Grupos de errores por archivo, campo y regla: la vista principal, con filas de ejemplo
+        if self.error_groups:
+            html += f"""
+                <div style="margin-bottom: 20px;">
+                    <h3 style="color: #cc0000; border-bottom: 1px solid #ffcccc; padding-bottom: 5px;">Errores y Advertencias por Regla ({len(self.error_groups)} grupos)</h3>
+                    <table style="width: 100%; border-collapse: collapse;">
+                        <tr style="background-color: #f8f8f8;">
+                            <th style="padding: 8px; text-align: left; border-bottom: 1px solid #ddd;">Archivo / Campo</th>
+                            <th style="padding: 8px; text-align: left; border-bottom: 1px solid #ddd;">Descripción</th>
+                            <th style="padding: 8px; text-align: right; border-bottom: 1px solid #ddd;">Filas</th>
+                            <th style="padding: 8px; text-align: left; border-bottom: 1px solid #ddd;">Ejemplos (línea: valor)</th>
+                        </tr>
+            """
+            for idx, group in enumerate(self.error_groups[:self.EMAIL_GROUPS_SHOWN]):
+                bg_color = "#ffffff" if idx % 2 == 0 else "#f8f8f8"
+                color = '#cc0000' if group['severity'] == 'error' else '#ff9900'
+                location = group['file'] + (f" / {group['field']}" if group['field'] else "")
+                html += f"""
+                        <tr style="background-color: {bg_color};">
+                            <td style="padding: 8px; border-bottom: 1px solid #ddd;">{location}</td>
+                            <td style="padding: 8px; border-bottom: 1px solid #ddd; color: {color};">{group['message']}</td>
+                            <td style="padding: 8px; border-bottom: 1px solid #ddd; text-align: right;">{self._group_counts(group)}</td>
+                            <td style="padding: 8px; border-bottom: 1px solid #ddd;">{escape(self._group_examples(group))}</td>
+                        </tr>
+                """
+            html += """
+                    </table>
+                </div>
+            """
+
         # Añadir errores detectados (limitados a 20 para no sobrecargar el correo)
-        errors_list = [e for e in self.events if e.get('severity') == 'error'][:20]
+        errors_list = list(islice((e for e in self.events if e.get('severity') == 'error'), 20))
         if errors_list:
             html += f"""
                 <div style="margin-bottom: 20px;">
@@ -792,6 +1101,23 @@ class SageLogger:
 
         return email_html_path
 
+    EMAIL_GROUPS_SHOWN = 20  # Grupos de errores en el HTML para correo
+
+    @staticmethod
+    def _group_counts(group: Dict[str, Any]) -> str:
+        """Filas de un grupo de errores y, si tiene valores, cuántos distintos"""
+        text = f"{group['count']:,}" if group.get('count_exact', True) else f"al menos {group['count']:,}"
+        if group['distinct_values'] is not None:
+            approx = '' if group['distinct_exact'] else '~'
+            text += f" ({approx}{group['distinct_values']:,} valores distintos)"
+        return text
+
+    @staticmethod
+    def _group_examples(group: Dict[str, Any]) -> str:
+        """Filas de ejemplo de un grupo de errores, como 'línea: valor'"""
+        return ", ".join(f"{example['line']}: {example['value']}" if 'value' in example else str(example['line'])
+                         for example in group['examples'])
+
     def generate_report_json(self, total_records: int, errors: int, warnings: int):
         """
         Genera un archivo report.json con información detallada de la ejecución
@@ -844,40 +1170,62 @@ class SageLogger:
                 "format_errors": self.format_errors
             },
             "validation": {
-                "failures": self.validation_failures,
+                "groups": self.error_groups,
+                "failures": self.FAILURES_MARKER,
                 "skipped_rules": {
                     "field_rules": self.field_rules_skipped,
                     "row_rules": self.row_rules_skipped,
                     "catalog_rules": self.catalog_rules_skipped
                 }
             },
-            "events": self.events
+            "performance": {
+                "total_seconds": round(duration.total_seconds(), 3),
+                "stages": self.stage_timings.as_dict(),
+                "rules": self.rule_timings,
+                "memory": self.memory
+            },
+            "events": self.EVENTS_MARKER
         }
+        if self.cached_from:
+            # Resultado reutilizado de una ejecución anterior con el mismo archivo y YAML
+            report["execution_info"]["cached_from"] = self.cached_from
+        arrays = ((self.FAILURES_MARKER, self.validation_failures, 2), (self.EVENTS_MARKER, None, 1))
+        if not self.inline_row_detail:
+            # El detalle fila a fila queda completo en los archivos JSONL del directorio
+            self.validation_failures.persist()
+            self.events.persist()
+            del report["validation"]["failures"], report["events"]
+            report["validation"]["failures_file"] = os.path.basename(self.validation_failures.path)
+            report["events_file"] = os.path.basename(self.events.path)
+            arrays = ()
+
+        def processed_events():
+            """Procesamos eventos para garantizar serialización"""
+            for event in self.events:
+                # Crear una copia del evento para no modificar el original
+                processed_event = {}
+                for key, value in event.items():
+                    if key == 'exception' and hasattr(value, 'to_dict'):
+                        # Si es una excepción con método to_dict, usarlo
+                        processed_event[key] = value.to_dict()
+                    elif isinstance(value, (str, int, float, bool)) or value is None:
+                        # Tipos básicos van directamente
+                        processed_event[key] = value
+                    else:
+                        # Cualquier otro objeto, convertir a string
+                        processed_event[key] = str(value)
+                yield processed_event
 
-        # Procesamos eventos para garantizar serialización
-        processed_events = []
-        for event in self.events:
-            # Crear una copia del evento para no modificar el original
-            processed_event = {}
-            for key, value in event.items():
-                if key == 'exception' and hasattr(value, 'to_dict'):
-                    # Si es una excepción con método to_dict, usarlo
-                    processed_event[key] = value.to_dict()
-                elif isinstance(value, (str, int, float, bool)) or value is None:
-                    # Tipos básicos van directamente
-                    processed_event[key] = value
-                else:
-                    # Cualquier otro objeto, convertir a string
-                    processed_event[key] = str(value)
-            processed_events.append(processed_event)
-
-        # Reemplazar eventos originales con versión procesada
-        report["events"] = processed_events
-
-        # Escribimos el informe en formato JSON
+        # Escribimos el informe en formato JSON; fallos y eventos se escriben uno a la
+        # vez en el lugar de sus marcadores, leyéndolos del almacén de eventos
         try:
+            text = json.dumps(report, ensure_ascii=False, indent=2)
             with open(self.report_json, "w", encoding="utf-8") as f:
-                json.dump(report, f, ensure_ascii=False, indent=2)
+                for marker, items, depth in arrays:
+                    before, text = text.split(json.dumps(marker), 1)
+                    f.write(before)
+                    self._write_json_array(f, processed_events() if items is None else items, depth)
+                f.write(text)
         except TypeError as e:
             # Si hay error de serialización, crear un informe mínimo
             self.error(f"Error al serializar el reporte JSON: {str(e)}")
@@ -892,6 +1240,17 @@ class SageLogger:
             with open(self.report_json, "w", encoding="utf-8") as f:
                 json.dump(simplified_report, f, ensure_ascii=False, indent=2)
 
+    @staticmethod
+    def _write_json_array(f, items, depth: int) -> None:
+        """Escribe una lista como lo haría json.dump(indent=2) a la profundidad `depth`"""
+        pad = '\n' + '  ' * (depth + 1)
+        first = True
+        for item in items:
+            f.write(('[' if first else ',') + pad + json.dumps(item, ensure_ascii=False, indent=2).replace('\n', pad))
+            first = False
+        f.write('[]' if first else '\n' + '  ' * depth + ']')
+
+    @timed_stage('report')
     def generate_results_txt(self, total_records: int, errors: int, warnings: int):
         """Genera un archivo results.txt con un resumen estructurado de la ejecución"""
         end_time = datetime.now()
@@ -915,7 +1274,11 @@ class SageLogger:
             f.write(f"Fecha y hora de inicio: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
             f.write(f"Fecha y hora de fin: {end_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
             f.write(f"Duración: {duration_str}\n")
-            f.write(f"Directorio de logs: {self.log_dir}\n\n")
+            f.write(f"Directorio de logs: {self.log_dir}\n")
+            if self.cached_from:
+                f.write(f"Resultado reutilizado de la ejecución: {self.cached_from['execution_uuid']} "
+                        f"({self.cached_from['log_directory']})\n")
+            f.write("\n")
 
             # Resumen global
             f.write("RESUMEN GLOBAL\n")
@@ -961,6 +1324,18 @@ class SageLogger:
                         f.write(f"   Paquete: {missing['package']}\n")
                     f.write("\n")
 
+            # Grupos de errores por archivo, campo y regla
+            if self.error_groups:
+                f.write("ERRORES POR REGLA\n")
+                f.write("-----------------\n")
+                for i, group in enumerate(self.error_groups, 1):
+                    f.write(f"{i}. [{group['severity'].upper()}] {group['message']}\n")
+                    f.write(f"   Archivo: {group['file']}\n")
+                    if group['field']:
+                        f.write(f"   Campo: {group['field']}\n")
+                    f.write(f"   Filas: {self._group_counts(group)}, líneas {group['first_line']} a {group['last_line']}\n")
+                    f.write(f"   Ejemplos (línea: valor): {self._group_examples(group)}\n\n")
+
             # Optimización de rendimiento
             if hasattr(self, 'field_rules_skipped') or hasattr(self, 'row_rules_skipped') or hasattr(self, 'catalog_rules_skipped'):
                 f.write("OPTIMIZACIÓN DE RENDIMIENTO\n")
@@ -991,8 +1366,41 @@ class SageLogger:
                 f.write("NOTA: El conteo total de errores es preciso, pero no todos fueron detallados en el log.\n")
                 f.write("Para ver todos los errores, ejecute la validación con archivos más pequeños.\n\n")
 
+            self._write_performance(f)
+
             f.write("======================================================================\n")
 
+    SLOWEST_RULES_SHOWN = 10  # Reglas en la tabla de reglas más lentas de results.txt
+
+    def _write_performance(self, f) -> None:
+        """Escribe en results.txt los tiempos por etapa y la tabla de reglas más lentas"""
+        stages = self.stage_timings.as_dict()
+        if not stages and not self.rule_timings and not self.memory:
+            return
+        f.write("RENDIMIENTO\n")
+        f.write("-----------\n")
+        for stage, timing in stages.items():
+            f.write(f"  {STAGES.get(stage, stage):<26}{timing['seconds']:>10.3f} s\n")
+        f.write("\n")
+
+        if self.memory:
+            f.write("Memoria:\n")
+            if self.memory.get('peak_rss_mb') is not None:
+                f.write(f"  {'Pico de memoria (RSS)':<26}{self.memory['peak_rss_mb']:>10.2f} MB\n")
+            for stage, megabytes in self.memory.get('totals', {}).items():
+                f.write(f"  {MEMORY_STAGES[stage]:<26}{megabytes:>10.2f} MB\n")
+            f.write("\n")
+
+        if self.rule_timings:
+            f.write("Reglas más lentas:\n")
+            f.write(f"  {'Regla':<30} {'Ámbito':<30} {'Motor':<6} {'Filas':>10} {'Fallas':>8} {'Tiempo (s)':>11}\n")
+            for timing in self.rule_timings[:self.SLOWEST_RULES_SHOWN]:
+                f.write(
+                    f"  {timing['rule'][:30]:<30} {timing['scope'][:30]:<30} {timing['engine']:<6} "
+                    f"{timing['rows']:>10} {timing['failures']:>8} {timing['seconds']:>11.4f}\n"
+                )
+            f.write("\n")
+
     def _prepare_json_serializable(self, obj):
         """
         Recursivamente prepara un objeto para serialización JSON, manejando tipos de excepción personalizados.
@@ -1,15 +1,85 @@
 """Main entry point for SAGE"""
 import os
 import sys
+import time
 import argparse
-from typing import Tuple, Optional
+import tracemalloc
+from typing import Any, Dict, Tuple, Optional
 from .yaml_validator import YAMLValidator
 from .file_processor import FileProcessor
-from .logger import SageLogger
-from .utils import create_execution_directory, copy_input_files
+from .logger import CONSOLE_LEVELS, SageLogger
+from .utils import create_execution_directory, copy_input_files, env_flag, env_int, get_peak_rss_mb
 from .exceptions import SAGEError
+from .rule_compiler import RULE_CACHE
+from .profiling import top_allocations
+from .result_cache import ResultCache
 
-def process_files(yaml_path: str, data_path: str, casilla_id: Optional[int] = None, emisor_id: Optional[int] = None, metodo_envio: Optional[str] = "direct_upload") -> Tuple[str, int, int]:
+TRACEMALLOC_TOP = 10  # Líneas con más memoria asignada que se reportan con SAGE_TRACEMALLOC=1
+
+def memory_report(processor: FileProcessor, data_path: str) -> Dict[str, Any]:
+    """
+    Pico de RSS de la ejecución y huella de los DataFrames por archivo y momento.
+
+    Con SAGE_TRACEMALLOC=1 incluye además las líneas de código con más memoria
+    asignada según tracemalloc (SAGE_TRACEMALLOC_TOP, por defecto 10).
+    """
+    memory = {
+        'peak_rss_mb': get_peak_rss_mb(),
+        # Procesos de la validación en paralelo (catálogos o rangos de bytes), si los hubo
+        'peak_rss_children_mb': get_peak_rss_mb(children=True),
+        'input_bytes': os.path.getsize(data_path),
+        'totals': processor.memory.totals(),
+        'files': processor.memory.as_dict()
+    }
+    if tracemalloc.is_tracing():
+        memory['tracemalloc'] = top_allocations(env_int('SAGE_TRACEMALLOC_TOP', TRACEMALLOC_TOP))
+    return memory
+
+
+def lookup_cached_result(result_cache: ResultCache, logger: SageLogger, yaml_path: str, data_path: str,
+                         casilla_id: Optional[int] = None, emisor_id: Optional[int] = None
+                         ) -> Tuple[Optional[str], Optional[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+    """
+    Calcula la clave del archivo, el YAML, la casilla y el emisor y busca una ejecución anterior idéntica
+
+    Una entrada sin las materializaciones hechas no sirve a una ejecución con casilla
+    que debe materializar (sin errores): se valida de nuevo para poder materializar.
+
+    Returns:
+        Tuple: (clave o None si no se pudo calcular, (entrada, resultados) o None si no hay acierto)
+    """
+    try:
+        with logger.stage_timings.measure('cache'):
+            cache_key = result_cache.key(data_path, yaml_path, casilla_id, emisor_id)
+            cached = result_cache.lookup(cache_key)
+        if cached is not None and casilla_id and cached[0]['errors'] == 0 and not cached[0].get('materialized'):
+            logger.message("La ejecución anterior con el mismo archivo no completó sus materializaciones: "
+                           "se valida de nuevo")
+            cached = None
+        return cache_key, cached
+    except (OSError, ValueError) as e:
+        logger.warning(f"No se pudo consultar la caché de resultados: {str(e)}")
+        return None, None
+
+
+def reuse_cached_result(logger: SageLogger, entry: Dict[str, Any], result: Dict[str, Any],
+                        casilla_id: Optional[int]) -> Tuple[int, int]:
+    """Registra en esta ejecución los conteos y los resultados de la ejecución anterior"""
+    logger.reuse_result(result, {'execution_uuid': entry['execution_uuid'], 'log_directory': entry['log_directory']})
+    logger.message(
+        f"El archivo y el YAML son idénticos a los de la ejecución {entry['execution_uuid']}: "
+        f"se reutiliza su resultado sin leer ni validar el archivo"
+    )
+    if casilla_id and entry['errors'] == 0:
+        logger.message("Las materializaciones ya se procesaron en la ejecución original")
+    elif casilla_id:
+        logger.message("No se procesarán materializaciones debido a errores en el procesamiento YAML")
+    logger.summary(total_records=entry['total_records'], errors=entry['errors'], warnings=entry['warnings'])
+    return entry['errors'], entry['warnings']
+
+
+def process_files(yaml_path: str, data_path: str, casilla_id: Optional[int] = None, emisor_id: Optional[int] = None, metodo_envio: Optional[str] = "direct_upload", use_cache: bool = True,
+                  console: Optional[str] = None, headless: Optional[bool] = None) -> Tuple[str, int, int]:
     """
     Process files according to YAML configuration
     
@@ -19,14 +89,21 @@ def process_files(yaml_path: str, data_path: str, casilla_id: Optional[int] = No
         casilla_id: Optional ID of the mailbox (casilla)
         emisor_id: Optional ID of the sender (emisor)
         metodo_envio: Method used to send the file ('sftp', 'email', 'direct_upload', 'portal_upload', 'api')
+        use_cache: Si es False, valida aunque haya un resultado anterior para el mismo archivo y YAML
+        console: Qué se imprime en consola: off, summary, warnings o all (ver SageLogger)
+        headless: Sin terminal (daemons): sin rich y, salvo que se indique console, sin salida por consola
         
     Returns: 
         Tuple containing (execution_uuid, error_count, warning_count)
     """
     # Initialize logger outside try block
     execution_dir, execution_uuid = create_execution_directory()
-    logger = SageLogger(execution_dir, casilla_id, emisor_id, metodo_envio)
+    logger = SageLogger(execution_dir, casilla_id, emisor_id, metodo_envio, console=console, headless=headless)
     logger.message(f"Starting SAGE execution {execution_uuid}")
+    # tracemalloc vuelve varias veces más lenta la ejecución: solo para diagnosticar
+    trace_allocations = env_flag('SAGE_TRACEMALLOC') and not tracemalloc.is_tracing()
+    if trace_allocations:
+        tracemalloc.start()
 
     try:
         # Copy input files
@@ -37,8 +114,26 @@ def process_files(yaml_path: str, data_path: str, casilla_id: Optional[int] = No
         config = yaml_validator.load_and_validate(yaml_dest)
         logger.success("YAML validation successful")
 
+        # Un reenvío del mismo archivo con el mismo YAML reutiliza el resultado anterior
+        result_cache = ResultCache.from_env() if use_cache else None
+        cache_key = None
+        if result_cache is not None:
+            cache_key, cached = lookup_cached_result(result_cache, logger, yaml_dest, data_dest, casilla_id, emisor_id)
+            if cached is not None:
+                error_count, warning_count = reuse_cached_result(logger, *cached, casilla_id)
+                return execution_uuid, error_count, warning_count
+
+        # Contadores de la caché de reglas compiladas (acumulados en el proceso, útil en el daemon)
+        rule_cache_stats = RULE_CACHE.stats()
+        logger.message(
+            f"Caché de reglas compiladas: {rule_cache_stats['hits']} aciertos, "
+            f"{rule_cache_stats['misses']} fallos, {rule_cache_stats['size']} reglas en memoria"
+        )
+
         # Process file
         processor = FileProcessor(config, logger)
+        # Sin casilla no hay materializaciones: en modo streaming no hace falta conservar los DataFrames
+        processor.retain_dataframes = bool(casilla_id)
 
         # Determine which package or catalog to use based on file type and YAML configuration
         file_extension = os.path.splitext(data_dest.lower())[1]
@@ -147,6 +242,31 @@ def process_files(yaml_path: str, data_path: str, casilla_id: Optional[int] = No
 
         error_count, warning_count = processor.process_file(data_dest, package_name)
 
+        # Contadores de asignaciones al evaluar reglas de campo (ver EvaluationContext)
+        allocation_stats = processor.allocation_stats
+        logger.message(
+            f"Evaluación de reglas de campo: {allocation_stats.rule_evaluations} evaluaciones, "
+            f"{allocation_stats.views_copied} vistas copiadas "
+            f"({allocation_stats.bytes_copied / (1024 * 1024):.2f} MB), "
+            f"{allocation_stats.views_shared} vistas sin copia, "
+            f"{allocation_stats.masks_reused} máscaras reutilizadas"
+        )
+
+        # Tiempos por regla: muestran qué reglas se evaluaron con kernels y cuáles con eval
+        rule_timings = processor.rule_timings.as_list()
+        logger.register_rule_timings(rule_timings)
+        # Filas que fallaron por archivo, campo y regla, con ejemplos de todo el archivo
+        logger.register_error_groups(processor.error_groups.as_list())
+        if rule_timings:
+            slowest = ", ".join(f"{t['rule']} [{t['scope']}] ({t['engine']}): {t['seconds']:.3f}s"
+                                for t in rule_timings[:3])
+            logger.message(f"Reglas más lentas: {slowest}")
+
+        memory = memory_report(processor, data_dest)
+        logger.register_memory(memory)
+        dataframes = ", ".join(f"{stage} {megabytes:.2f} MB" for stage, megabytes in memory['totals'].items())
+        logger.message(f"Memoria: pico de RSS {memory['peak_rss_mb']} MB" + (f", DataFrames {dataframes}" if dataframes else ""))
+
         # Log summary
         # Para archivos ZIP, no podemos contar líneas directamente - usamos el contador de registros del procesador
         if is_zip:
@@ -183,12 +303,14 @@ def process_files(yaml_path: str, data_path: str, casilla_id: Optional[int] = No
             errors=error_count,
             warnings=warning_count
         )
-        
+
+        materialized = False
         # Procesar materializaciones si hay un dataframe válido, un ID de casilla y no hay errores en el procesamiento YAML
         if casilla_id and hasattr(processor, 'last_processed_df') and processor.last_processed_df is not None and error_count == 0:
             try:
                 from .process_materializations import process_materializations
                 logger.message("Iniciando procesamiento de materializaciones...")
+                materialization_start = time.perf_counter()
                 
                 # Si tenemos un dataframe de resumen y hay múltiples dataframes específicos por catálogo,
                 # pasar ambos a process_materializations
@@ -210,6 +332,9 @@ def process_files(yaml_path: str, data_path: str, casilla_id: Optional[int] = No
                         dataframe=processor.last_processed_df,
                         logger=logger
                     )
+                # Se ejecutan después de escribir report.json: su tiempo solo queda en el log
+                logger.message(f"Materializaciones: {time.perf_counter() - materialization_start:.2f}s")
+                materialized = True
             except Exception as e:
                 # No interrumpir el flujo principal si falla la materialización
                 logger.warning(f"Error al procesar materializaciones: {str(e)}")
@@ -217,6 +342,15 @@ def process_files(yaml_path: str, data_path: str, casilla_id: Optional[int] = No
         elif error_count > 0:
             logger.message("No se procesarán materializaciones debido a errores en el procesamiento YAML")
 
+        # Se guarda después de materializar: la entrada registra si las materializaciones se completaron
+        if cache_key is not None:
+            try:
+                with logger.stage_timings.measure('cache'):
+                    result_cache.store(cache_key, logger.result_snapshot(), execution_uuid, logger.log_dir,
+                                       total_records, error_count, warning_count, materialized)
+            except OSError as e:
+                logger.warning(f"No se pudo guardar el resultado en la caché: {str(e)}")
+
         return execution_uuid, error_count, warning_count
 
     except (SAGEError, Exception) as e:
@@ -244,6 +378,10 @@ def process_files(yaml_path: str, data_path: str, casilla_id: Optional[int] = No
             
         return execution_uuid, 1, 0
 
+    finally:
+        if trace_allocations:
+            tracemalloc.stop()
+
 def main():
     parser = argparse.ArgumentParser(description="SAGE - Sistema de Análisis y Gestión de Errores")
     parser.add_argument("yaml_path", help="Path to YAML configuration file")
@@ -252,6 +390,10 @@ def main():
     parser.add_argument("--emisor-id", type=int, help="ID del emisor asociado con esta ejecución")
     parser.add_argument("--metodo-envio", choices=["email", "sftp", "direct_upload", "portal_upload", "api"], 
                        help="Método de envío utilizado (email, sftp, direct_upload, portal_upload, api)")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Validar aunque haya un resultado anterior para el mismo archivo y YAML")
+    parser.add_argument("--console", choices=CONSOLE_LEVELS,
+                       help="Qué imprimir en consola: nada, solo el resumen, errores y advertencias, o todo (por defecto)")
 
     args = parser.parse_args()
 
@@ -261,7 +403,9 @@ def main():
             args.data_path,
             casilla_id=args.casilla_id,
             emisor_id=args.emisor_id,
-            metodo_envio=args.metodo_envio
+            metodo_envio=args.metodo_envio,
+            use_cache=not args.no_cache,
+            console=args.console
         )
         print(f"\nExecution completed!")
         print(f"Execution UUID: {execution_uuid}")
@@ -1,5 +1,5 @@
 """Data models for SAGE"""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 from enum import Enum
 
@@ -43,11 +43,26 @@ class ValidationRule:
     description: str
     rule: str
     severity: Severity
+    code: Optional[Any] = field(default=None, repr=False, compare=False)  # Expresión compilada (ver rule_compiler)
+    # Columnas que lee la expresión (ver rule_analysis); None si no se pudieron determinar
+    columns: Optional[List[str]] = field(default=None, repr=False, compare=False)
+    # Reglas de paquete: {catálogo: columnas o None}; None si no se pudo analizar
+    catalog_columns: Optional[Dict[str, Optional[List[str]]]] = field(default=None, repr=False, compare=False)
+    # Kernel vectorizado (ver rule_kernels): reglas declarativas o expresiones reescritas
+    kernel: Optional[Any] = field(default=None, repr=False, compare=False)
+    # Reglas de paquete en SQL (ver package_sql): `rule` es la consulta, que devuelve las claves que no cumplen
+    sql: bool = False
     
     def __repr__(self) -> str:
         """Representación más limpia para logs"""
         return f"ValidationRule(name='{self.name}', severity={self.severity.name})"
 
+    def __getstate__(self):
+        """Los objetos de código no se pueden serializar (pickle); se recompilan al evaluar la regla"""
+        state = self.__dict__.copy()
+        state['code'] = None
+        return state
+
 @dataclass
 class Field:
     name: str
@@ -65,6 +80,10 @@ class FileFormat:
     type: str
     delimiter: Optional[str] = None
     header: bool = False
+    streaming: bool = False            # Validar el CSV por bloques con memoria acotada
+    chunk_size: Optional[int] = None   # Filas por bloque en modo streaming
+    engine: Optional[str] = None       # Motor de lectura del CSV ('pandas' o 'pyarrow'); None usa el global
+    incremental: bool = False          # Validar solo las filas agregadas desde el último envío del emisor
     
     def __repr__(self) -> str:
         """Representación más limpia para logs"""
@@ -82,6 +101,7 @@ class Catalog:
     fields: List[Field]
     row_validation: List[ValidationRule]
     catalog_validation: List[ValidationRule]
+    unique_keys: List[List[str]] = field(default_factory=list)  # Claves únicas compuestas por varios campos
     
     def __repr__(self) -> str:
         """Representación más limpia para logs"""
@@ -108,6 +128,7 @@ class SageConfig:
     comments: str
     catalogs: Dict[str, Catalog]
     packages: Dict[str, Package]
+    yaml_hash: str = ""  # Hash del contenido YAML, usado como clave de la caché de reglas
     
     def __repr__(self) -> str:
         """Representación más limpia para logs"""
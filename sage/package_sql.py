@@ -0,0 +1,73 @@
+"""
+Reglas de paquete en SQL evaluadas con DuckDB (package_validation con 'sql')
+
+Las reglas de paquete con expresión cruzan catálogos con merges o isin de
+pandas sobre los DataFrames completos, lo que duplica la memoria en los
+paquetes grandes. Una regla con 'sql' es una consulta que devuelve las claves
+que no cumplen (un anti-join, un agregado con HAVING, ...): los DataFrames
+validados se registran en una conexión DuckDB en memoria, que los lee
+directamente de sus arreglos (numpy o Arrow) sin copiarlos, y las claves
+devueltas se reportan igual que las de las reglas con expresión.
+"""
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from .utils import env_int
+
+try:
+    import duckdb
+except ImportError:  # pragma: no cover - duckdb es una dependencia declarada
+    duckdb = None
+
+
+def sql_available() -> bool:
+    """Indica si duckdb está instalado"""
+    return duckdb is not None
+
+
+def sql_tables(query: str) -> Set[str]:
+    """
+    Verifica que la consulta sea un único SELECT y devuelve las tablas que lee
+
+    Raises:
+        ValueError: Si la consulta no es válida o no es un único SELECT
+    """
+    try:
+        statements = duckdb.extract_statements(query)
+    except duckdb.Error as e:
+        raise ValueError(str(e).splitlines()[0])
+    if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+        raise ValueError("debe ser una única consulta SELECT")
+    return set(duckdb.get_table_names(query))
+
+
+class PackageSQL:
+    """Conexión DuckDB con los catálogos validados de un paquete registrados como tablas"""
+
+    def __init__(self, dataframes: Dict[str, pd.DataFrame]):
+        self.connection = duckdb.connect(':memory:')
+        # Límite de memoria de DuckDB (SAGE_PACKAGE_SQL_MEMORY_MB); al superarlo los joins
+        # y agregados se derraman a disco en lugar de crecer (0: el valor por defecto de DuckDB)
+        memory_mb = env_int('SAGE_PACKAGE_SQL_MEMORY_MB', 0)
+        if memory_mb > 0:
+            self.connection.execute(f"SET memory_limit = '{memory_mb}MB'")
+        for name, df in dataframes.items():
+            if df is not None:
+                self.connection.register(name, df)  # Vista sobre el DataFrame, sin copiarlo
+
+    def failing_keys(self, query: str) -> Tuple[int, List[Any]]:
+        """
+        Ejecuta la consulta de una regla
+
+        Returns:
+            Tuple[int, List]: (filas devueltas, claves que no cumplen: el valor de la
+            única columna, o una tupla por fila si la consulta devuelve varias)
+        """
+        rows = self.connection.execute(query).fetchall()
+        if rows and len(rows[0]) == 1:
+            return len(rows), [row[0] for row in rows]
+        return len(rows), rows
+
+    def close(self) -> None:
+        self.connection.close()
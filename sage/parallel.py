@@ -0,0 +1,179 @@
+"""Procesamiento en paralelo de los catálogos de un paquete ZIP y de los rangos de un CSV grande"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .arrow_engine import ENGINE_PANDAS
+from .byte_ranges import ByteRange
+from .coercion import DateFormatCache
+from .logger import SageLogger
+from .models import Catalog, SageConfig
+from .profiling import StageTimings
+
+
+def process_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Pool de procesos hijos iniciados con spawn: un fork copiaría el estado del
+    proceso principal, incluidos locks tomados por otros hilos (p. ej. la cola del
+    hilo de registro en segundo plano, SAGE_LOG_ASYNC)
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+class RecordingLogger(SageLogger):
+    """
+    Logger de los procesos hijos.
+
+    No escribe archivos ni imprime en consola: guarda los eventos para que el
+    proceso principal los reproduzca con SageLogger.replay en el orden de los
+    catálogos del paquete, sin importar qué proceso terminó primero.
+    """
+
+    def __init__(self):
+        self.records: List[Tuple[str, str, Dict[str, Any]]] = []
+        self.file_stats = {}
+        self.format_errors = []
+        self.missing_files = []
+        self.events = []
+        self.validation_failures = []
+        self.stage_timings = StageTimings()
+
+    def __del__(self):
+        pass
+
+    def _write_records(self, records):
+        self.records.extend(records)
+
+
+@dataclass
+class CatalogTask:
+    """Trabajo enviado a un proceso hijo: leer y validar un catálogo"""
+    config: SageConfig
+    catalog_name: str
+    file_path: Any            # Ruta del archivo o ZipMember (se reabre en el proceso hijo)
+    keep_dataframe: bool
+    streaming_enabled: bool = False
+    streaming_chunk_size: Optional[int] = None
+    engine: str = ENGINE_PANDAS
+    keep_columns: Optional[List[str]] = None  # Columnas del DataFrame devuelto (None: todas)
+
+
+@dataclass
+class WorkerOutput:
+    """Eventos, contadores y estadísticas de un proceso hijo, que el proceso principal incorpora"""
+    error_count: int = 0      # Totales del proceso hijo (incluyen errores de lectura)
+    warning_count: int = 0
+    records: List[Tuple[str, str, Dict[str, Any]]] = field(default_factory=list)
+    format_errors: List[Dict[str, Any]] = field(default_factory=list)
+    field_rules_skipped: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    row_rules_skipped: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    catalog_rules_skipped: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    allocation_stats: Dict[str, int] = field(default_factory=dict)
+    rule_timings: List[Dict[str, Any]] = field(default_factory=list)
+    error_groups: List[Dict[str, Any]] = field(default_factory=list)
+    stage_timings: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    memory: Dict[str, Dict[str, Dict[str, Any]]] = field(default_factory=dict)
+    error: Optional[str] = None  # Mensaje si la lectura o validación falló
+
+    def collect(self, processor, logger: RecordingLogger) -> None:
+        """Copia el estado del procesador y del logger del proceso hijo"""
+        self.error_count = processor.error_count
+        self.warning_count = processor.warning_count
+        self.records = logger.records
+        self.format_errors = logger.format_errors
+        self.field_rules_skipped = processor.field_rules_skipped
+        self.row_rules_skipped = processor.row_rules_skipped
+        self.catalog_rules_skipped = processor.catalog_rules_skipped
+        self.allocation_stats = processor.allocation_stats.as_dict()
+        self.rule_timings = processor.rule_timings.as_list()
+        self.error_groups = processor.error_groups.export()
+        self.stage_timings = processor.stage_timings.as_dict()
+        self.memory = processor.memory.as_dict()
+
+
+@dataclass
+class CatalogResult(WorkerOutput):
+    """Resultado de un catálogo validado en un proceso hijo"""
+    catalog_name: str = ''
+    df: Optional[pd.DataFrame] = None
+    file_records: int = 0
+    file_errors: int = 0
+    file_warnings: int = 0
+    extra_stats: Dict[str, Any] = field(default_factory=dict)
+
+
+def validate_catalog_task(task: CatalogTask) -> CatalogResult:
+    """Lee y valida un catálogo en un proceso hijo (punto de entrada del pool)"""
+    from .file_processor import FileProcessor
+
+    logger = RecordingLogger()
+    processor = FileProcessor(task.config, logger)
+    processor.streaming_enabled = task.streaming_enabled
+    processor.streaming_chunk_size = task.streaming_chunk_size
+    processor.engine = task.engine
+    processor.retain_dataframes = task.keep_dataframe
+
+    result = CatalogResult(catalog_name=task.catalog_name)
+    try:
+        df, result.file_records, result.file_errors, result.file_warnings, result.extra_stats = \
+            processor._validate_catalog_file(task.file_path, task.catalog_name,
+                                             task.config.catalogs[task.catalog_name], task.keep_dataframe,
+                                             task.keep_columns)
+        # Solo se devuelve el DataFrame (y sus columnas) que el proceso principal necesita
+        result.df = df
+    except Exception as e:
+        result.error = str(e)
+
+    result.collect(processor, logger)
+    return result
+
+
+@dataclass
+class RangeTask:
+    """Trabajo enviado a un proceso hijo: validar un rango de bytes de un CSV"""
+    config: SageConfig
+    catalog: Catalog
+    byte_range: ByteRange
+    chunk_size: int
+    materialize: bool                               # Devolver las filas del rango (reglas de catálogo)
+    materialize_columns: Optional[List[str]] = None  # Columnas que se devuelven (None: todas)
+    engine: str = ENGINE_PANDAS
+    date_formats: Dict[Any, Optional[str]] = field(default_factory=dict)  # Inferidos del inicio del archivo
+
+
+@dataclass
+class RangeResult(WorkerOutput):
+    """
+    Resultado de un rango validado en un proceso hijo.
+
+    Lo que depende de las filas de otros rangos (límites de errores mostrados,
+    duplicados) no se registra en el hijo: queda en `deferred` como llamadas
+    (método, argumentos) que el proceso principal repite en orden de archivo.
+    """
+    rows: int = 0
+    chunks: int = 0
+    df: Optional[pd.DataFrame] = None
+    deferred: List[Tuple[str, Dict[str, Any]]] = field(default_factory=list)
+
+
+def validate_range_task(task: RangeTask) -> RangeResult:
+    """Lee y valida un rango de un CSV en un proceso hijo (punto de entrada del pool)"""
+    from .file_processor import FileProcessor
+
+    logger = RecordingLogger()
+    processor = FileProcessor(task.config, logger)
+    processor.engine = task.engine
+    processor.date_formats = DateFormatCache(task.date_formats)
+
+    result = RangeResult()
+    try:
+        result.df, result.rows, result.chunks, result.deferred = processor._validate_byte_range(
+            task.byte_range, task.catalog, task.chunk_size, task.materialize, task.materialize_columns
+        )
+    except Exception as e:
+        result.error = str(e)
+    result.collect(processor, logger)
+    return result
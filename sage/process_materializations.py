@@ -26,6 +26,7 @@ import re
 from google.cloud.storage import Client as GCPStorageClient
 from google.oauth2 import service_account
 from .logger import SageLogger
+from .categorical import decode, is_categorical
 
 # Formatos de archivo soportados para la materialización
 SUPPORTED_FORMATS = {
@@ -427,18 +428,22 @@ class MaterializationProcessor:
                 
                 if col and op and val is not None and col in result_df.columns:
                     try:
+                        # Los campos texto compactados como categóricos no admiten <, >, <=, >=
+                        values = result_df[col]
+                        if op in ('gt', 'gte', 'lt', 'lte') and is_categorical(values):
+                            values = decode(values)
                         if op == 'eq':
                             result_df = result_df[result_df[col] == val]
                         elif op == 'neq':
                             result_df = result_df[result_df[col] != val]
                         elif op == 'gt':
-                            result_df = result_df[result_df[col] > val]
+                            result_df = result_df[values > val]
                         elif op == 'gte':
-                            result_df = result_df[result_df[col] >= val]
+                            result_df = result_df[values >= val]
                         elif op == 'lt':
-                            result_df = result_df[result_df[col] < val]
+                            result_df = result_df[values < val]
                         elif op == 'lte':
-                            result_df = result_df[result_df[col] <= val]
+                            result_df = result_df[values <= val]
                         elif op == 'in':
                             if isinstance(val, list):
                                 result_df = result_df[result_df[col].isin(val)]
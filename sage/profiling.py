@@ -0,0 +1,139 @@
+"""Tiempos por etapa y uso de memoria de una ejecución (lectura, conversión, reglas, registro, reportes)"""
+import functools
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from .utils import get_rss_mb
+
+# Etapas en el orden en que se reportan, con su nombre para results.txt
+STAGES = {
+    'read': 'Lectura',
+    'conversion': 'Conversión de tipos',
+    'field_rules': 'Reglas de campo',
+    'row_rules': 'Reglas de fila',
+    'catalog_rules': 'Reglas de catálogo',
+    'package_rules': 'Reglas de paquete',
+    'materialization': 'Materialización',
+    'logging': 'Registro de eventos',
+    'logging_background': 'Registro en segundo plano',
+    'report': 'Generación de reportes',
+    'memory': 'Medición de memoria',
+    'cache': 'Caché de resultados'
+}
+
+
+class StageTimings:
+    """
+    Tiempo exclusivo por etapa: si una etapa se mide dentro de otra (por ejemplo,
+    el registro de errores dentro de las reglas de campo), su tiempo se descuenta
+    de la etapa que la contiene, de modo que la suma no cuenta nada dos veces.
+
+    Solo se mide una vez por llamada (no por fila), para poder dejarlo siempre activo.
+    """
+
+    def __init__(self):
+        self._seconds: Dict[str, float] = {}
+        self._calls: Dict[str, int] = {}
+        self._nested: List[float] = []  # Tiempo de etapas anidadas, por nivel de anidamiento
+
+    @contextmanager
+    def measure(self, stage: str):
+        start = time.perf_counter()
+        self._nested.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.add(stage, elapsed - self._nested.pop())
+            if self._nested:
+                self._nested[-1] += elapsed
+
+    def add(self, stage: str, seconds: float, calls: int = 1) -> None:
+        self._seconds[stage] = self._seconds.get(stage, 0.0) + seconds
+        self._calls[stage] = self._calls.get(stage, 0) + calls
+
+    def merge(self, other: Dict[str, Dict[str, Any]]) -> None:
+        """Suma los tiempos de otro proceso (ver StageTimings.as_dict)"""
+        for stage, timing in other.items():
+            self.add(stage, timing['seconds'], timing['calls'])
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """{etapa: {'seconds', 'calls'}} en el orden de STAGES"""
+        order = list(STAGES) + sorted(set(self._seconds) - set(STAGES))
+        return {stage: {'seconds': round(self._seconds[stage], 6), 'calls': self._calls[stage]}
+                for stage in order if stage in self._seconds}
+
+
+def timed_stage(stage: str):
+    """Decorador de métodos: mide la llamada como `stage` en self.stage_timings"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.stage_timings.measure(stage):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Momentos en que se mide la huella de los DataFrames, con su nombre para results.txt
+MEMORY_STAGES = {
+    'after_read': 'DataFrames tras lectura',
+    'after_conversion': 'DataFrames tras conversión',
+    'after_validation': 'DataFrames tras validación'
+}
+
+
+class MemoryProfile:
+    """
+    Huella en memoria de los DataFrames por archivo y momento (después de leer,
+    de convertir tipos y de validar), junto con la RSS del proceso en ese momento.
+
+    En streaming y en la validación por rangos se guarda el mayor bloque, que es
+    lo que el archivo ocupa en memoria a la vez.
+    """
+
+    def __init__(self):
+        self.files: Dict[str, Dict[str, Dict[str, Optional[float]]]] = {}  # {archivo: {momento: medidas}}
+
+    def record(self, filename: str, stage: str, df: pd.DataFrame) -> None:
+        dataframe_mb = round(float(df.memory_usage(index=True, deep=True).sum()) / (1024 * 1024), 2)
+        self._keep_max(filename, stage, {'dataframe_mb': dataframe_mb, 'rss_mb': get_rss_mb()})
+
+    def _keep_max(self, filename: str, stage: str, measure: Dict[str, Optional[float]]) -> None:
+        current = self.files.setdefault(filename, {}).setdefault(stage, {})
+        for key, value in measure.items():
+            if value is not None and (current.get(key) is None or value > current[key]):
+                current[key] = value
+            else:
+                current.setdefault(key, value)
+
+    def merge(self, other: Dict[str, Dict[str, Dict[str, Optional[float]]]]) -> None:
+        """Incorpora las medidas de otro proceso (ver MemoryProfile.as_dict)"""
+        for filename, stages in other.items():
+            for stage, measure in stages.items():
+                self._keep_max(filename, stage, measure)
+
+    def as_dict(self) -> Dict[str, Dict[str, Dict[str, Optional[float]]]]:
+        return {filename: {stage: dict(stages[stage]) for stage in MEMORY_STAGES if stage in stages}
+                for filename, stages in self.files.items()}
+
+    def totals(self) -> Dict[str, float]:
+        """Huella de todos los archivos por momento, en MB"""
+        return {stage: round(sum(stages[stage]['dataframe_mb'] for stages in self.files.values() if stage in stages), 2)
+                for stage in MEMORY_STAGES if any(stage in stages for stages in self.files.values())}
+
+
+def top_allocations(limit: int) -> List[Dict[str, Any]]:
+    """Líneas de código con más memoria asignada y todavía viva según tracemalloc (si está activo)"""
+    if not tracemalloc.is_tracing():
+        return []
+    statistics = tracemalloc.take_snapshot().statistics('lineno')[:limit]
+    return [{
+        'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+        'size_mb': round(stat.size / (1024 * 1024), 3),
+        'count': stat.count
+    } for stat in statistics]
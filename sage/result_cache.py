@@ -0,0 +1,198 @@
+"""
+Caché de resultados de ejecuciones
+
+Los emisores suelen reenviar el mismo archivo (reintentos de correo,
+resubidas por SFTP). Si el contenido del archivo y el YAML normalizado son
+idénticos a los de una ejecución anterior, se reutilizan sus conteos y su
+reporte en lugar de leer y validar de nuevo.
+
+Cada entrada es un directorio con el nombre de la clave, que guarda los
+resultados de la ejecución original (result.json, ver SageLogger.result_snapshot;
+los eventos van aparte, uno por línea, en events.jsonl y validation_failures.jsonl)
+y entry.json con sus conteos. La
+fecha de modificación de entry.json marca el último uso; las entradas se
+descartan por antigüedad y, si la caché supera su tamaño, de la usada hace
+más tiempo a la más reciente.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from .event_store import EventStore
+from .rule_compiler import compute_yaml_hash
+from .utils import env_flag, env_int
+
+CACHE_VERSION = 3          # Cambiar cuando cambie el resultado de la validación: invalida las entradas
+HASH_BLOCK_SIZE = 1 << 20  # Bloques de 1 MB al calcular el hash del archivo de datos
+ENTRY_FILE = 'entry.json'
+RESULT_FILE = 'result.json'
+STREAMS_KEY = '_streams'   # Resultados de result.json guardados como archivos JSONL
+# Variables de entorno que cambian el resultado de la validación (mensajes, tipos de los
+# DataFrames materializados o reglas evaluadas) y por lo tanto forman parte de la clave
+RESULT_SETTINGS = ('SAGE_ENGINE', 'SAGE_CATEGORICAL_TEXT', 'SAGE_RULE_REWRITE')
+
+
+def file_content_hash(path: str) -> str:
+    """SHA-256 del contenido del archivo, leído por bloques para no cargarlo en memoria"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def normalized_yaml_hash(path: str) -> str:
+    """Hash del YAML parseado: comentarios, espacios y orden de las claves no lo cambian"""
+    with open(path, encoding='utf-8') as f:
+        return compute_yaml_hash(yaml.safe_load(f) or {})
+
+
+class ResultCache:
+    """Resultados de ejecuciones anteriores indexados por hash del archivo de datos y del YAML"""
+
+    MAX_MB = 512          # Tamaño máximo de la caché
+    MAX_AGE_DAYS = 7      # Antigüedad máxima de una entrada
+
+    def __init__(self, directory: str, max_mb: int = MAX_MB, max_age_days: int = MAX_AGE_DAYS):
+        self.directory = directory
+        self.max_bytes = max_mb * 1024 * 1024
+        self.max_age_seconds = max_age_days * 24 * 3600
+
+    @classmethod
+    def from_env(cls) -> Optional['ResultCache']:
+        """
+        Caché configurada por entorno, o None si está desactivada (SAGE_RESULT_CACHE=0)
+
+        SAGE_RESULT_CACHE_DIR indica el directorio (por defecto executions/.result_cache),
+        SAGE_RESULT_CACHE_MB el tamaño máximo y SAGE_RESULT_CACHE_DAYS la antigüedad máxima.
+        """
+        if not env_flag('SAGE_RESULT_CACHE', True):
+            return None
+        directory = os.environ.get('SAGE_RESULT_CACHE_DIR') or os.path.join(os.getcwd(), 'executions', '.result_cache')
+        return cls(directory,
+                   env_int('SAGE_RESULT_CACHE_MB', cls.MAX_MB),
+                   env_int('SAGE_RESULT_CACHE_DAYS', cls.MAX_AGE_DAYS))
+
+    @staticmethod
+    def key(data_path: str, yaml_path: str, casilla_id: Optional[int] = None, emisor_id: Optional[int] = None) -> str:
+        """
+        Clave de una ejecución: contenido y extensión del archivo de datos, YAML normalizado,
+        casilla y emisor (cada casilla materializa sus propios datos) y RESULT_SETTINGS
+        """
+        extension = os.path.splitext(data_path)[1].lower()  # Define si se lee como CSV, Excel o ZIP
+        settings = [f"{name}={os.environ.get(name, '').strip().lower()}" for name in RESULT_SETTINGS]
+        parts = (str(CACHE_VERSION), file_content_hash(data_path), normalized_yaml_hash(yaml_path), extension,
+                 f"casilla={casilla_id or ''}", f"emisor={emisor_id or ''}", *settings)
+        return hashlib.sha256(':'.join(parts).encode('utf-8')).hexdigest()
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def lookup(self, key: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Busca una ejecución anterior con la misma clave
+
+        Returns:
+            Optional[Tuple[Dict, Dict]]: (datos de la entrada, resultados de la ejecución
+            original), o None si no hay una entrada vigente
+        """
+        entry_dir = self._entry_dir(key)
+        try:
+            with open(os.path.join(entry_dir, ENTRY_FILE), encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(os.path.join(entry_dir, RESULT_FILE), encoding='utf-8') as f:
+                result = json.load(f)
+            for name in result.pop(STREAMS_KEY, []):
+                result[name] = EventStore.from_file(os.path.join(entry_dir, f'{name}.jsonl'))
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get('created_at', 0) > self.max_age_seconds:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+        os.utime(os.path.join(entry_dir, ENTRY_FILE))  # Último uso, para descartar primero las no usadas
+        return entry, result
+
+    def store(self, key: str, result: Dict[str, Any], execution_uuid: str, log_directory: str,
+              total_records: int, errors: int, warnings: int, materialized: bool = False) -> None:
+        """
+        Guarda el resultado de una ejecución y descarta las entradas que excedan los límites
+
+        Args:
+            materialized: Si las materializaciones de la casilla se completaron
+        """
+        entry_dir = self._entry_dir(key)
+        os.makedirs(entry_dir, exist_ok=True)
+        result = dict(result, **{STREAMS_KEY: []})
+        for name, value in list(result.items()):
+            if isinstance(value, EventStore):  # Se copian evento a evento, sin cargarlos en memoria
+                value.write_jsonl(os.path.join(entry_dir, f'{name}.jsonl'))
+                result[STREAMS_KEY].append(name)
+                del result[name]
+        with open(os.path.join(entry_dir, RESULT_FILE), 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, default=str)
+        entry = {
+            'execution_uuid': execution_uuid,
+            'log_directory': log_directory,
+            'created_at': time.time(),
+            'total_records': total_records,
+            'errors': errors,
+            'warnings': warnings,
+            'materialized': materialized
+        }
+        # entry.json se escribe al final y se reemplaza de una vez: una entrada a medio escribir no se lee
+        temp_path = os.path.join(entry_dir, f'{ENTRY_FILE}.{os.getpid()}.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(temp_path, os.path.join(entry_dir, ENTRY_FILE))
+        self.evict()
+
+    def _entries(self) -> List[Tuple[float, float, int, str]]:
+        """(último uso, creación, bytes, directorio) de cada entrada"""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            entry_dir = self._entry_dir(name)
+            try:
+                entry_path = os.path.join(entry_dir, ENTRY_FILE)
+                with open(entry_path, encoding='utf-8') as f:
+                    created_at = json.load(f).get('created_at', 0)
+                last_used = os.path.getmtime(entry_path)
+                size = sum(entry.stat().st_size for entry in os.scandir(entry_dir) if entry.is_file())
+            except (OSError, ValueError):
+                continue  # Entrada a medio escribir (o de otro proceso que la está descartando)
+            entries.append((last_used, created_at, size, entry_dir))
+        return entries
+
+    def evict(self) -> int:
+        """
+        Descarta las entradas más antiguas que MAX_AGE_DAYS y, si la caché supera
+        MAX_MB, las usadas hace más tiempo
+
+        Returns:
+            int: Número de entradas descartadas
+        """
+        now = time.time()
+        evicted = 0
+        kept = []
+        for last_used, created_at, size, entry_dir in sorted(self._entries()):
+            if now - created_at > self.max_age_seconds:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                evicted += 1
+            else:
+                kept.append((size, entry_dir))
+        total = sum(size for size, _ in kept)
+        for size, entry_dir in kept:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            evicted += 1
+        return evicted
@@ -0,0 +1,134 @@
+"""
+Análisis estático de las expresiones de las reglas: qué columnas de cada catálogo usan
+
+Las reglas son expresiones libres de pandas; aquí se recorre su árbol sintáctico
+(ast) para extraer las columnas que leen (df['x'], df.x, df[['x', 'y']] y, en las
+reglas de paquete, df['catalogo']['x']). Cuando una expresión usa el DataFrame de
+otra forma (df.apply(...), len(df), df[mascara], ...) no se puede saber qué
+columnas necesita y el resultado es None: se deben conservar todas.
+"""
+import ast
+from typing import Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+
+FRAME_NAME = 'df'  # Nombre con el que las reglas ven el DataFrame (ver FileProcessor._evaluate_rule)
+
+# Dependencias de columnas: {catálogo: columnas, o None si se necesitan todas}
+Dependencies = Dict[str, Optional[List[str]]]
+
+
+def _parents(tree: ast.AST) -> Dict[ast.AST, ast.AST]:
+    return {child: node for node in ast.walk(tree) for child in ast.iter_child_nodes(node)}
+
+
+def _string_keys(node: ast.AST) -> Optional[List[str]]:
+    """Claves de texto literales de un subíndice: 'x' o ['x', 'y']"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, (ast.List, ast.Tuple)) and node.elts:
+        keys = [elt.value for elt in node.elts if isinstance(elt, ast.Constant) and isinstance(elt.value, str)]
+        if len(keys) == len(node.elts):
+            return keys
+    return None
+
+
+def _frame_columns(node: ast.AST, parents: Dict[ast.AST, ast.AST]) -> Optional[List[str]]:
+    """
+    Columnas que se leen de un nodo que representa un DataFrame
+
+    Returns:
+        Optional[List[str]]: Columnas usadas, o None si el DataFrame se usa completo
+    """
+    parent = parents.get(node)
+    if isinstance(parent, ast.Subscript) and parent.value is node:
+        return _string_keys(parent.slice)
+    if isinstance(parent, ast.Attribute) and parent.value is node and not hasattr(pd.DataFrame, parent.attr):
+        return [parent.attr]  # df.columna
+    return None
+
+
+def _frame_nodes(tree: ast.AST) -> List[ast.Name]:
+    return [node for node in ast.walk(tree)
+            if isinstance(node, ast.Name) and node.id == FRAME_NAME and isinstance(node.ctx, ast.Load)]
+
+
+def _parse(expression: str) -> Optional[ast.AST]:
+    try:
+        return ast.parse(expression.strip(), mode='eval')
+    except SyntaxError:
+        return None
+
+
+def rule_columns(expression: str) -> Optional[List[str]]:
+    """
+    Columnas que usa una regla de campo, de fila o de catálogo
+
+    Returns:
+        Optional[List[str]]: Columnas en orden de aparición, o None si no se pueden determinar
+    """
+    tree = _parse(expression)
+    if tree is None:
+        return None
+    parents = _parents(tree)
+    columns: List[str] = []
+    for node in _frame_nodes(tree):
+        used = _frame_columns(node, parents)
+        if used is None:
+            return None
+        columns.extend(column for column in used if column not in columns)
+    return columns
+
+
+def package_rule_columns(expression: str) -> Optional[Dependencies]:
+    """
+    Columnas de cada catálogo que usa una regla de paquete (df['catalogo']['columna'])
+
+    Returns:
+        Optional[Dependencies]: {catálogo: columnas o None}, o None si la regla
+        usa el diccionario de DataFrames de una forma que no se puede analizar
+    """
+    tree = _parse(expression)
+    if tree is None:
+        return None
+    parents = _parents(tree)
+    dependencies: Dependencies = {}
+    for node in _frame_nodes(tree):
+        parent = parents.get(node)
+        if not (isinstance(parent, ast.Subscript) and parent.value is node):
+            return None
+        catalogs = _string_keys(parent.slice)
+        if catalogs is None or len(catalogs) != 1:
+            return None
+        used = _frame_columns(parent, parents)
+        _add_columns(dependencies, catalogs[0], used)
+    return dependencies
+
+
+def _add_columns(dependencies: Dependencies, catalog_name: str, columns: Optional[Iterable[str]]) -> None:
+    if columns is None or (catalog_name in dependencies and dependencies[catalog_name] is None):
+        dependencies[catalog_name] = None
+        return
+    current = dependencies.setdefault(catalog_name, [])
+    current.extend(column for column in columns if column not in current)
+
+
+def merge_rule_columns(rules) -> Optional[Set[str]]:
+    """Unión de las columnas de varias reglas de catálogo (None si alguna las necesita todas)"""
+    merged: Set[str] = set()
+    for rule in rules:
+        if rule.columns is None:
+            return None
+        merged.update(rule.columns)
+    return merged
+
+
+def merge_package_columns(rules) -> Optional[Dependencies]:
+    """Unión de las dependencias de las reglas de un paquete (None si alguna no se pudo analizar)"""
+    merged: Dependencies = {}
+    for rule in rules:
+        if rule.catalog_columns is None:
+            return None
+        for catalog_name, columns in rule.catalog_columns.items():
+            _add_columns(merged, catalog_name, columns)
+    return merged
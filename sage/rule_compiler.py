@@ -0,0 +1,98 @@
+"""Compilación y caché de reglas de validación para SAGE"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from types import CodeType
+from typing import Any, Dict, Tuple, Union
+
+
+def compute_yaml_hash(content: Union[bytes, str, Dict[str, Any]]) -> str:
+    """
+    Calcula el hash SHA-256 del contenido de un YAML
+
+    Args:
+        content: Bytes o texto del archivo YAML, o el diccionario ya parseado.
+            Los diccionarios se serializan con claves ordenadas para que el
+            hash no dependa del orden de las secciones.
+
+    Returns:
+        str: Hash hexadecimal del contenido
+    """
+    if isinstance(content, dict):
+        content = json.dumps(content, sort_keys=True, default=str)
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+class RuleCache:
+    """
+    Caché LRU de objetos de código compilados a partir de las reglas del YAML.
+
+    La clave es el texto de la regla junto con el hash del YAML que la
+    contiene, de modo que un daemon que valida cientos de archivos contra la
+    misma casilla compila cada expresión una sola vez.
+    """
+
+    MAX_ENTRIES = 4096  # Máximo número de reglas compiladas en memoria
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], CodeType]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, rule_text: str, yaml_hash: str = "") -> CodeType:
+        """
+        Devuelve el objeto de código de una regla, compilándolo si no está en caché
+
+        Raises:
+            SyntaxError: Si la expresión de la regla no es válida
+        """
+        # eval() ignoraba los espacios al inicio y al final; compile() no los acepta
+        rule_text = str(rule_text).strip()
+        key = (yaml_hash, rule_text)
+        with self._lock:
+            code = self._entries.get(key)
+            if code is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return code
+            self.misses += 1
+
+        # Compilar fuera del lock; si falla, la excepción llega al llamador
+        code = compile(rule_text, "<sage-rule>", "eval")
+
+        with self._lock:
+            self._entries[key] = code
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return code
+
+    def stats(self) -> Dict[str, int]:
+        """Devuelve los contadores de aciertos y fallos de la caché"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries)
+            }
+
+    def clear(self) -> None:
+        """Vacía la caché y reinicia los contadores"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Caché compartida por todo el proceso (CLI o daemon)
+RULE_CACHE = RuleCache()
+
+
+def compile_rule(rule_text: str, yaml_hash: str = "") -> CodeType:
+    """Compila una regla usando la caché global del proceso"""
+    return RULE_CACHE.get(rule_text, yaml_hash)
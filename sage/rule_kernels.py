@@ -0,0 +1,402 @@
+"""
+Reglas declarativas (range, regex, in_set, length) compiladas a kernels vectorizados
+
+Una regla declarativa indica el tipo de verificación y sus parámetros en lugar
+de una expresión de pandas:
+
+    - name: "Monto válido"
+      description: "El monto debe estar entre 0 y 1000"
+      type: range
+      min: 0
+      max: 1000
+      severity: error
+
+Se evalúa directamente con NumPy (o con los métodos vectorizados de pandas)
+sin pasar por eval. Las reglas escritas como expresión que coinciden con uno de
+estos patrones (df['x'] > 0, df['x'].between(a, b), df['x'].str.match('...'),
+df['x'].isin([...]), df['x'].str.len() <= n) se reescriben automáticamente.
+
+Todas las reglas declarativas consideran inválidos los valores nulos, igual que
+una comparación de pandas; en las reglas de campo los nulos ya vienen excluidos.
+"""
+import ast
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .arrow_engine import re2_pattern, regex_mask
+
+REGEX_MODES = ('fullmatch', 'match', 'search')
+_STR_METHODS = {'fullmatch': 'fullmatch', 'match': 'match', 'search': 'contains'}  # Método .str equivalente
+
+Bound = Union[int, float, str]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _compare(values, bound: Bound, lower: bool, inclusive: bool) -> np.ndarray:
+    if lower:
+        result = values >= bound if inclusive else values > bound
+    else:
+        result = values <= bound if inclusive else values < bound
+    return np.asarray(result, dtype=bool)
+
+
+def _bounds_mask(values, n: int, minimum: Optional[Bound], maximum: Optional[Bound],
+                 min_inclusive: bool, max_inclusive: bool) -> np.ndarray:
+    valid = np.ones(n, dtype=bool)
+    if minimum is not None:
+        valid &= _compare(values, minimum, True, min_inclusive)
+    if maximum is not None:
+        valid &= _compare(values, maximum, False, max_inclusive)
+    return valid
+
+
+def _bounds_expression(target: str, minimum: Optional[Bound], maximum: Optional[Bound],
+                       min_inclusive: bool, max_inclusive: bool) -> str:
+    """Expresión de pandas equivalente a unos límites (para los logs y el reporte)"""
+    if minimum is not None and maximum is not None and min_inclusive and max_inclusive:
+        return f"{target}.between({minimum!r}, {maximum!r})"
+    parts = []
+    if minimum is not None:
+        parts.append(f"{target} {'>=' if min_inclusive else '>'} {minimum!r}")
+    if maximum is not None:
+        parts.append(f"{target} {'<=' if max_inclusive else '<'} {maximum!r}")
+    return parts[0] if len(parts) == 1 else ' & '.join(f"({part})" for part in parts)
+
+
+@dataclass
+class RuleKernel:
+    """Regla declarativa sobre una columna; devuelve la máscara de filas válidas"""
+    field: str
+
+    type = ''
+    engine = 'numpy'  # Motor con el que se evaluó (se muestra en los tiempos por regla)
+
+    def __call__(self, df: pd.DataFrame) -> pd.Series:
+        column = df[self.field]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            return pd.Series(self._evaluate_categories(column), index=column.index)
+        return pd.Series(self.evaluate(column), index=column.index)
+
+    def _evaluate_categories(self, column: pd.Series) -> np.ndarray:
+        """Columna categórica: se evalúa una vez por categoría y se expande con los códigos"""
+        categories = pd.Series(column.cat.categories)
+        # El código -1 (nulo) toma el último elemento: los nulos no cumplen la regla
+        valid = np.append(self.evaluate(categories), False)
+        return valid[column.cat.codes.to_numpy()]
+
+    def evaluate(self, column: pd.Series) -> np.ndarray:
+        raise NotImplementedError
+
+    def expression(self) -> str:
+        """Expresión de pandas equivalente, que se guarda como texto de la regla"""
+        raise NotImplementedError
+
+    @property
+    def target(self) -> str:
+        return f"df[{self.field!r}]"
+
+
+@dataclass
+class RangeKernel(RuleKernel):
+    """Valores dentro de [min, max] (cada límite es opcional y puede ser exclusivo)"""
+    min: Optional[Bound] = None
+    max: Optional[Bound] = None
+    min_inclusive: bool = True
+    max_inclusive: bool = True
+    cast_float: bool = False  # La expresión original convertía con .astype(float)
+
+    type = 'range'
+
+    def evaluate(self, column: pd.Series) -> np.ndarray:
+        numeric_bounds = all(_is_number(b) for b in (self.min, self.max) if b is not None)
+        if self.cast_float:
+            values = column.astype(float).to_numpy()
+        elif numeric_bounds and column.dtype.kind in 'iuf':
+            values = column.to_numpy()
+        elif numeric_bounds and not pd.api.types.is_bool_dtype(column) and pd.api.types.is_numeric_dtype(column):
+            values = column.to_numpy(dtype='float64', na_value=np.nan)  # Enteros con nulos (Int64)
+        else:
+            values = column  # Texto, fechas u objetos: la misma comparación de pandas que la expresión
+        return _bounds_mask(values, len(column), self.min, self.max, self.min_inclusive, self.max_inclusive)
+
+    def expression(self) -> str:
+        target = f"{self.target}.astype(float)" if self.cast_float else self.target
+        return _bounds_expression(target, self.min, self.max, self.min_inclusive, self.max_inclusive)
+
+
+@dataclass
+class RegexKernel(RuleKernel):
+    """
+    Valores de texto que cumplen una expresión regular, compilada una sola vez al cargar el YAML.
+
+    Se evalúa con el kernel RE2 de Arrow cuando el patrón se puede traducir sin
+    cambiar su semántica (ver arrow_engine.re2_pattern); si no, con `re` fila a fila.
+    """
+    pattern: str = ''
+    mode: str = 'fullmatch'
+    _regex: Any = field(default=None, init=False, repr=False, compare=False)
+    _arrow_pattern: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    type = 'regex'
+
+    def __post_init__(self):
+        self._regex = re.compile(self.pattern)
+        self._arrow_pattern = re2_pattern(self.pattern, self.mode)
+
+    def evaluate(self, column: pd.Series) -> np.ndarray:
+        column.str  # Mismo error que la expresión si la columna no es de texto
+        if self._arrow_pattern is not None:
+            mask = regex_mask(column, self._arrow_pattern)
+            if mask is not None:
+                self.engine = 'arrow'
+                return mask
+        self.engine = 're'
+        check = getattr(self._regex, self.mode)
+        values = column.to_numpy(dtype=object)
+        return np.fromiter((isinstance(value, str) and check(value) is not None for value in values),
+                           dtype=bool, count=len(values))
+
+    def expression(self) -> str:
+        return f"{self.target}.str.{_STR_METHODS[self.mode]}({self.pattern!r})"
+
+
+@dataclass
+class InSetKernel(RuleKernel):
+    """Valores que pertenecen a un conjunto (isin busca en una tabla hash de los valores)"""
+    values: List[Any] = field(default_factory=list)
+
+    type = 'in_set'
+    engine = 'hash'
+
+    def evaluate(self, column: pd.Series) -> np.ndarray:
+        return column.isin(self.values).to_numpy(dtype=bool)
+
+    def expression(self) -> str:
+        return f"{self.target}.isin({list(self.values)!r})"
+
+
+@dataclass
+class LengthKernel(RuleKernel):
+    """Largo del texto dentro de [min, max]"""
+    min: Optional[int] = None
+    max: Optional[int] = None
+
+    type = 'length'
+
+    def evaluate(self, column: pd.Series) -> np.ndarray:
+        lengths = column.str.len().to_numpy(dtype='float64', na_value=np.nan)
+        return _bounds_mask(lengths, len(column), self.min, self.max, True, True)
+
+    def expression(self) -> str:
+        if self.min is not None and self.min == self.max:
+            return f"{self.target}.str.len() == {self.min!r}"
+        return _bounds_expression(f"{self.target}.str.len()", self.min, self.max, True, True)
+
+
+RULE_TYPES = {kernel.type: kernel for kernel in (RangeKernel, RegexKernel, InSetKernel, LengthKernel)}
+
+
+def build_kernel(rule_type: str, params: Dict[str, Any], field_name: str) -> RuleKernel:
+    """
+    Construye el kernel de una regla declarativa a partir de sus parámetros del YAML
+
+    Raises:
+        ValueError: Si el tipo no existe o los parámetros no son válidos
+    """
+    if rule_type not in RULE_TYPES:
+        raise ValueError(f"tipo de regla '{rule_type}' desconocido (tipos válidos: {', '.join(RULE_TYPES)})")
+
+    if rule_type in ('range', 'length'):
+        minimum, maximum = params.get('min'), params.get('max')
+        if minimum is None and maximum is None:
+            raise ValueError(f"una regla '{rule_type}' necesita 'min', 'max' o ambos")
+        valid_bound = (lambda b: isinstance(b, int) and not isinstance(b, bool) and b >= 0) if rule_type == 'length' \
+            else (lambda b: _is_number(b) or isinstance(b, str))
+        for name, bound in (('min', minimum), ('max', maximum)):
+            if bound is not None and not valid_bound(bound):
+                expected = "un entero no negativo" if rule_type == 'length' else "un número o un texto"
+                raise ValueError(f"'{name}' debe ser {expected} (se recibió '{bound}')")
+        if _is_number(minimum) and _is_number(maximum) and minimum > maximum:
+            raise ValueError(f"'min' ({minimum}) no puede ser mayor que 'max' ({maximum})")
+        if rule_type == 'length':
+            return LengthKernel(field_name, minimum, maximum)
+        return RangeKernel(field_name, minimum, maximum,
+                           bool(params.get('min_inclusive', True)), bool(params.get('max_inclusive', True)))
+
+    if rule_type == 'regex':
+        pattern, mode = params.get('pattern'), params.get('mode', 'fullmatch')
+        if not isinstance(pattern, str) or not pattern:
+            raise ValueError("una regla 'regex' necesita 'pattern'")
+        if mode not in REGEX_MODES:
+            raise ValueError(f"'mode' debe ser uno de: {', '.join(REGEX_MODES)} (se recibió '{mode}')")
+        try:
+            return RegexKernel(field_name, pattern, mode)
+        except re.error as e:
+            raise ValueError(f"el patrón '{pattern}' no es una expresión regular válida: {e}")
+
+    values = params.get('values')
+    if not isinstance(values, list) or not values:
+        raise ValueError("una regla 'in_set' necesita 'values' con una lista de valores")
+    return InSetKernel(field_name, values)
+
+
+# --- Reescritura automática de expresiones ---------------------------------
+
+_RANGE_OPS = {ast.Gt: ('min', False), ast.GtE: ('min', True), ast.Lt: ('max', False), ast.LtE: ('max', True)}
+_FLIPPED = {ast.Gt: ast.Lt, ast.GtE: ast.LtE, ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Eq: ast.Eq}
+_REGEX_METHODS = {'match': 'match', 'fullmatch': 'fullmatch', 'contains': 'search'}
+
+
+def _column_name(node: ast.AST) -> Optional[str]:
+    """df['x'] -> 'x'"""
+    if (isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name) and node.value.id == 'df'
+            and isinstance(node.slice, ast.Constant) and isinstance(node.slice.value, str)):
+        return node.slice.value
+    return None
+
+
+def _method_call(node: ast.AST, method: str, accessor: Optional[str] = None) -> Optional[ast.AST]:
+    """Si `node` es <objeto>[.accessor].method(...), devuelve <objeto>"""
+    if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == method):
+        return None
+    owner = node.func.value
+    if accessor is not None:
+        if not (isinstance(owner, ast.Attribute) and owner.attr == accessor):
+            return None
+        owner = owner.value
+    return owner
+
+
+def _numeric_target(node: ast.AST) -> Optional[tuple]:
+    """df['x'] -> ('x', False); df['x'].astype(float) -> ('x', True)"""
+    owner = _method_call(node, 'astype')
+    if owner is not None:
+        arg = node.args[0] if len(node.args) == 1 and not node.keywords else None
+        is_float = (isinstance(arg, ast.Name) and arg.id == 'float') or \
+            (isinstance(arg, ast.Constant) and arg.value in ('float', 'float64'))
+        column = _column_name(owner) if is_float else None
+        return (column, True) if column is not None else None
+    column = _column_name(node)
+    return (column, False) if column is not None else None
+
+
+def _length_target(node: ast.AST) -> Optional[str]:
+    """df['x'].str.len()"""
+    owner = _method_call(node, 'len', 'str')
+    if owner is not None and not node.args and not node.keywords:
+        return _column_name(owner)
+    return None
+
+
+def _literal(node: ast.AST) -> Any:
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, SyntaxError):
+        return None
+
+
+def _bounds(node: ast.AST, target_of, allow_eq: bool = False) -> Optional[tuple]:
+    """
+    Límites de una comparación, un between o un & de comparaciones sobre el mismo objetivo
+
+    Returns:
+        Optional[tuple]: (columna, {'min'/'max': (límite, inclusivo)}) o None
+    """
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitAnd):
+        left, right = _bounds(node.left, target_of, allow_eq), _bounds(node.right, target_of, allow_eq)
+        if left is None or right is None or left[0] != right[0]:
+            return None
+        merged = dict(left[1])
+        for key, value in right[1].items():
+            if key in merged:
+                return None
+            merged[key] = value
+        return left[0], merged
+
+    owner = _method_call(node, 'between')
+    if owner is not None and len(node.args) == 2 and not node.keywords:
+        target = target_of(owner)
+        low, high = _literal(node.args[0]), _literal(node.args[1])
+        if target is not None and _is_number(low) and _is_number(high):
+            return target, {'min': (low, True), 'max': (high, True)}
+        return None
+
+    if isinstance(node, ast.Compare) and len(node.ops) == 1:
+        left, op, right = node.left, type(node.ops[0]), node.comparators[0]
+        if target_of(left) is None:
+            left, right, op = right, left, _FLIPPED.get(op)
+        target, bound = target_of(left), _literal(right)
+        if target is None or not _is_number(bound):
+            return None
+        if op is ast.Eq and allow_eq:
+            return target, {'min': (bound, True), 'max': (bound, True)}
+        if op in _RANGE_OPS:
+            side, inclusive = _RANGE_OPS[op]
+            return target, {side: (bound, inclusive)}
+    return None
+
+
+def rewrite_expression(expression: str) -> Optional[RuleKernel]:
+    """
+    Reconoce expresiones de pandas equivalentes a una regla declarativa
+
+    Returns:
+        Optional[RuleKernel]: El kernel equivalente, o None si la expresión no coincide
+        con ningún patrón conocido (se sigue evaluando con eval)
+    """
+    try:
+        node = ast.parse(expression.strip(), mode='eval').body
+    except SyntaxError:
+        return None
+
+    # df['x'].str.match('p'), .str.fullmatch('p'), .str.contains('p')
+    for method, mode in _REGEX_METHODS.items():
+        owner = _method_call(node, method, 'str')
+        if owner is None:
+            continue
+        column = _column_name(owner)
+        pattern = _literal(node.args[0]) if len(node.args) == 1 else None
+        # na=False no cambia el resultado: los nulos ya se consideran inválidos
+        keywords_ok = all(k.arg == 'na' and _literal(k.value) is False for k in node.keywords)
+        if column is None or not isinstance(pattern, str) or not keywords_ok:
+            return None
+        try:
+            return RegexKernel(column, pattern, mode)
+        except re.error:
+            return None
+
+    # df['x'].isin([...])
+    owner = _method_call(node, 'isin')
+    if owner is not None:
+        column = _column_name(owner)
+        values = _literal(node.args[0]) if len(node.args) == 1 and not node.keywords else None
+        if column is None or not isinstance(values, (list, tuple, set)) or not values:
+            return None
+        if not all(isinstance(v, str) or _is_number(v) for v in values):
+            return None
+        return InSetKernel(column, sorted(values, key=repr) if isinstance(values, set) else list(values))
+
+    # Largo del texto: df['x'].str.len() <= n, .between(a, b), == n
+    bounds = _bounds(node, _length_target, allow_eq=True)
+    if bounds is not None:
+        target, limits = bounds
+        if any(not isinstance(v, int) or not inclusive or v < 0 for v, inclusive in limits.values()):
+            return None
+        return LengthKernel(target, limits.get('min', (None,))[0], limits.get('max', (None,))[0])
+
+    # Rango numérico: df['x'] > 0, (df['x'] >= a) & (df['x'] <= b), df['x'].between(a, b),
+    # también sobre df['x'].astype(float)
+    bounds = _bounds(node, _numeric_target)
+    if bounds is not None:
+        (column, cast_float), limits = bounds
+        minimum, min_inclusive = limits.get('min', (None, True))
+        maximum, max_inclusive = limits.get('max', (None, True))
+        return RangeKernel(column, minimum, maximum, min_inclusive, max_inclusive, cast_float)
+    return None
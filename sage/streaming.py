@@ -0,0 +1,28 @@
+"""Estado compartido entre bloques para la validación de CSV en modo streaming"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .uniqueness import UniquenessIndex
+
+
+@dataclass
+class CatalogStreamState:
+    """
+    Estado que se arrastra entre bloques al validar un catálogo por partes.
+
+    Los índices de los bloques que entrega pandas son continuos, por lo que los
+    números de línea se calculan igual que con el archivo completo; este estado
+    solo guarda lo que una verificación necesita recordar de bloques anteriores.
+
+    Al validar un rango de bytes en un proceso hijo, `deferred` es una lista: las
+    verificaciones que dependen de otros rangos se guardan ahí en lugar de registrarse.
+    """
+    rows_seen: int = 0          # Filas ya validadas en bloques anteriores
+    chunks_processed: int = 0
+    rule_errors: Dict[Tuple[str, str], int] = field(default_factory=dict)  # {(campo, regla): errores mostrados}
+    counted_checks: Dict[Tuple[str, str], List[int]] = field(default_factory=dict)  # {(tipo, campo): [total, mostrados]}
+    unique_indexes: Dict[Tuple[str, ...], UniquenessIndex] = field(default_factory=dict)  # {campos: índice de unicidad}
+    materialized: List[pd.DataFrame] = field(default_factory=list)  # Bloques guardados para reglas de catálogo
+    deferred: Optional[List[Tuple[str, Dict[str, Any]]]] = None  # Llamadas (método, argumentos) diferidas
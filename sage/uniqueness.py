@@ -0,0 +1,171 @@
+"""Índice de unicidad por lotes para campos `unique` y claves compuestas"""
+from typing import List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .arrow_engine import is_arrow_string, string_keys
+
+# Representación normalizada de un valor nulo dentro de una clave
+NULL_KEY = "\x00<null>"
+
+
+class UniquenessIndex:
+    """
+    Índice de unicidad que se alimenta por lotes.
+
+    Guarda el hash de 64 bits de cada clave normalizada junto con la línea en
+    la que se vio por primera vez. Cuando el hash de una fila ya existe, la
+    clave se compara con la guardada para descartar colisiones del hash, de
+    modo que solo se reportan duplicados reales.
+
+    Los hashes se guardan en segmentos ordenados (uno por lote) que se
+    compactan cuando superan MAX_SEGMENTS, para que la búsqueda siga siendo
+    vectorizada con np.searchsorted.
+    """
+
+    MAX_SEGMENTS = 8  # Segmentos antes de compactar en uno solo
+
+    def __init__(self, fields: Sequence[str]):
+        self.fields = list(fields)
+        self._hashes: List[np.ndarray] = []   # Hashes ordenados de cada segmento
+        self._lines: List[np.ndarray] = []    # Línea de primera aparición de cada hash
+        self._keys: List[List[np.ndarray]] = []  # Claves normalizadas (para confirmar colisiones)
+        self.size = 0
+
+    def _normalize(self, df: pd.DataFrame) -> List[np.ndarray]:
+        """
+        Normaliza cada campo de la clave a texto para que el mismo valor tenga
+        el mismo hash aunque pandas lo haya leído con distinto tipo en cada
+        bloque (por ejemplo 1 como int64 y 1.0 como float64).
+        """
+        columns = []
+        for field_name in self.fields:
+            column = df[field_name]
+            nulls = column.isna().to_numpy()
+            if pd.api.types.is_float_dtype(column):
+                floats = column.to_numpy(dtype='float64', na_value=np.nan)
+                values = floats.astype(str).astype(object)
+                # Los decimales enteros se escriben como enteros: 1.0 -> '1'
+                integral = np.isfinite(floats) & (np.abs(floats) < 2 ** 63) & (floats == np.floor(floats))
+                values[integral] = floats[integral].astype(np.int64).astype(str)
+            elif is_arrow_string(column):
+                # Texto de Arrow: los nulos se reemplazan con pc.fill_null
+                values = string_keys(column, NULL_KEY)
+            else:
+                values = column.astype(str).to_numpy(dtype=object)
+            values[nulls] = NULL_KEY
+            columns.append(values)
+        return columns
+
+    @staticmethod
+    def _hash(keys: List[np.ndarray]) -> np.ndarray:
+        """Calcula el hash de 64 bits de cada clave (una o varias columnas)"""
+        if len(keys) == 1:
+            return pd.util.hash_array(keys[0], categorize=False)
+        frame = pd.DataFrame({i: column for i, column in enumerate(keys)})
+        return pd.util.hash_pandas_object(frame, index=False, categorize=False).to_numpy()
+
+    @staticmethod
+    def _same_key(keys_a: List[np.ndarray], i: int, keys_b: List[np.ndarray], j: int) -> bool:
+        return all(a[i] == b[j] for a, b in zip(keys_a, keys_b))
+
+    def add(self, df: pd.DataFrame, lines: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Agrega un lote de filas al índice
+
+        Args:
+            df: Lote con los campos de la clave
+            lines: Número de línea de cada fila del lote
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Posiciones (dentro del lote) de las filas
+            duplicadas y la línea en la que se vio por primera vez cada clave
+        """
+        n = len(df)
+        if n == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        lines = np.asarray(lines, dtype=np.int64)
+        keys = self._normalize(df)
+        hashes = self._hash(keys)
+        duplicated = np.zeros(n, dtype=bool)
+        first_lines = np.zeros(n, dtype=np.int64)
+
+        # 1. Claves que ya estaban en el índice (buscar con los hashes ordenados
+        #    es bastante más rápido que en el orden del archivo)
+        batch_order = np.argsort(hashes, kind='stable')
+        for seg_hashes, seg_lines, seg_keys in zip(self._hashes, self._lines, self._keys):
+            positions = np.empty(n, dtype=np.int64)
+            positions[batch_order] = np.searchsorted(seg_hashes, hashes[batch_order])
+            found = positions < len(seg_hashes)
+            found[found] = seg_hashes[positions[found]] == hashes[found]
+            for i in np.flatnonzero(found & ~duplicated):
+                j = positions[i]
+                # Puede haber varias claves con el mismo hash: recorrerlas todas
+                while j < len(seg_hashes) and seg_hashes[j] == hashes[i]:
+                    if self._same_key(keys, i, seg_keys, j):
+                        duplicated[i] = True
+                        first_lines[i] = seg_lines[j]
+                        break
+                    j += 1
+
+        # 2. Claves repetidas dentro del mismo lote
+        order = batch_order[~duplicated[batch_order]]
+        sorted_hashes = hashes[order]
+        repeated = np.flatnonzero(sorted_hashes[1:] == sorted_hashes[:-1]) + 1
+        representatives: List[int] = []  # Claves distintas del grupo de hashes actual
+        for k in repeated:
+            if not representatives or sorted_hashes[representatives[0]] != sorted_hashes[k]:
+                representatives = [k - 1]  # Empieza un nuevo grupo de hashes iguales
+            i = order[k]
+            # El orden estable deja primero la aparición más temprana de cada clave
+            for g in representatives:
+                if self._same_key(keys, i, keys, order[g]):
+                    duplicated[i] = True
+                    first_lines[i] = lines[order[g]]
+                    break
+            else:
+                representatives.append(k)  # Colisión del hash: es una clave distinta
+
+        # 3. Guardar las claves nuevas como un segmento ordenado
+        new = order[~duplicated[order]]
+        if len(new):
+            self._hashes.append(hashes[new])
+            self._lines.append(lines[new])
+            self._keys.append([column[new] for column in keys])
+            self.size += len(new)
+            if len(self._hashes) > self.MAX_SEGMENTS:
+                self._compact()
+
+        positions = np.flatnonzero(duplicated)
+        return positions, first_lines[positions]
+
+    def _compact(self) -> None:
+        """Une todos los segmentos en uno solo ordenado por hash"""
+        hashes = np.concatenate(self._hashes)
+        order = np.argsort(hashes, kind='stable')
+        self._hashes = [hashes[order]]
+        self._lines = [np.concatenate(self._lines)[order]]
+        self._keys = [[np.concatenate(parts)[order] for parts in zip(*self._keys)]]
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray]]:
+        """Hashes, líneas y claves normalizadas de todo el índice, para guardarlo (ver incremental)"""
+        if not self._hashes:
+            empty = np.empty(0, dtype=object)
+            return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64), [empty for _ in self.fields]
+        if len(self._hashes) > 1:
+            self._compact()
+        return self._hashes[0], self._lines[0], self._keys[0]
+
+    @classmethod
+    def from_arrays(cls, fields: Sequence[str], hashes: np.ndarray, lines: np.ndarray,
+                    keys: List[np.ndarray]) -> 'UniquenessIndex':
+        """Reconstruye un índice guardado con to_arrays"""
+        index = cls(fields)
+        if len(hashes):
+            index._hashes = [np.asarray(hashes, dtype=np.uint64)]
+            index._lines = [np.asarray(lines, dtype=np.int64)]
+            index._keys = [[np.asarray(column).astype(object) for column in keys]]
+            index.size = len(hashes)
+        return index
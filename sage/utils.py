@@ -2,7 +2,8 @@
 import os
 import uuid
 import shutil
-from typing import Tuple
+import sys
+from typing import Optional, Tuple
 from datetime import datetime
 
 def create_execution_directory() -> Tuple[str, str]:
@@ -28,4 +29,44 @@ def copy_input_files(execution_dir: str, yaml_path: str, data_path: str) -> Tupl
 
 def get_timestamp() -> str:
     """Get current timestamp in standard format"""
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Lee una variable de entorno booleana ('1', 'true', 'yes', 'si')"""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "si", "sí", "on")
+
+def env_int(name: str, default: Optional[int] = None) -> Optional[int]:
+    """Lee una variable de entorno entera, devolviendo el valor por defecto si no es válida"""
+    try:
+        return int(os.environ.get(name, ""))
+    except ValueError:
+        return default
+
+def get_peak_rss_mb(children: bool = False) -> Optional[float]:
+    """
+    Devuelve la memoria residente máxima (RSS) del proceso en MB, o None si no está disponible
+
+    Args:
+        children: Si es True, la del mayor proceso hijo ya terminado (p. ej. los de ProcessPoolExecutor)
+    """
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    # En macOS ru_maxrss está en bytes; en Linux, en kilobytes
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 2)
+    return round(peak / 1024, 2)
+
+def get_rss_mb() -> Optional[float]:
+    """Devuelve la memoria residente (RSS) actual del proceso en MB, o None si no está disponible (solo Linux)"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 2)
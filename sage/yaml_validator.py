@@ -1,8 +1,14 @@
 """YAML validation functionality for SAGE"""
 import yaml
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from sage.models import SageConfig, Catalog, Package, Field, ValidationRule, FileFormat, Severity
 from sage.exceptions import YAMLValidationError
+from sage.rule_compiler import compile_rule, compute_yaml_hash
+from sage.arrow_engine import ENGINES
+from sage.package_sql import sql_available, sql_tables
+from sage.rule_analysis import package_rule_columns, rule_columns
+from sage.rule_kernels import RULE_TYPES, build_kernel, rewrite_expression
+from sage.utils import env_flag
 from sage.file_processor import FileProcessor  # Importamos para usar las constantes
 
 class YAMLValidator:
@@ -66,7 +72,28 @@ class YAMLValidator:
                 )
 
             header = file_format_data.get("header", False)
-            return FileFormat(type=file_type, delimiter=delimiter, header=header)
+
+            # Modo streaming opcional: validar el archivo por bloques
+            streaming = bool(file_format_data.get("streaming", False))
+            chunk_size = file_format_data.get("chunk_size")
+            if chunk_size is not None and (not isinstance(chunk_size, int) or chunk_size <= 0):
+                raise YAMLValidationError(
+                    f"¡Ups! 😅 El valor de 'chunk_size' en {context} debe ser un número entero positivo "
+                    f"(se recibió '{chunk_size}')"
+                )
+
+            # Motor de lectura opcional (si no se indica, se usa el global SAGE_ENGINE)
+            engine = file_format_data.get("engine")
+            if engine is not None and engine not in ENGINES:
+                raise YAMLValidationError(
+                    f"¡Ups! 😅 El valor de 'engine' en {context} debe ser uno de: {', '.join(ENGINES)} "
+                    f"(se recibió '{engine}')"
+                )
+            # Archivos acumulativos: solo se validan las filas agregadas desde el envío anterior
+            incremental = bool(file_format_data.get("incremental", False))
+            return FileFormat(type=file_type, delimiter=delimiter, header=header,
+                              streaming=streaming, chunk_size=chunk_size, engine=engine,
+                              incremental=incremental)
 
         # For Excel files in catalogs
         if file_type == "EXCEL":
@@ -135,8 +162,18 @@ class YAMLValidator:
                 "• catalogs: La lista de catálogos que incluye"
             )
 
-    def parse_validation_rules(self, rules_data: List[Dict[str, Any]]) -> List[ValidationRule]:
-        """Parse validation rules from YAML data"""
+    def parse_validation_rules(self, rules_data: List[Dict[str, Any]], yaml_hash: str = "",
+                               package: bool = False, field_name: Optional[str] = None) -> List[ValidationRule]:
+        """
+        Parse validation rules from YAML data, compile their expressions and
+        record which columns they read (package=True for package-level rules).
+
+        Declarative rules (type: range|regex|in_set|length) and expressions that
+        match one of those patterns get a vectorized kernel (see rule_kernels);
+        field_name is the column that field rules apply to. Package rules may be
+        a SQL query instead of an expression (see package_sql).
+        """
+        rewrite = env_flag('SAGE_RULE_REWRITE', True)
         rules = []
         for rule_data in rules_data:
             try:
@@ -146,37 +183,164 @@ class YAMLValidator:
                     severity = Severity.from_string(severity_str)
                 except ValueError as e:
                     raise ValueError(f"'{severity_str}' is not a valid Severity. Must be 'error', 'warning', or 'message' (case insensitive)")
+
+                if "sql" in rule_data:
+                    rules.append(self._parse_sql_rule(rule_data, severity, package))
+                    continue
+
+                kernel = None
+                if "type" in rule_data:
+                    kernel = self._parse_declarative_rule(rule_data, package, field_name)
                 
                 rule = ValidationRule(
                     name=rule_data["name"],
                     description=rule_data["description"],
-                    rule=rule_data["rule"],
-                    severity=severity
+                    rule=kernel.expression() if kernel is not None else rule_data["rule"],
+                    severity=severity,
+                    kernel=kernel
                 )
-                rules.append(rule)
             except (KeyError, ValueError) as e:
                 raise YAMLValidationError(f"Invalid validation rule: {str(e)}")
+
+            # Compilar la expresión ahora para detectar errores de sintaxis al cargar el YAML
+            try:
+                rule.code = compile_rule(rule.rule, yaml_hash)
+            except SyntaxError as e:
+                raise YAMLValidationError(
+                    f"¡Ups! 😅 La regla '{rule.name}' no es una expresión válida.\n"
+                    f"Regla: {rule.rule}\n"
+                    f"Detalle: {e.msg} (columna {e.offset})"
+                )
+
+            if rule.kernel is None and rewrite and not package:
+                rule.kernel = rewrite_expression(rule.rule)
+
+            # Columnas que usa la regla, para no conservar las que ninguna regla lee
+            if package:
+                rule.catalog_columns = package_rule_columns(rule.rule)
+            elif rule.kernel is not None:
+                rule.columns = [rule.kernel.field]
+            else:
+                rule.columns = rule_columns(rule.rule)
+            rules.append(rule)
         return rules
 
-    def validate_yaml(self, yaml_content: Dict[str, Any]) -> SageConfig:
+    def _parse_sql_rule(self, rule_data: Dict[str, Any], severity: Severity, package: bool) -> ValidationRule:
+        """Build a package rule written as a SQL query over the package catalogs"""
+        name = rule_data.get("name", "")
+        if "rule" in rule_data or "type" in rule_data:
+            raise YAMLValidationError(
+                f"¡Ups! 😅 La regla '{name}' tiene 'sql' y también 'rule' o 'type'.\n"
+                "Escribe la regla como consulta en 'sql' o como expresión en 'rule', no ambas."
+            )
+        if not package:
+            raise YAMLValidationError(
+                f"¡Ups! 😅 La regla '{name}' usa 'sql', pero solo las reglas de paquete pueden escribirse en SQL.\n"
+                "En los campos, filas y catálogos usa una expresión en 'rule'."
+            )
+        if not sql_available():
+            raise YAMLValidationError(
+                f"¡Ups! 😅 La regla de paquete '{name}' está escrita en SQL, pero DuckDB no está instalado.\n"
+                "Instala el paquete duckdb o escribe la regla como expresión en 'rule'."
+            )
+        query = str(rule_data["sql"]).strip()
+        try:
+            tables = sql_tables(query)
+        except ValueError as e:
+            raise YAMLValidationError(
+                f"¡Ups! 😅 La regla de paquete '{name}' no es una consulta SQL válida: {e}.\n"
+                f"Consulta: {query}\n"
+                "La consulta debe devolver las claves que no cumplen la regla, por ejemplo:\n"
+                "sql: SELECT v.cliente_id FROM ventas v ANTI JOIN clientes c ON v.cliente_id = c.id"
+            )
+        return ValidationRule(
+            name=rule_data["name"],
+            description=rule_data["description"],
+            rule=query,
+            severity=severity,
+            # Solo se conservan los catálogos que lee la consulta, con todas sus columnas
+            catalog_columns={table: None for table in tables},
+            sql=True
+        )
+
+    def _parse_declarative_rule(self, rule_data: Dict[str, Any], package: bool, field_name: Optional[str]):
+        """Build the kernel of a declarative rule (type: range|regex|in_set|length)"""
+        name = rule_data.get("name", "")
+        if "rule" in rule_data:
+            raise YAMLValidationError(
+                f"¡Ups! 😅 La regla '{name}' tiene 'type' y 'rule' a la vez.\n"
+                "Usa 'type' con sus parámetros (min, max, pattern, values...) o una expresión en 'rule', no ambas."
+            )
+        if package:
+            raise YAMLValidationError(
+                f"¡Ups! 😅 La regla de paquete '{name}' no puede ser declarativa.\n"
+                "Las reglas de paquete se escriben como expresión en 'rule'."
+            )
+        column = rule_data.get("field", field_name)
+        if not column:
+            raise YAMLValidationError(
+                f"¡Ups! 😅 La regla '{name}' es de tipo '{rule_data['type']}' pero no indica sobre qué campo se aplica.\n"
+                "En las reglas de fila o de catálogo agrega 'field' con el nombre del campo."
+            )
+        try:
+            return build_kernel(rule_data["type"], rule_data, column)
+        except ValueError as e:
+            raise YAMLValidationError(
+                f"¡Ups! 😅 La regla '{name}' no es válida: {e}.\n"
+                f"Tipos de regla declarativa: {', '.join(RULE_TYPES)}"
+            )
+
+    def _parse_unique_keys(self, catalog_name: str, keys_data: Any, fields: List[Field]) -> List[List[str]]:
+        """Parse composite unique keys (lists of field names) of a catalog"""
+        if not isinstance(keys_data, list):
+            raise YAMLValidationError(
+                f"¡Ups! 😅 En el catálogo '{catalog_name}', 'unique_keys' debe ser una lista de claves.\n"
+                "Ejemplo:\n"
+                "unique_keys:\n"
+                "  - [sucursal, numero_factura]"
+            )
+        field_names = {f.name for f in fields}
+        unique_keys = []
+        for key in keys_data:
+            key_fields = [key] if isinstance(key, str) else key
+            if not isinstance(key_fields, list) or not key_fields or not all(isinstance(k, str) for k in key_fields):
+                raise YAMLValidationError(
+                    f"¡Ups! 😅 En el catálogo '{catalog_name}', cada elemento de 'unique_keys' "
+                    f"debe ser una lista de nombres de campos. Encontramos: {key}"
+                )
+            missing = [k for k in key_fields if k not in field_names]
+            if missing:
+                raise YAMLValidationError(
+                    f"¡Ups! 😅 En el catálogo '{catalog_name}', la clave única {key_fields} "
+                    f"usa campos que no existen: {', '.join(missing)}"
+                )
+            unique_keys.append(key_fields)
+        return unique_keys
+
+    def validate_yaml(self, yaml_content: Dict[str, Any], yaml_hash: Optional[str] = None) -> SageConfig:
         """Validate YAML content and return a SageConfig object"""
         # Validamos la estructura básica
         self.validate_yaml_structure(yaml_content)
+
+        # Si no recibimos el hash del archivo, lo calculamos sobre el contenido parseado
+        if yaml_hash is None:
+            yaml_hash = compute_yaml_hash(yaml_content)
         
         # Parseamos el contenido para crear un objeto SageConfig
-        return self._parse_yaml_content(yaml_content)
+        return self._parse_yaml_content(yaml_content, yaml_hash)
         
     def load_and_validate(self, yaml_path: str) -> SageConfig:
         """Load and validate a YAML file, returning a SageConfig object"""
         try:
-            with open(yaml_path, 'r', encoding='utf-8') as f:
-                yaml_content = yaml.safe_load(f)
+            with open(yaml_path, 'rb') as f:
+                raw_content = f.read()
+            yaml_content = yaml.safe_load(raw_content.decode('utf-8'))
         except Exception as e:
             raise YAMLValidationError(f"Failed to load YAML file: {str(e)}")
 
-        return self.validate_yaml(yaml_content)
+        return self.validate_yaml(yaml_content, compute_yaml_hash(raw_content))
         
-    def _parse_yaml_content(self, yaml_content: Dict[str, Any]) -> SageConfig:
+    def _parse_yaml_content(self, yaml_content: Dict[str, Any], yaml_hash: str = "") -> SageConfig:
         """
         Método interno para parsear el contenido YAML y crear un objeto SageConfig
         
@@ -190,7 +354,8 @@ class YAMLValidator:
 
             fields = []
             for field_data in catalog_data["fields"]:
-                validation_rules = self.parse_validation_rules(field_data.get("validation_rules", []))
+                validation_rules = self.parse_validation_rules(field_data.get("validation_rules", []), yaml_hash,
+                                                               field_name=field_data["name"])
                 fields.append(Field(
                     name=field_data["name"],
                     type=field_data["type"],
@@ -208,8 +373,9 @@ class YAMLValidator:
                 path="",  # Valor predeterminado vacío para mantener compatibilidad
                 file_format=file_format,
                 fields=fields,
-                row_validation=self.parse_validation_rules(catalog_data.get("row_validation", [])),
-                catalog_validation=self.parse_validation_rules(catalog_data.get("catalog_validation", []))
+                row_validation=self.parse_validation_rules(catalog_data.get("row_validation", []), yaml_hash),
+                catalog_validation=self.parse_validation_rules(catalog_data.get("catalog_validation", []), yaml_hash),
+                unique_keys=self._parse_unique_keys(catalog_name, catalog_data.get("unique_keys", []), fields)
             )
 
         # Parse packages
@@ -223,7 +389,8 @@ class YAMLValidator:
                 description=package_data["description"],
                 file_format=file_format,
                 catalogs=package_data["catalogs"],
-                package_validation=self.parse_validation_rules(package_data.get("package_validation", []))
+                package_validation=self.parse_validation_rules(package_data.get("package_validation", []), yaml_hash,
+                                                               package=True)
             )
 
         # Create and return SageConfig
@@ -235,5 +402,6 @@ class YAMLValidator:
             author=sage_yaml["author"],
             comments=sage_yaml.get("comments", ""),
             catalogs=catalogs,
-            packages=packages
+            packages=packages,
+            yaml_hash=yaml_hash
         )
\ No newline at end of file
@@ -607,7 +607,8 @@ class EmailProcessor:
                     data_path=file_path,
                     casilla_id=casilla_id,
                     emisor_id=emisor_id,
-                    metodo_envio=metodo_envio
+                    metodo_envio=metodo_envio,
+                    headless=True  # Nadie lee la consola del daemon: sin rich ni eventos en su log
                 )
                 
                 # El log HTML, JSON y TXT ya habrá sido generado por process_files
@@ -2443,7 +2444,8 @@ class SFTPProcessor:
                         data_path=file_path,
                         casilla_id=casilla_id,
                         emisor_id=emisor_id,
-                        metodo_envio=metodo_envio
+                        metodo_envio=metodo_envio,
+                        headless=True  # Nadie lee la consola del daemon: sin rich ni eventos en su log
                     )
                     
                     # El log HTML, JSON y TXT ya habrá sido generado por process_files
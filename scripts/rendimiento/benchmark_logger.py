@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Compara el tiempo de registrar eventos en SageLogger abriendo report.html y
+output.log en cada evento (como antes), con un handle persistente y búfer
+(BufferedLogWriter) y en modo asíncrono (BackgroundLogWriter), y verifica que
+los tres caminos escriban lo mismo. En modo asíncrono se mide aparte el tiempo
+que el hilo que registra queda ocupado, que es el que ve la validación.
+
+Uso:
+    python scripts/rendimiento/benchmark_logger.py                 # 100.000 eventos
+    python scripts/rendimiento/benchmark_logger.py --eventos 20000
+
+La consola se reemplaza en ambos casos por una que no imprime, para medir solo
+la escritura de archivos (rich formatea el texto aunque la consola esté en quiet).
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.logger import SageLogger
+
+# Marcas de tiempo, duración y directorio, que cambian entre una ejecución y otra
+VARIABLES = re.compile(r'\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(\.\d+)?|Tiempo transcurrido: .*|Directorio: .*')
+
+
+class AperturaPorEscritura:
+    """Camino anterior: cada escritura abre el archivo en modo append y lo cierra"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, text):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(text)
+
+    def close(self):
+        pass
+
+
+class ConsolaMuda:
+    def print(self, *args, **kwargs):
+        pass
+
+
+def registrar(log_dir, eventos, camino):
+    """
+    Registra `eventos` advertencias de validación
+
+    Returns:
+        Tuple[float, float]: (segundos hasta registrar el último evento, segundos hasta cerrar el log)
+    """
+    logger = SageLogger(log_dir, async_logging=camino == 'asíncrono')
+    logger.console = ConsolaMuda()
+    if camino == 'anterior':
+        logger._html_out.close()
+        logger._text_out.close()
+        logger._html_out = AperturaPorEscritura(logger.report_html)
+        logger._text_out = AperturaPorEscritura(logger.output_log)
+
+    start = time.perf_counter()
+    for i in range(eventos):
+        logger.warning("Valor fuera de rango en 'monto'", file='ventas.csv', line=i + 2,
+                       rule="df['monto'].between(0, 1000)", value=i * 7)
+    registro = time.perf_counter() - start
+    logger._close_log_file()
+    return registro, time.perf_counter() - start
+
+
+def contenido(log_dir):
+    partes = []
+    for nombre in ('report.html', 'output.log'):
+        with open(os.path.join(log_dir, nombre), encoding='utf-8') as f:
+            partes.append(VARIABLES.sub('<v>', f.read()))
+    return partes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la escritura de eventos de SageLogger')
+    parser.add_argument('--eventos', type=int, default=100_000, help='Eventos a registrar')
+    args = parser.parse_args()
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print(f"{'camino':>10} | {'registro (s)':>12} | {'total (s)':>10} | {'eventos/s':>10}")
+        for camino in ('anterior', 'con búfer', 'asíncrono'):
+            log_dir = os.path.join(temp_dir, camino)
+            os.makedirs(log_dir)
+            registro, total = registrar(log_dir, args.eventos, camino)
+            resultados[camino] = (total, contenido(log_dir))
+            print(f"{camino:>10} | {registro:>12.2f} | {total:>10.2f} | {args.eventos / total:>10,.0f}")
+
+        print(f"\nAceleración con búfer: {resultados['anterior'][0] / resultados['con búfer'][0]:.1f}x")
+        if any(resultado[1] != resultados['anterior'][1] for resultado in resultados.values()):
+            print("⚠️ Los caminos escribieron contenidos distintos")
+            sys.exit(1)
+        print("report.html y output.log son idénticos en todos los caminos")
+
+
+if __name__ == "__main__":
+    main()
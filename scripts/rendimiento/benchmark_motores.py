@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Compara el tiempo y la memoria de los motores de lectura de CSV (pandas y pyarrow)
+validando el mismo archivo.
+
+Uso:
+    python scripts/rendimiento/benchmark_motores.py                      # Archivo sintético de 1.000.000 filas
+    python scripts/rendimiento/benchmark_motores.py --filas 200000
+    python scripts/rendimiento/benchmark_motores.py <archivo_yaml> <archivo_csv>
+
+Cada motor se ejecuta en un proceso nuevo, para que la memoria pico (RSS) de uno
+no se mezcle con la del otro.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+YAML_SINTETICO = """
+sage_yaml: {name: Benchmark, description: Benchmark de motores, version: '1.0', author: SAGE}
+catalogs:
+  ventas:
+    name: Ventas
+    description: Ventas sintéticas
+    filename: ventas.csv
+    file_format: {type: CSV, delimiter: ',', header: true}
+    fields:
+      - {name: id, type: entero, required: true, unique: true}
+      - name: cliente
+        type: texto
+        required: true
+        validation_rules:
+          - {name: Código, description: Código de cliente, rule: "df['cliente'].str.startswith('C')", severity: error}
+      - {name: region, type: texto}
+      - name: monto
+        type: decimal
+        validation_rules:
+          - {name: Positivo, description: Monto positivo, rule: "df['monto'] > 0", severity: error}
+      - {name: fecha, type: fecha}
+packages: {}
+"""
+
+
+def generar_csv(path, filas):
+    """Genera un CSV de ventas con algunos vacíos, duplicados y valores inválidos"""
+    rng = np.random.default_rng(42)
+    ids = np.arange(filas)
+    ids[rng.integers(0, filas, filas // 1000)] = 0  # Duplicados
+    clientes = np.char.add('C', rng.integers(0, 50_000, filas).astype(str)).astype(object)
+    clientes[rng.integers(0, filas, filas // 500)] = ''  # Requeridos vacíos
+    montos = np.round(rng.normal(500, 300, filas), 2).astype(object)
+    montos[rng.integers(0, filas, filas // 2000)] = 'n/d'  # Valores no numéricos
+    fechas = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, filas), unit='D')
+    pd.DataFrame({
+        'id': ids,
+        'cliente': clientes,
+        'region': rng.choice(['Norte', 'Sur', 'Centro', 'Oriente'], filas),
+        'monto': montos,
+        'fecha': fechas.strftime('%Y-%m-%d')
+    }).to_csv(path, index=False)
+
+
+def ejecutar_motor(engine, yaml_path, csv_path, catalog_name):
+    """Lee y valida el archivo con un motor (en un proceso hijo) y devuelve sus métricas"""
+    from sage.file_processor import FileProcessor
+    from sage.logger import SageLogger
+    from sage.utils import get_peak_rss_mb
+    from sage.yaml_validator import YAMLValidator
+
+    config = YAMLValidator().load_and_validate(yaml_path)
+    catalog = config.catalogs[catalog_name]
+    with tempfile.TemporaryDirectory() as log_dir:
+        processor = FileProcessor(config, SageLogger(log_dir))
+        processor.engine = engine
+
+        start = time.perf_counter()
+        df = processor._read_file(csv_path, catalog)
+        read_seconds = time.perf_counter() - start
+        processor.validate_catalog(df, catalog)
+        total_seconds = time.perf_counter() - start
+
+        return {
+            'motor': engine,
+            'lectura_s': round(read_seconds, 3),
+            'total_s': round(total_seconds, 3),
+            'df_mb': round(df.memory_usage(deep=True).sum() / (1024 * 1024), 1),
+            'rss_pico_mb': get_peak_rss_mb(),
+            'errores': processor.error_count,
+            'advertencias': processor.warning_count
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de los motores de lectura de CSV de SAGE')
+    parser.add_argument('yaml', nargs='?', help='Archivo YAML (si se omite, se usa uno sintético)')
+    parser.add_argument('csv', nargs='?', help='Archivo CSV a validar')
+    parser.add_argument('--catalogo', help='Catálogo del YAML (por defecto, el primero)')
+    parser.add_argument('--filas', type=int, default=1_000_000, help='Filas del archivo sintético')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yaml_path, csv_path = args.yaml, args.csv
+        if not yaml_path or not csv_path:
+            yaml_path = os.path.join(temp_dir, 'benchmark.yaml')
+            csv_path = os.path.join(temp_dir, 'ventas.csv')
+            with open(yaml_path, 'w', encoding='utf-8') as f:
+                f.write(YAML_SINTETICO)
+            print(f"Generando archivo sintético de {args.filas} filas...")
+            generar_csv(csv_path, args.filas)
+
+        catalog_name = args.catalogo
+        if not catalog_name:
+            import yaml
+            with open(yaml_path, encoding='utf-8') as f:
+                catalog_name = next(iter(yaml.safe_load(f)['catalogs']))
+
+        print(f"Archivo: {csv_path} ({os.path.getsize(csv_path) / (1024 * 1024):.1f} MB), catálogo: {catalog_name}\n")
+        context = multiprocessing.get_context('spawn')
+        resultados = []
+        for engine in ('pandas', 'pyarrow'):
+            with context.Pool(1) as pool:
+                resultados.append(pool.apply(ejecutar_motor, (engine, yaml_path, csv_path, catalog_name)))
+
+    columnas = list(resultados[0])
+    print(' | '.join(f'{c:>12}' for c in columnas))
+    for resultado in resultados:
+        print(' | '.join(f'{str(resultado[c]):>12}' for c in columnas))
+
+    if resultados[0]['errores'] != resultados[1]['errores']:
+        print("\n⚠️ Los motores reportaron un número distinto de errores")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+-- Agregar métricas de memoria a la tabla de ejecuciones (ver sección performance.memory de report.json)
+
+-- Pico de memoria residente (RSS) del proceso durante la ejecución
+ALTER TABLE public.ejecuciones_yaml ADD COLUMN IF NOT EXISTS pico_memoria_mb NUMERIC(10,2);
+
+-- Huella de los DataFrames de todos los archivos en cada momento de la validación
+ALTER TABLE public.ejecuciones_yaml ADD COLUMN IF NOT EXISTS memoria_lectura_mb NUMERIC(10,2);
+ALTER TABLE public.ejecuciones_yaml ADD COLUMN IF NOT EXISTS memoria_conversion_mb NUMERIC(10,2);
+ALTER TABLE public.ejecuciones_yaml ADD COLUMN IF NOT EXISTS memoria_validacion_mb NUMERIC(10,2);
+
+-- Tamaño del archivo de datos recibido
+ALTER TABLE public.ejecuciones_yaml ADD COLUMN IF NOT EXISTS tamano_archivo_bytes BIGINT;
+
+-- Comentarios para documentar los nuevos campos
+COMMENT ON COLUMN public.ejecuciones_yaml.pico_memoria_mb IS 'Pico de memoria residente (RSS) del proceso en MB';
+COMMENT ON COLUMN public.ejecuciones_yaml.memoria_lectura_mb IS 'Memoria de los DataFrames después de leer los archivos, en MB (memory_usage deep)';
+COMMENT ON COLUMN public.ejecuciones_yaml.memoria_conversion_mb IS 'Memoria de los DataFrames después de convertir los tipos de datos, en MB';
+COMMENT ON COLUMN public.ejecuciones_yaml.memoria_validacion_mb IS 'Memoria de los DataFrames después de validar, en MB';
+COMMENT ON COLUMN public.ejecuciones_yaml.tamano_archivo_bytes IS 'Tamaño en bytes del archivo de datos procesado';
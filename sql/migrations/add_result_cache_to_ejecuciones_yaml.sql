@@ -0,0 +1,7 @@
+-- Enlazar las ejecuciones que reutilizan el resultado de una ejecución anterior (ver sage/result_cache.py)
+
+-- Ejecución original con el mismo archivo y YAML cuyo resultado se reutilizó (NULL si se validó el archivo)
+ALTER TABLE public.ejecuciones_yaml ADD COLUMN IF NOT EXISTS ejecucion_origen_id INTEGER REFERENCES public.ejecuciones_yaml(id) ON DELETE SET NULL;
+
+-- Comentarios para documentar los nuevos campos
+COMMENT ON COLUMN public.ejecuciones_yaml.ejecucion_origen_id IS 'Ejecución con el mismo archivo y YAML cuyo resultado se reutilizó sin volver a validar';
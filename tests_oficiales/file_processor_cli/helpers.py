@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Utilidades compartidas por las pruebas del procesador de archivos: YAML de
+prueba con catálogos CSV y paquetes ZIP, y un caso base con directorio temporal
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.logger import SageLogger
+from sage.yaml_validator import YAMLValidator
+
+SAGE_YAML = {'name': 'Prueba', 'description': 'Prueba', 'version': '1.0', 'author': 'SAGE'}
+
+
+def rule(name, expression=None, severity='error', **params):
+    """Regla de validación con el nombre como descripción (params agrega o reemplaza claves)"""
+    definition = {'name': name, 'description': name, 'severity': severity}
+    if expression is not None:
+        definition['rule'] = expression
+    definition.update(params)
+    return definition
+
+
+def catalog(name, fields, file_format=None, **options):
+    """
+    Catálogo CSV `<name>.csv` separado por comas y con encabezado
+
+    Args:
+        file_format: Opciones que se agregan o reemplazan en file_format (streaming, header, ...)
+        options: Otras claves del catálogo (row_validation, catalog_validation, unique_keys, ...)
+    """
+    return {
+        'name': name.title(),
+        'description': name.title(),
+        'filename': f'{name}.csv',
+        'file_format': {'type': 'CSV', 'delimiter': ',', 'header': True, **(file_format or {})},
+        'fields': fields,
+        **options
+    }
+
+
+def package(catalogs, rules=None):
+    """Paquete ZIP `paquete` con los catálogos indicados y, si se pasan, sus reglas de paquete"""
+    definition = {'name': 'Paquete', 'description': 'Paquete', 'file_format': {'type': 'ZIP'},
+                  'catalogs': list(catalogs)}
+    if rules is not None:
+        definition['package_validation'] = list(rules)
+    return {'paquete': definition}
+
+
+def sage_yaml(catalogs, packages=None):
+    """YAML de prueba (como diccionario) con los catálogos por nombre y los paquetes"""
+    return {'sage_yaml': dict(SAGE_YAML), 'catalogs': catalogs, 'packages': packages or {}}
+
+
+def load_config(catalogs, packages=None):
+    """Configuración validada por YAMLValidator (ver sage_yaml)"""
+    return YAMLValidator().validate_yaml(sage_yaml(catalogs, packages))
+
+
+class TempDirTestCase(unittest.TestCase):
+    """Caso de prueba con un directorio temporal que se borra al terminar cada prueba"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def temp_path(self, name):
+        return os.path.join(self.temp_dir.name, name)
+
+    def write_file(self, name, content):
+        """Escribe un archivo en el directorio temporal (texto UTF-8 o bytes) y devuelve su ruta"""
+        path = self.temp_path(name)
+        mode, encoding = ('wb', None) if isinstance(content, bytes) else ('w', 'utf-8')
+        with open(path, mode, encoding=encoding) as f:
+            f.write(content)
+        return path
+
+    def new_logger(self, **kwargs):
+        """SageLogger en un subdirectorio nuevo, para que cada ejecución tenga sus propios archivos"""
+        return SageLogger(tempfile.mkdtemp(dir=self.temp_dir.name), **kwargs)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+Pruebas para el motor de lectura y validación basado en PyArrow
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage import arrow_engine, coercion
+from sage.exceptions import YAMLValidationError
+from sage.file_processor import FileProcessor
+from sage.ingest import SAMPLE_SIZE
+
+from helpers import TempDirTestCase, catalog, load_config, rule
+
+
+def build_config(engine=None):
+    """Construye un catálogo con campos de texto, decimal y fecha"""
+    return load_config({'ventas': catalog('ventas', [
+        {'name': 'codigo', 'type': 'texto', 'required': True, 'unique': True},
+        {'name': 'monto', 'type': 'decimal', 'validation_rules': [
+            rule('Monto positivo', "df['monto'] > 0", description='El monto debe ser positivo')
+        ]},
+        {'name': 'fecha', 'type': 'fecha'}
+    ], file_format={'engine': engine} if engine is not None else None)})
+
+
+class TestArrowEngine(TempDirTestCase):
+    """El motor pyarrow entrega los mismos resultados que el de pandas"""
+
+    CONTENT = ('codigo,monto,fecha\n'
+               'A1,10.5,2024-01-31\n'
+               'A2,-3,2024-02-01\n'
+               ',7,2024-02-02\n'
+               'A1,n/d,no es fecha\n'
+               'A3,,2024-02-03\n')
+
+    def setUp(self):
+        super().setUp()
+        self.csv_path = self.temp_path('ventas.csv')
+
+    def run_catalog(self, content, engine=None, global_engine='pandas'):
+        with open(self.csv_path, 'wb') as f:
+            f.write(content)
+        config = build_config(engine)
+        logger = self.new_logger()
+        processor = FileProcessor(config, logger)
+        processor.engine = global_engine
+        catalog = config.catalogs['ventas']
+        df = processor._read_file(self.csv_path, catalog)
+        processor.validate_catalog(df, catalog)
+        events = [(e['severity'], e['message'], e['details'].get('line'))
+                  for e in logger.events if e['severity'] in ('error', 'warning')]
+        return processor, df, events
+
+    def test_same_results_as_pandas(self):
+        """Errores, eventos y valores coinciden; el texto queda en columnas de Arrow"""
+        content = self.CONTENT.encode('utf-8')
+        pandas_processor, pandas_df, pandas_events = self.run_catalog(content)
+        arrow_processor, arrow_df, arrow_events = self.run_catalog(content, engine='pyarrow')
+        self.assertEqual(pandas_processor.error_count, arrow_processor.error_count)
+        self.assertEqual(pandas_events, arrow_events)
+        self.assertTrue(arrow_engine.is_arrow_string(arrow_df['codigo']))
+        self.assertEqual(arrow_processor.coercion_failures['ventas.csv']['monto'].tolist(), [False, False, False, True, False])
+        pd.testing.assert_series_equal(pandas_df['monto'], arrow_df['monto'])
+        pd.testing.assert_series_equal(pandas_df['fecha'], arrow_df['fecha'])
+
+    def test_catalog_engine_overrides_global(self):
+        """El motor del catálogo tiene prioridad sobre el global"""
+        processor, _, _ = self.run_catalog(self.CONTENT.encode('utf-8'), engine='pandas', global_engine='pyarrow')
+        self.assertEqual(processor._engine_for(processor.config.catalogs['ventas']), 'pandas')
+        processor, _, _ = self.run_catalog(self.CONTENT.encode('utf-8'), global_engine='pyarrow')
+        self.assertEqual(processor._engine_for(processor.config.catalogs['ventas']), 'pyarrow')
+
+    def test_empty_text_cells_match_pandas(self):
+        """Las celdas de texto vacías llegan igual a required y a las reglas con ambos motores"""
+        self.write_file('ventas.csv', 'codigo,nombre,monto\nA,,1\n,x,2\nC,NA,3\nD, ,4\n')
+
+        def text_errors(engine):
+            config = load_config({'ventas': catalog('ventas', [
+                {'name': 'codigo', 'type': 'texto', 'required': True},
+                {'name': 'nombre', 'type': 'texto', 'validation_rules': [rule('Largo', "df['nombre'].str.len() > 1")]},
+                {'name': 'monto', 'type': 'decimal'}
+            ], file_format={'engine': engine}, row_validation=[rule('Con nombre', "df['nombre'].notna()")])})
+            logger = self.new_logger()
+            FileProcessor(config, logger).process_file(self.csv_path, 'ventas')
+            return sorted((e['message'], e['details'].get('line'), str(e['details'].get('value')))
+                          for e in logger.events if e['severity'] == 'error')
+
+        # TEXT_NULL es 'None' con pandas 2 (astype(str) de una celda vacía) y un nulo con pandas 3
+        for text_null in (coercion.TEXT_NULL, 'None'):
+            with mock.patch.object(coercion, 'TEXT_NULL', text_null):
+                expected = text_errors('pandas')
+                self.assertTrue(expected)
+                self.assertEqual(text_errors('pyarrow'), expected)
+
+    def test_invalid_utf8_falls_back_to_pandas(self):
+        """Si Arrow no puede decodificar el archivo, se lee con pandas"""
+        rows = ''.join(f'C{i},1,2024-01-01\n' for i in range(SAMPLE_SIZE // 15))
+        content = b'codigo,monto,fecha\n' + rows.encode('utf-8') + 'Ñuñoa,1,2024-01-01\n'.encode('latin1')
+        processor, df, _ = self.run_catalog(content, engine='pyarrow')
+        self.assertEqual(df['codigo'].iloc[-1], 'Ñuñoa')
+        self.assertEqual(processor.error_count, 0)
+
+    def test_to_numeric_matches_pandas(self):
+        """La conversión numérica con kernels de Arrow equivale a pd.to_numeric"""
+        values = ['1', ' 2 ', '-3.5', '1e3', '.5', '+7', 'inf', 'x', '1,5', None]
+        column = pd.Series(values, dtype=arrow_engine.arrow_string_dtype())
+        expected = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce')
+        pd.testing.assert_series_equal(arrow_engine.to_numeric(column), expected, check_dtype=False)
+
+    def test_invalid_engine(self):
+        """Un motor desconocido en el YAML es un error de configuración"""
+        with self.assertRaises(YAMLValidationError):
+            build_config('polars')
+
+
+if __name__ == '__main__':
+    unittest.main()
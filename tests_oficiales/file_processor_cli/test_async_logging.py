@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Pruebas para el registro de eventos en un hilo de fondo (SAGE_LOG_ASYNC)
+"""
+import json
+import os
+import re
+import sys
+import time
+import unittest
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.file_processor import FileProcessor
+from sage.log_writer import BackgroundLogWriter
+
+from helpers import TempDirTestCase, catalog, load_config, rule
+
+TIMESTAMPS = re.compile(r'\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(\.\d+)?|Tiempo transcurrido: .*|Directorio: .*')
+
+
+def build_config():
+    return load_config({'ventas': catalog('ventas', [
+        {'name': 'codigo', 'type': 'texto', 'required': True, 'unique': True},
+        {'name': 'monto', 'type': 'decimal', 'validation_rules': [rule('Positivo', "df['monto'] > 0", 'warning')]}
+    ])})
+
+
+class TestAsyncLogging(TempDirTestCase):
+    """El modo asíncrono escribe los mismos eventos, en el mismo orden, que el síncrono"""
+
+    def setUp(self):
+        super().setUp()
+        self.csv_path = self.temp_path('ventas.csv')
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write('codigo,monto\n' + ''.join(f'{"A" if i % 7 == 0 else i},{i % 5 - 1}\n' for i in range(300)))
+
+    def run_logger(self, async_logging):
+        logger = self.new_logger(async_logging=async_logging)
+        processor = FileProcessor(build_config(), logger)
+        errors, warnings = processor.process_file(self.csv_path, 'ventas')
+        logger.summary(300, errors, warnings)
+        outputs = []
+        for name in ('report.html', 'output.log', 'report.json'):
+            with open(os.path.join(logger.log_dir, name), encoding='utf-8') as f:
+                outputs.append(f.read())
+        report = json.loads(outputs.pop())
+        events = [(e['severity'], e['message'], e['details']) for e in report['events']]
+        return [TIMESTAMPS.sub('', output) for output in outputs], events, logger
+
+    def test_same_output_as_sync(self):
+        sync_outputs, sync_events, _ = self.run_logger(False)
+        async_outputs, async_events, logger = self.run_logger(True)
+        self.assertEqual(async_events, sync_events)
+        self.assertEqual(async_outputs, sync_outputs)
+        self.assertIsNone(logger._background)  # summary() detuvo el hilo
+        self.assertIn('logging_background', logger.stage_timings.as_dict())
+
+    def test_backpressure_keeps_every_event(self):
+        handled = []
+        writer = BackgroundLogWriter(lambda item: (time.sleep(0.001), handled.append(item)), max_pending=5)
+        for i in range(50):
+            writer.put(i)
+            self.assertLessEqual(writer._pending, 5)
+        writer.stop()
+        self.assertEqual(handled, list(range(50)))
+        self.assertGreater(writer.waits, 0)
+
+    def test_handler_error_raised_on_stop(self):
+        def handler(item):
+            if item == 2:
+                raise ValueError('formato')
+
+        writer = BackgroundLogWriter(handler)
+        for i in range(4):
+            writer.put(i)
+        with self.assertRaisesRegex(ValueError, 'formato'):
+            writer.stop()
+        self.assertFalse(writer._thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Pruebas para el registro en bloque de errores de validación
+"""
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.file_processor import FileProcessor
+
+from helpers import TempDirTestCase, catalog, load_config, rule
+
+
+def build_config(severity='error'):
+    """Construye una configuración con un campo único, requerido y con una regla"""
+    return load_config({'ventas': catalog('ventas', [
+        {'name': 'codigo', 'type': 'texto', 'required': True, 'unique': True},
+        {'name': 'monto', 'type': 'decimal', 'validation_rules': [
+            rule('Monto positivo', "df['monto'] > 0", severity, description='El monto debe ser positivo')
+        ]}
+    ], row_validation=[
+        rule('Monto acotado', "df['monto'] < 1000", severity, description='El monto debe ser menor a 1000')
+    ])})
+
+
+class TestBatchEmission(TempDirTestCase):
+    """Pruebas para la emisión vectorizada de errores"""
+
+    def setUp(self):
+        super().setUp()
+        self.logger = self.new_logger()
+
+    def test_log_batch_records_one_event_per_line(self):
+        """log_batch registra un evento por línea con su valor"""
+        count = self.logger.log_batch("Falla", "error", [2, 3, 4], ['a', 'b', 'c'], file='x.csv', rule="df['a'] > 0")
+        self.assertEqual(count, 3)
+        self.assertEqual([e['details']['line'] for e in self.logger.events], [2, 3, 4])
+        self.assertEqual(len(self.logger.validation_failures), 3)
+
+    def test_log_batch_keeps_detail_order(self):
+        """En output.log los detalles salen en el orden de las llamadas fila a fila"""
+        self.logger.log_batch("Falla", "error", [2], ['abc'], file='x.csv', field='monto')
+        self.logger.log_batch("Regla", "error", [3], [-1], file='x.csv', rule="df['monto'] > 0")
+        self.logger.summary(2, 2, 0)
+        with open(self.logger.output_log, encoding='utf-8') as f:
+            keys = [line.split(':')[0].strip() for line in f
+                    if line.startswith(('  file:', '  line:', '  field:', '  value:', '  rule:'))]
+        self.assertEqual(keys, ['file', 'line', 'field', 'value', 'file', 'line', 'value', 'rule'])
+
+    def test_small_file_reports_every_row(self):
+        """En archivos pequeños se registran y cuentan todas las filas"""
+        config = build_config()
+        processor = FileProcessor(config, self.logger)
+        df = pd.DataFrame({'codigo': ['A', 'A', None, 'B'], 'monto': [-1.0, 5.0, 2000.0, -3.0]})
+        processor.validate_catalog(df, config.catalogs['ventas'])
+        # 1 duplicado + 1 requerido + 2 montos negativos + 1 monto fuera de rango
+        self.assertEqual(processor.error_count, 5)
+        lines = sorted(e['details']['line'] for e in self.logger.events if 'line' in e['details'])
+        self.assertEqual(lines, [2, 3, 4, 4, 5])
+
+    def test_large_file_caps_rule_errors(self):
+        """En archivos grandes los errores de regla se cortan en MAX_ERRORS_PER_RULE"""
+        config = build_config()
+        processor = FileProcessor(config, self.logger)
+        rows = 100
+        df = pd.DataFrame({'codigo': [f"C{i}" for i in range(rows)], 'monto': [-1.0] * rows})
+        processor.validate_catalog(df, config.catalogs['ventas'])
+        self.assertEqual(processor.error_count, FileProcessor.MAX_ERRORS_PER_RULE)
+        self.assertIn('Monto positivo', processor.field_rules_skipped['monto'])
+
+    def test_large_file_counts_every_duplicate(self):
+        """Los duplicados se cuentan todos aunque solo se muestren algunos"""
+        config = build_config()
+        processor = FileProcessor(config, self.logger)
+        rows = 100
+        df = pd.DataFrame({'codigo': ['A'] * rows, 'monto': [1.0] * rows})
+        processor.validate_catalog(df, config.catalogs['ventas'])
+        self.assertEqual(processor.error_count, rows - 1)
+        shown = [e for e in self.logger.events if e['message'] == "Field 'codigo' must be unique"]
+        self.assertEqual(len(shown), FileProcessor.MAX_ERRORS_PER_RULE)
+
+    def test_warnings_are_not_capped(self):
+        """Las advertencias se registran todas"""
+        config = build_config(severity='warning')
+        processor = FileProcessor(config, self.logger)
+        rows = 100
+        df = pd.DataFrame({'codigo': [f"C{i}" for i in range(rows)], 'monto': [-1.0] * rows})
+        processor.validate_catalog(df, config.catalogs['ventas'])
+        self.assertEqual(processor.warning_count, rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
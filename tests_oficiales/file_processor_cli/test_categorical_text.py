@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+Pruebas para la compactación a categóricos de los campos texto de baja cardinalidad
+"""
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.categorical import concat_frames
+from sage.file_processor import FileProcessor
+
+from helpers import TempDirTestCase, catalog, load_config, rule
+
+
+def build_config(streaming=False):
+    """Catálogo con un campo de pocos valores (region) y uno con un valor por fila (codigo)"""
+    return load_config({'ventas': catalog('ventas', [
+        {'name': 'codigo', 'type': 'texto', 'unique': True},
+        {'name': 'region', 'type': 'texto', 'validation_rules': [
+            rule('Formato', "df['region'].str.fullmatch('R[0-9]')"),
+            rule('Conocida', "df['region'].isin(['R1', 'R2', 'R3'])"),
+            rule('Orden', "df['region'] < 'R3'"),  # Una categórica no admite <
+            rule('Vacía', "df['region'].fillna('') != 'R2'")
+        ]}
+    ], file_format={'streaming': streaming, 'chunk_size': 1000},
+        row_validation=[rule('Sufijo', "(df['region'] + 'x') != 'R1x'")])})
+
+
+class TestCategoricalText(TempDirTestCase):
+    """Con SAGE_CATEGORICAL_TEXT las reglas reportan lo mismo y el DataFrame validado queda compacto"""
+
+    ROWS = 3000
+
+    def setUp(self):
+        super().setUp()
+        self.csv_path = self.temp_path('ventas.csv')
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write('codigo,region\n')
+            for i in range(self.ROWS):
+                region = '' if i % 97 == 0 else ('X' if i % 211 == 0 else f'R{i % 4}')
+                f.write(f'C{i},{region}\n')
+
+    def run_processor(self, categorical, streaming=False):
+        logger = self.new_logger()
+        processor = FileProcessor(build_config(streaming), logger)
+        processor.categorical_text = categorical
+        processor.process_file(self.csv_path, 'ventas')
+        events = sorted((e['message'], e['details'].get('line')) for e in logger.events if e['severity'] == 'error')
+        return processor, events
+
+    def test_same_failures(self):
+        plain, expected = self.run_processor(False)
+        self.assertTrue(expected)
+        for streaming in (False, True):
+            compact, events = self.run_processor(True, streaming)
+            self.assertEqual(events, expected)
+            df = compact.last_processed_df
+            self.assertIsInstance(df['region'].dtype, pd.CategoricalDtype)
+            self.assertNotIsInstance(df['codigo'].dtype, pd.CategoricalDtype)
+            self.assertEqual(df['region'].astype(str).tolist(), plain.last_processed_df['region'].astype(str).tolist())
+        memory = compact.memory.as_dict()['ventas.csv']
+        self.assertLess(memory['after_conversion']['dataframe_mb'], memory['after_read']['dataframe_mb'])
+
+    def test_concat_unites_categories(self):
+        first = pd.DataFrame({'x': pd.Series(['a', 'b'], dtype='category')})
+        second = pd.DataFrame({'x': pd.Series(['c', None, 'a'], dtype='category')})
+        df = concat_frames([first, second])
+        self.assertEqual(list(df['x'].cat.categories), ['a', 'b', 'c'])
+        self.assertEqual(df['x'].tolist()[:3], ['a', 'b', 'c'])
+        self.assertTrue(pd.isna(df['x'].iloc[3]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Pruebas para la conversión vectorizada de tipos y los errores de tipo por fila
+"""
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage import coercion
+from sage.file_processor import FileProcessor
+
+from helpers import TempDirTestCase, catalog, load_config
+
+
+def build_config(fields):
+    return load_config({'ventas': catalog('ventas', fields)})
+
+
+class TestConverters(unittest.TestCase):
+    """Cada conversión devuelve la columna convertida y las celdas con valor que no se convirtieron"""
+
+    def test_integer(self):
+        converted, failures = coercion.to_integer(pd.Series(['1', '2.5', 'abc', '', None, '-4']))
+        self.assertEqual(failures.tolist(), [False, True, True, False, False, False])
+        self.assertEqual(converted.dtype, 'float64')
+        self.assertEqual(converted.iloc[5], -4)
+        converted, failures = coercion.to_integer(pd.Series(['1', '7']))
+        self.assertEqual((converted.dtype, failures.any()), ('int64', False))
+
+    def test_decimal(self):
+        converted, failures = coercion.to_decimal(pd.Series(['1.5', '1,5', 'x', '']))
+        self.assertEqual(failures.tolist(), [False, True, True, False])
+        self.assertEqual(converted.iloc[0], 1.5)
+
+    def test_boolean(self):
+        converted, failures = coercion.to_boolean(pd.Series(['True', 'false', '1', '0', 'yes', None]))
+        self.assertEqual(failures.tolist(), [False, False, False, False, True, False])
+        self.assertEqual(converted.tolist()[:4], [True, False, True, False])
+        self.assertTrue(pd.isna(converted.iloc[4]))
+
+    def test_date_format_inferred_once(self):
+        formats = coercion.DateFormatCache()
+        coercion.to_date(pd.Series(['', '31/01/2024']), formats, 'fecha')
+        # '01/02/2024' se lee con el formato del primer valor (día/mes), no como mes/día
+        converted, failures = coercion.to_date(pd.Series(['01/02/2024', '2024-02-01']), formats, 'fecha')
+        self.assertEqual(formats.as_dict(), {'fecha': '%d/%m/%Y'})
+        self.assertEqual(converted.iloc[0], pd.Timestamp('2024-02-01'))
+        self.assertEqual(failures.tolist(), [False, True])
+
+
+class TestTypeErrors(TempDirTestCase):
+    """Los valores que no son del tipo del campo se reportan por fila sin abortar el archivo"""
+
+    def setUp(self):
+        super().setUp()
+        self.csv_path = self.write_file('ventas.csv', 'codigo,cantidad,fecha\nA,1,2024-01-31\nB,abc,\nC,,2024-02-30\nD,4,2024-03-01\n')
+
+    def test_type_errors_per_row(self):
+        logger = self.new_logger()
+        processor = FileProcessor(build_config([
+            {'name': 'codigo', 'type': 'texto'},
+            {'name': 'cantidad', 'type': 'entero', 'required': True},
+            {'name': 'fecha', 'type': 'fecha'}
+        ]), logger)
+        errors, _ = processor.process_file(self.csv_path, 'ventas')
+        events = sorted((e['message'], e['details'].get('line')) for e in logger.events if e['severity'] == 'error')
+        self.assertEqual(events, [
+            ("Error de tipo de dato: el valor '2024-02-30' no es del tipo fecha", 4),
+            ("Error de tipo de dato: el valor 'abc' no es del tipo entero", 3),
+            ("Required field 'cantidad' is missing", 4)  # 'abc' no se reporta también como faltante
+        ])
+        self.assertEqual(errors, 3)
+
+    def test_type_errors_stay_with_their_catalog(self):
+        """Un campo con errores de tipo en un catálogo no oculta los faltantes de otro"""
+        config = load_config({
+            'ventas': catalog('ventas', [{'name': 'cantidad', 'type': 'entero', 'required': True}]),
+            'stock': catalog('stock', [{'name': 'cantidad', 'type': 'entero', 'required': True}])
+        })
+        logger = self.new_logger()
+        processor = FileProcessor(config, logger)
+        processor._validate_data_types(pd.DataFrame({'cantidad': ['1', 'abc', '3']}), config.catalogs['ventas'])
+        processor.validate_catalog(pd.DataFrame({'cantidad': [1, None, 3]}), config.catalogs['stock'])
+        missing = [e['details'] for e in logger.events if e['message'] == "Required field 'cantidad' is missing"]
+        self.assertEqual([(e['file'], e['line']) for e in missing], [('stock.csv', 3)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Pruebas para los niveles de consola y el modo headless de SageLogger
+"""
+import io
+import os
+import subprocess
+import sys
+import unittest
+from contextlib import redirect_stdout
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, ROOT)
+
+from sage.logger import SageLogger
+
+from helpers import TempDirTestCase
+
+
+class TestConsoleLevels(TempDirTestCase):
+    """Cada nivel imprime solo sus eventos; los archivos de salida no cambian"""
+
+    def console_output(self, level):
+        logger = self.new_logger(console=level, headless=True)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            logger.message("Procesando catálogo")
+            logger.warning("Valor sospechoso", line=3)
+            logger.summary(10, 0, 1)
+        with open(logger.output_log, encoding='utf-8') as f:
+            self.assertIn('Procesando catálogo', f.read())
+        return output.getvalue()
+
+    def test_levels(self):
+        self.assertEqual(self.console_output('off'), '')
+        summary = self.console_output('summary')
+        self.assertIn('Resumen Final', summary)
+        self.assertNotIn('Valor sospechoso', summary)
+        warnings = self.console_output('warnings')
+        self.assertIn('Valor sospechoso', warnings)
+        self.assertNotIn('Procesando catálogo', warnings)
+        self.assertIn('Procesando catálogo', self.console_output('all'))
+        with self.assertRaises(ValueError):
+            SageLogger(self.temp_dir.name, console='todo')
+
+    def test_headless_does_not_import_rich(self):
+        code = ("import sys, tempfile\n"
+                "from sage.main import process_files\n"
+                "from sage.logger import SageLogger\n"
+                "logger = SageLogger(tempfile.mkdtemp(), headless=True)\n"
+                "logger.error('x')\n"
+                "logger.summary(1, 1, 0)\n"
+                "print('rich' in sys.modules)")
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Pruebas para los grupos de errores por (catálogo, campo, regla)
+"""
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.error_groups import ErrorGroups
+from sage.file_processor import FileProcessor
+
+from helpers import TempDirTestCase, catalog, load_config, rule
+
+
+def build_config():
+    return load_config({'ventas': catalog('ventas', [
+        {'name': 'codigo', 'type': 'texto', 'required': True},
+        {'name': 'monto', 'type': 'decimal', 'validation_rules': [
+            rule('Positivo', "df['monto'] > 0", description='Monto positivo')
+        ]}
+    ])})
+
+
+class TestErrorGroups(TempDirTestCase):
+    """Cada grupo cuenta todas las filas y toma ejemplos de todo el archivo"""
+
+    def setUp(self):
+        super().setUp()
+        self.csv_path = self.write_file(
+            'ventas.csv', 'codigo,monto\n' + ''.join(f'V{i},{-(i % 7) if i % 2 else i}\n' for i in range(2000)))
+
+    def test_groups_cover_whole_file(self):
+        logger = self.new_logger(console='off')
+        processor = FileProcessor(build_config(), logger)
+        processor.process_file(self.csv_path, 'ventas')
+        group = processor.error_groups.as_list()[0]
+        self.assertEqual((group['field'], group['rule']), ('monto', 'Positivo'))
+        self.assertEqual(group['count'], 1001)  # Las filas impares y la primera (monto 0)
+        self.assertEqual((group['distinct_values'], group['distinct_exact']), (7, True))
+        lines = [example['line'] for example in group['examples']]
+        self.assertEqual(len(lines), ErrorGroups.SAMPLE_SIZE)
+        self.assertGreater(max(lines), 1000)  # No solo las primeras MAX_ERRORS_PER_RULE
+
+        # Sin el detalle fila a fila, report.json solo enlaza los archivos JSONL
+        with mock.patch.dict(os.environ, {'SAGE_REPORT_ROW_DETAIL': '0'}):
+            logger = self.new_logger(console='off')
+        logger.warning("Valor sospechoso", file='ventas.csv', field='monto', rule='Positivo', line=3)
+        logger.register_error_groups(processor.error_groups.as_list())
+        logger.summary(2000, 1001, 1)
+        with open(logger.report_json, encoding='utf-8') as f:
+            report = json.load(f)
+        self.assertEqual(report['validation']['groups'][0]['count'], 1001)
+        self.assertNotIn('failures', report['validation'])
+        with open(os.path.join(logger.log_dir, report['validation']['failures_file']), encoding='utf-8') as f:
+            self.assertEqual(json.loads(f.readline())['message'], 'Valor sospechoso')
+
+    def test_merge_matches_single_process(self):
+        merged, first, second = ErrorGroups(sketch_size=256), ErrorGroups(sketch_size=256), ErrorGroups(sketch_size=256)
+        values = np.arange(10_000) % 2000
+        first.add('v.csv', 'monto', 'Positivo', 'error', 'Monto positivo', np.arange(4000) + 2, values[:4000])
+        second.add('v.csv', 'monto', 'Positivo', 'error', 'Monto positivo', np.arange(4000, 10_000) + 2, values[4000:])
+        merged.merge(first.export())
+        merged.merge(second.export())
+        group = merged.as_list()[0]
+        self.assertEqual((group['count'], group['first_line'], group['last_line']), (10_000, 2, 10_001))
+        self.assertFalse(group['distinct_exact'])
+        self.assertLess(abs(group['distinct_values'] - 2000), 300)
+        self.assertEqual(len(group['examples']), ErrorGroups.SAMPLE_SIZE)
+
+    def test_partial_count_survives_merge(self):
+        child, merged = ErrorGroups(), ErrorGroups()
+        child.add('v.csv', 'monto', 'Positivo', 'error', 'Monto positivo', np.arange(5) + 2)
+        child.mark_partial('v.csv', 'monto', 'Positivo')
+        merged.add('v.csv', 'monto', 'Positivo', 'error', 'Monto positivo', np.arange(5, 8) + 2)
+        merged.merge(child.export())
+        group = merged.as_list()[0]
+        self.assertEqual((group['count'], group['count_exact']), (8, False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Pruebas para el contexto de evaluación compartido por las reglas de un campo
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.evaluation import EvaluationContext
+from sage.file_processor import FileProcessor
+
+from helpers import TempDirTestCase, catalog, load_config, rule
+
+
+def build_config():
+    """Catálogo con tres reglas sobre un campo opcional y dos sobre uno sin vacíos"""
+    return load_config({'ventas': catalog('ventas', [
+        {'name': 'codigo', 'type': 'texto', 'validation_rules': [
+            rule('Prefijo', "df['codigo'].str.startswith('V')"),
+            rule('Largo', "df['codigo'].str.len() == 3")
+        ]},
+        {'name': 'monto', 'type': 'decimal', 'validation_rules': [
+            rule('Positivo', "df['monto'] > 0"),
+            rule('Máximo', "df['monto'] < 100"),
+            rule('Mayor que descuento', "df['monto'] > df['descuento']")
+        ]},
+        {'name': 'descuento', 'type': 'decimal'}
+    ])})
+
+
+class TestEvaluationContext(TempDirTestCase):
+    """Las reglas de un campo comparten máscara y vista filtrada, sin copiar el DataFrame por regla"""
+
+    def setUp(self):
+        super().setUp()
+        self.df = pd.DataFrame({
+            'codigo': ['V01', 'V02', 'X03', 'V4'],
+            'monto': [10.0, np.nan, -5.0, 150.0],
+            'descuento': [1.0, 2.0, 3.0, 200.0]
+        })
+
+    def test_views_are_shared(self):
+        config = build_config()
+        logger = self.new_logger()
+        processor = FileProcessor(config, logger)
+        with mock.patch.object(pd.DataFrame, 'dropna', side_effect=AssertionError('dropna')):
+            processor.validate_catalog(self.df, config.catalogs['ventas'])
+
+        stats = processor.allocation_stats
+        self.assertEqual(stats.rule_evaluations, 5)
+        self.assertEqual(stats.views_shared, 1)   # codigo no tiene vacíos
+        self.assertEqual(stats.views_copied, 1)   # una sola copia para las tres reglas de monto
+        self.assertEqual(stats.views_reused, 3)
+
+        failures = sorted((e['message'], e['details']['line']) for e in logger.events if e['severity'] == 'error')
+        self.assertEqual(failures, [
+            ('Field validation failed: Largo', 5),
+            ('Field validation failed: Mayor que descuento', 4),
+            ('Field validation failed: Mayor que descuento', 5),
+            ('Field validation failed: Máximo', 5),
+            ('Field validation failed: Positivo', 4),
+            ('Field validation failed: Prefijo', 4)
+        ])
+
+    def test_filtered_view(self):
+        """La vista equivale a dropna y solo copia las columnas pedidas"""
+        context = EvaluationContext(self.df)
+        view = context.filtered('monto', ['descuento'])
+        pd.testing.assert_frame_equal(view, self.df.dropna(subset=['monto'])[['monto', 'descuento']])
+        view['descuento'] = 0  # Una regla que modifica la vista reutilizada
+        view['extra'] = 1
+        reused = context.filtered('monto', ['descuento'])
+        self.assertEqual(context.stats.views_reused, 1)
+        pd.testing.assert_frame_equal(reused, self.df.dropna(subset=['monto'])[['monto', 'descuento']])
+        self.assertEqual(list(context.filtered('monto', []).columns), ['monto'])
+        shared = context.filtered('codigo')
+        pd.testing.assert_frame_equal(shared, self.df)
+        shared['codigo'] = shared['codigo'].str.lower()  # Una regla que modifica su vista
+        shared['extra'] = 1
+        self.assertEqual(self.df['codigo'].tolist(), ['V01', 'V02', 'X03', 'V4'])
+        self.assertNotIn('extra', self.df.columns)
+        context.release()
+        self.assertIsNone(context.df)
+
+
+if __name__ == '__main__':
+    unittest.main()
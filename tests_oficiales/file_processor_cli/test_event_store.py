@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Pruebas para el almacén de eventos de SageLogger (events.jsonl)
+"""
+import json
+import os
+import sys
+import unittest
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import numpy as np
+
+from sage.event_store import EventStore
+
+from helpers import TempDirTestCase
+
+
+class TestEventStore(TempDirTestCase):
+    """Los eventos volcados a disco se leen igual y los reportes no cambian"""
+
+    def test_spill_keeps_order(self):
+        path = self.temp_path('events.jsonl')
+        store = EventStore(path, window=4)
+        store.extend({'n': i} for i in range(10))
+        self.assertEqual(len(store), 10)
+        self.assertEqual(len(store._memory), 2)
+        self.assertEqual([e['n'] for e in store], list(range(10)))
+
+        store.rebuild([{'n': -1}], store)
+        self.assertEqual([e['n'] for e in store], [-1] + list(range(10)))
+        store.close()
+        copy = self.temp_path('copy.jsonl')
+        store.write_jsonl(copy)
+        self.assertEqual(list(EventStore.from_file(copy)), list(store))
+
+    def run_logger(self, window):
+        logger = self.new_logger()
+        logger.events.window = logger.validation_failures.window = window
+        for i in range(30):
+            logger.error(f"Valor inválido {i}", file='ventas.csv', line=i + 2, field='monto',
+                         rule='Positivo', value=np.float64(-i))
+            logger.message(f"Bloque {i}")
+        logger.summary(30, 30, 0)
+        with open(logger.report_json, encoding='utf-8') as f:
+            text = f.read()
+        report = json.loads(text)
+        # Mismo texto que escribiría json.dump con todo el reporte en memoria
+        self.assertEqual(text, json.dumps(report, ensure_ascii=False, indent=2))
+        del report['execution_info'], report['performance']
+        for event in report['events'] + report['validation']['failures']:
+            event['timestamp'] = None
+        with open(os.path.join(logger.log_dir, 'email_report.html'), encoding='utf-8') as f:
+            email = f.read()
+        return report, email
+
+    def test_reports_same_with_spilled_events(self):
+        memory_report, _ = self.run_logger(10_000)
+        spilled_report, email = self.run_logger(3)
+        self.assertEqual(spilled_report, memory_report)
+        self.assertEqual(len(spilled_report['validation']['failures']), 30)
+        self.assertIn('Valor inválido 19', email)
+        self.assertNotIn('Valor inválido 20', email)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Pruebas para la validación incremental de archivos acumulativos
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.file_processor import FileProcessor
+from sage.incremental import PrefixState, scan_prefix
+
+from helpers import TempDirTestCase, catalog, load_config, rule
+
+
+def build_config():
+    """Catálogo acumulativo con campo único, regla de campo, de fila y de catálogo"""
+    return load_config({'ventas': catalog('ventas', [
+        {'name': 'codigo', 'type': 'texto', 'unique': True},
+        {'name': 'fecha', 'type': 'fecha'},
+        {'name': 'monto', 'type': 'decimal', 'validation_rules': [rule('Positivo', "df['monto'] > 0")]}
+    ], file_format={'incremental': True},
+        row_validation=[rule('Acotado', "df['monto'] < 900")],
+        catalog_validation=[rule('Total', "bool(df['monto'].sum() < 10)")])})
+
+
+def rows(start, stop):
+    lines = []
+    for i in range(start, stop):
+        codigo = 'C5' if i == 3500 else f'C{i}'  # Repite una clave de las filas anteriores
+        monto = -1 if i in (7, 3200) else (950 if i == 3300 else i % 100 + 1)
+        # Las filas nuevas empiezan con fechas ambiguas: se leen con el formato (día/mes) del envío anterior
+        day = 13 + i % 15 if i < 3000 else 1 + i % 28
+        lines.append(f'{codigo},{day:02d}/03/2024,{monto}\n')
+    return ''.join(lines)
+
+
+class TestIncrementalValidation(TempDirTestCase):
+    """Validar solo las filas agregadas reporta lo mismo que validar el archivo completo"""
+
+    def setUp(self):
+        super().setUp()
+        self.csv_path = self.temp_path('ventas.csv')
+        env = mock.patch.dict(os.environ, {'SAGE_INCREMENTAL_DIR': self.temp_path('estado')})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def write(self, content):
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write('codigo,fecha,monto\n' + content)
+
+    def run_processor(self, emisor_id=7):
+        logger = self.new_logger(emisor_id=emisor_id)
+        processor = FileProcessor(build_config(), logger)
+        processor.streaming_chunk_size = 1000
+        processor.process_file(self.csv_path, 'ventas')
+        events = sorted((e['message'], e['details'].get('line'), str(e['details'].get('first_line')))
+                        for e in logger.events if e['severity'] == 'error')
+        return processor, logger, events
+
+    def test_only_new_rows_are_validated(self):
+        self.write(rows(0, 3000))
+        _, logger, _ = self.run_processor()
+        self.assertEqual(logger.file_stats['ventas.csv']['incremental'], {'validated_rows': 3000, 'reused_rows': 0})
+
+        self.write(rows(0, 4000))
+        processor, logger, events = self.run_processor()
+        self.assertEqual(logger.file_stats['ventas.csv']['incremental'], {'validated_rows': 1000, 'reused_rows': 3000})
+        # Sin estado previo (otro emisor) se valida el archivo completo
+        full, full_logger, full_events = self.run_processor(emisor_id=8)
+        self.assertEqual(full_logger.file_stats['ventas.csv']['incremental']['validated_rows'], 4000)
+
+        self.assertEqual(processor.error_count, full.error_count)
+        self.assertEqual(logger.file_stats['ventas.csv']['records'], 4000)
+        new_events = [e for e in full_events if e[1] is None or e[1] > 3001]
+        self.assertEqual(events, new_events)
+        self.assertIn(("Field 'codigo' must be unique", 3502, '7'), events)
+        self.assertEqual(len(processor.last_processed_df), 4000)
+
+        # Una fila anterior cambió: se valida todo de nuevo
+        self.write(rows(0, 4000).replace('C10,', 'X10,', 1))
+        _, logger, _ = self.run_processor()
+        self.assertEqual(logger.file_stats['ventas.csv']['incremental']['validated_rows'], 4000)
+
+    def test_prefix_without_final_newline(self):
+        self.write('A,01/03/2024,1')
+        matches, size, digest = scan_prefix(self.csv_path, None)
+        previous = PrefixState(rows=1, bytes=size, sha256=digest, yaml_hash='')
+        self.write('A,01/03/2024,10\n')  # La última fila validada cambió
+        self.assertFalse(scan_prefix(self.csv_path, previous)[0])
+        self.write('A,01/03/2024,1\nB,02/03/2024,2\n')
+        self.assertTrue(scan_prefix(self.csv_path, previous)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
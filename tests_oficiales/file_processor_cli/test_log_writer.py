@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Pruebas para la escritura con búfer de report.html y output.log
+"""
+import os
+import sys
+import unittest
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.log_writer import BufferedLogWriter
+
+from helpers import TempDirTestCase
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+class TestBufferedLogWriter(TempDirTestCase):
+    """Los bloques llegan al disco al llenar el búfer, al cerrar y, ya cerrado, de inmediato"""
+
+    def setUp(self):
+        super().setUp()
+        self.path = self.temp_path('output.log')
+
+    def test_flush_by_size_and_close(self):
+        writer = BufferedLogWriter(self.path, flush_bytes=10, flush_seconds=3600)
+        writer.write('abc')
+        self.assertEqual(read(self.path), '')
+        writer.write('defghijk')
+        self.assertEqual(read(self.path), 'abcdefghijk')
+        writer.write('l')
+        writer.close()
+        writer.close()
+        self.assertEqual(read(self.path), 'abcdefghijkl')
+        writer.write('m')  # Después de cerrar se agrega directamente
+        self.assertEqual(read(self.path), 'abcdefghijklm')
+
+    def test_logger_outputs_written_on_summary(self):
+        logger = self.new_logger()
+        logger.warning("Valor fuera de rango", file='ventas.csv', line=2, value=5)
+        logger.summary(10, 0, 1)
+        html, text = read(logger.report_html), read(logger.output_log)
+        self.assertTrue(html.endswith('</html>'))
+        self.assertIn('Valor fuera de rango', html)
+        self.assertIn('[WARNING] Valor fuera de rango\n  file: ventas.csv\n  line: 2\n  value: 5\n\n', text)
+        self.assertIn('=== SAGE Log Fin', text)
+
+        logger.message("Materializaciones procesadas")  # Eventos posteriores al resumen
+        self.assertIn('Materializaciones procesadas', read(logger.output_log))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""
+Pruebas para las reglas de paquete escritas en SQL (DuckDB)
+"""
+import os
+import sys
+import unittest
+import zipfile
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.exceptions import YAMLValidationError
+from sage.file_processor import FileProcessor
+
+from helpers import TempDirTestCase, catalog, load_config, package
+
+
+def build_config(package_rules, catalog_rules=()):
+    """Paquete ZIP con ventas, clientes y productos (que ninguna regla lee)"""
+    fields = {
+        'ventas': [{'name': 'codigo', 'type': 'texto'}, {'name': 'cliente', 'type': 'texto'},
+                   {'name': 'monto', 'type': 'decimal'}],
+        'clientes': [{'name': 'codigo', 'type': 'texto'}, {'name': 'nombre', 'type': 'texto'}],
+        'productos': [{'name': 'codigo', 'type': 'texto'}]
+    }
+    catalogs = {name: catalog(name, catalog_fields, catalog_validation=list(catalog_rules))
+                for name, catalog_fields in fields.items()}
+    return load_config(catalogs, package(fields, package_rules))
+
+
+class TestPackageSQL(TempDirTestCase):
+    """Las consultas devuelven las claves que no cumplen y se reportan como las reglas con expresión"""
+
+    def setUp(self):
+        super().setUp()
+        self.zip_path = self.temp_path('paquete.zip')
+        with zipfile.ZipFile(self.zip_path, 'w') as zf:
+            zf.writestr('ventas.csv', 'codigo,cliente,monto\nV1,C1,100\nV2,C2,5\nV3,C9,7\nV4,C1,50\n')
+            zf.writestr('clientes.csv', 'codigo,nombre\nC1,Ana\nC2,Luis\n')
+            zf.writestr('productos.csv', 'codigo\nP1\n')
+
+    def test_sql_rules(self):
+        config = build_config([
+            {'name': 'Cliente existe', 'description': 'Cliente existe', 'severity': 'error',
+             'sql': 'SELECT v.cliente FROM ventas v ANTI JOIN clientes c ON v.cliente = c.codigo'},
+            {'name': 'Tope', 'description': 'Tope por cliente', 'severity': 'warning',
+             'sql': 'SELECT cliente, SUM(monto) FROM ventas GROUP BY cliente HAVING SUM(monto) > 100'},
+            {'name': 'Sin vacíos', 'description': 'Sin vacíos', 'severity': 'error',
+             'sql': 'SELECT codigo FROM clientes WHERE nombre IS NULL'}
+        ])
+        rule = config.packages['paquete'].package_validation[0]
+        self.assertEqual(rule.catalog_columns, {'ventas': None, 'clientes': None})
+
+        logger = self.new_logger()
+        processor = FileProcessor(config, logger)
+        processor.retain_dataframes = False  # Sin materializaciones: solo lo que leen las reglas
+        errors, warnings = processor.process_zip_file(self.zip_path, 'paquete')
+        self.assertEqual((errors, warnings), (1, 1))
+        self.assertNotIn('productos', processor.dataframes)  # Ninguna consulta lo lee
+
+        events = {e['message']: e['details'] for e in logger.events if e['severity'] in ('error', 'warning')}
+        self.assertEqual(events['Package validation failed: Cliente existe']['values'], ['C9'])
+        self.assertEqual(events['Package validation warning: Tope por cliente']['values'], [['C1', 150.0]])
+        timings = {t['rule']: t for t in processor.rule_timings.as_list()}
+        self.assertEqual((timings['Cliente existe']['engine'], timings['Cliente existe']['failures']), ('duckdb', 1))
+
+    def test_invalid_sql_rules(self):
+        with self.assertRaisesRegex(YAMLValidationError, 'no es una consulta SQL válida'):
+            build_config([{'name': 'R', 'description': 'R', 'sql': 'SELEC codigo FROM ventas'}])
+        with self.assertRaisesRegex(YAMLValidationError, 'no es una consulta SQL válida'):
+            build_config([{'name': 'R', 'description': 'R', 'sql': 'DELETE FROM ventas'}])
+        with self.assertRaisesRegex(YAMLValidationError, 'solo las reglas de paquete'):
+            build_config([], [{'name': 'R', 'description': 'R', 'sql': 'SELECT 1'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
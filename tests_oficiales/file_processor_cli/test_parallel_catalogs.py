@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Pruebas para el procesamiento en paralelo de los catálogos de un paquete ZIP
+"""
+import os
+import pickle
+import sys
+import unittest
+import zipfile
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.file_processor import FileProcessor
+
+from helpers import TempDirTestCase, catalog, load_config, package, rule
+
+CATALOGS = ['ventas', 'clientes', 'productos']
+
+
+def build_config():
+    """Construye un paquete ZIP con tres catálogos iguales y una regla de paquete"""
+    fields = [
+        {'name': 'codigo', 'type': 'texto', 'required': True, 'unique': True},
+        {'name': 'monto', 'type': 'decimal', 'validation_rules': [
+            rule('Monto positivo', "df['monto'] > 0", description='El monto debe ser positivo')
+        ]}
+    ]
+    return load_config({name: catalog(name, fields) for name in CATALOGS}, package(CATALOGS, [
+        rule('Ventas con cliente', "df['ventas']['codigo'].isin(df['clientes']['codigo'])", 'warning',
+             description='Cada venta debe tener un cliente')
+    ]))
+
+
+class TestParallelCatalogs(TempDirTestCase):
+    """Los resultados en paralelo deben coincidir con los secuenciales"""
+
+    def setUp(self):
+        super().setUp()
+        self.zip_path = self.temp_path('paquete.zip')
+        with zipfile.ZipFile(self.zip_path, 'w') as zf:
+            for offset, name in enumerate(CATALOGS):
+                rows = ['codigo,monto']
+                for i in range(60 + offset * 20):
+                    codigo = 'DUP' if i % 25 == 0 else f'C{i + offset}'
+                    rows.append(f"{codigo},{-1 if i % (7 + offset) == 0 else i}")
+                zf.writestr(f'{name}.csv', '\n'.join(rows) + '\n')
+
+    def run_processor(self, workers):
+        logger = self.new_logger()
+        processor = FileProcessor(build_config(), logger)
+        processor.parallel_workers = workers
+        processor.process_zip_file(self.zip_path, 'paquete')
+        events = [(e['severity'], e['message'], e['details'].get('file'), e['details'].get('line'))
+                  for e in logger.events if e['severity'] in ('error', 'warning')]
+        return processor, logger, events
+
+    def test_parallel_matches_sequential(self):
+        """Conteos, eventos (en el mismo orden) y estadísticas coinciden"""
+        sequential, seq_logger, seq_events = self.run_processor(0)
+        parallel, par_logger, par_events = self.run_processor(2)
+        self.assertEqual(sequential.error_count, parallel.error_count)
+        self.assertEqual(sequential.warning_count, parallel.warning_count)
+        self.assertEqual(seq_events, par_events)
+        self.assertEqual(seq_logger.file_stats, par_logger.file_stats)
+        self.assertEqual(set(parallel.dataframes), set(CATALOGS))
+
+    def test_rules_survive_pickle(self):
+        """Las reglas compiladas se pueden enviar a otro proceso"""
+        config = pickle.loads(pickle.dumps(build_config()))
+        rule = config.catalogs['ventas'].fields[1].validation_rules[0]
+        self.assertIsNone(rule.code)
+        self.assertEqual(rule.rule, "df['monto'] > 0")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Pruebas para la validación en paralelo de un CSV grande dividido en rangos de bytes
+"""
+import os
+import sys
+import unittest
+
+import pandas as pd
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.byte_ranges import split_csv
+from sage.file_processor import FileProcessor
+
+from helpers import TempDirTestCase, catalog, load_config, rule
+
+
+def build_config():
+    """Catálogo con requerido, único, reglas de campo y fila, clave compuesta y regla de catálogo"""
+    return load_config({'ventas': catalog('ventas', [
+        {'name': 'codigo', 'type': 'texto', 'required': True, 'unique': True},
+        {'name': 'nota', 'type': 'texto'},
+        {'name': 'monto', 'type': 'decimal', 'validation_rules': [
+            rule('Monto positivo', "df['monto'] > 0", 'warning', description='El monto debe ser positivo')
+        ]}
+    ], unique_keys=[['nota', 'monto']],
+        row_validation=[rule('Monto acotado', "df['monto'] < 90", description='El monto debe ser menor a 90')],
+        catalog_validation=[rule('Total', "bool(df['monto'].sum() < 10)", 'warning',
+                                 description='El total no debe superar el límite')])})
+
+
+class TestParallelRanges(TempDirTestCase):
+    """Validar por rangos en varios procesos da el mismo resultado que en un solo proceso"""
+
+    ROWS = 5000
+
+    def setUp(self):
+        super().setUp()
+        self.csv_path = self.temp_path('ventas.csv')
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write('codigo,nota,monto\n')
+            for i in range(self.ROWS):
+                codigo = 'DUP' if i % 1200 == 0 else ('' if i % 1300 == 1 else f'C{i}')
+                # Saltos de línea y comillas dentro de campos entre comillas
+                nota = f'"línea {i % 7}\n""{i % 3}"""' if i % 5 == 0 else f'n{i % 11}'
+                monto = -1 if i % 250 == 0 else i % 100
+                f.write(f'{codigo},{nota},{monto}\n')
+                if i % 900 == 0:
+                    f.write('\n')  # Las líneas vacías no cuentan como filas
+
+    def run_processor(self, workers):
+        logger = self.new_logger()
+        processor = FileProcessor(build_config(), logger)
+        processor.parallel_csv_workers = workers
+        processor.parallel_csv_min_mb = 0
+        processor.streaming_chunk_size = 1000
+        processor.process_file(self.csv_path, 'ventas')
+        events = sorted(
+            (event['severity'], event['message'], event['details'].get('line'), str(event['details'].get('value')))
+            for event in logger.events if event['severity'] in ('error', 'warning')
+        )
+        return processor, logger, events
+
+    def test_ranges_split_on_row_boundaries(self):
+        ranges = split_csv(self.csv_path, 4, header=True)
+        self.assertEqual(len(ranges), 4)
+        self.assertEqual(sum(r.rows for r in ranges), self.ROWS)
+        for byte_range in ranges[1:]:
+            with byte_range.open() as f:
+                first = pd.read_csv(f, header=None, nrows=1).iloc[0, 0]
+            self.assertTrue(first == 'DUP' or str(first).startswith('C'), first)
+            self.assertEqual(first, pd.read_csv(self.csv_path).iloc[byte_range.first_row, 0])
+
+    def test_same_results_as_single_process(self):
+        serial, serial_logger, serial_events = self.run_processor(1)
+        parallel, parallel_logger, parallel_events = self.run_processor(3)
+        self.assertIn('Validación en paralelo de ventas.csv: 5000 registros en 3 rangos',
+                      ' '.join(e['message'] for e in parallel_logger.events))
+        self.assertEqual(parallel.error_count, serial.error_count)
+        self.assertEqual(parallel.warning_count, serial.warning_count)
+        self.assertEqual(parallel_events, serial_events)
+        self.assertEqual(parallel_logger.file_stats, {
+            name: {**stats, 'peak_rss_mb': parallel_logger.file_stats[name]['peak_rss_mb']}
+            for name, stats in serial_logger.file_stats.items()
+        })
+        self.assertEqual(parallel.row_rules_skipped, serial.row_rules_skipped)
+        # 'DUP' se repite en rangos distintos: cada repetición apunta a la primera línea
+        duplicates = [event['details'] for event in parallel_logger.events
+                      if event['message'] == "Field 'codigo' must be unique" and event['details']['value'] == 'DUP']
+        self.assertEqual([details['first_line'] for details in duplicates], [2, 2, 2, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Pruebas para los tiempos por etapa y por regla y la memoria del reporte de rendimiento
+"""
+import json
+import os
+import sys
+import time
+import unittest
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.file_processor import FileProcessor
+from sage.main import memory_report
+from sage.profiling import MemoryProfile, StageTimings
+
+from helpers import TempDirTestCase, catalog, load_config, rule
+
+
+def build_config():
+    """Catálogo con una regla de campo, una de fila y una de catálogo"""
+    return load_config({'ventas': catalog('ventas', [
+        {'name': 'codigo', 'type': 'texto', 'required': True},
+        {'name': 'monto', 'type': 'decimal', 'validation_rules': [rule('Positivo', "df['monto'] > 0")]}
+    ], row_validation=[rule('Acotado', "df['monto'] < 50")],
+        catalog_validation=[rule('Total', "bool(df['monto'].sum() < 10)")])})
+
+
+class TestStageTimings(unittest.TestCase):
+    """Una etapa anidada descuenta su tiempo de la etapa que la contiene"""
+
+    def test_nested_stages_are_exclusive(self):
+        timings = StageTimings()
+        with timings.measure('field_rules'):
+            time.sleep(0.02)
+            with timings.measure('logging'):
+                time.sleep(0.03)
+        stages = timings.as_dict()
+        self.assertEqual(list(stages), ['field_rules', 'logging'])
+        self.assertLess(stages['field_rules']['seconds'], 0.03)
+        self.assertGreaterEqual(stages['logging']['seconds'], 0.03)
+
+        timings.merge({'logging': {'seconds': 1.0, 'calls': 2}})
+        self.assertEqual(timings.as_dict()['logging']['calls'], 3)
+
+
+class TestMemoryProfile(unittest.TestCase):
+    """Por archivo y momento se guarda el bloque más grande, también al combinar procesos"""
+
+    def test_keeps_largest_block(self):
+        import pandas as pd
+        small, large = pd.DataFrame({'x': range(10)}), pd.DataFrame({'x': range(100000)})
+        memory = MemoryProfile()
+        memory.record('a.csv', 'after_read', large)
+        memory.record('a.csv', 'after_read', small)
+        other = MemoryProfile()
+        other.record('a.csv', 'after_validation', small)
+        other.record('b.csv', 'after_read', small)
+        memory.merge(other.as_dict())
+
+        files = memory.as_dict()
+        self.assertEqual(list(files['a.csv']), ['after_read', 'after_validation'])
+        self.assertAlmostEqual(files['a.csv']['after_read']['dataframe_mb'], 0.76, places=2)
+        self.assertEqual(memory.totals()['after_read'],
+                         round(files['a.csv']['after_read']['dataframe_mb'] + files['b.csv']['after_read']['dataframe_mb'], 2))
+
+
+class TestPerformanceReport(TempDirTestCase):
+    """report.json y results.txt incluyen etapas y reglas con filas y fallas"""
+
+    def setUp(self):
+        super().setUp()
+        self.csv_path = self.write_file('ventas.csv', 'codigo,monto\nA,10\nB,-1\nC,\nD,80\n')
+
+    def test_report(self):
+        logger = self.new_logger()
+        processor = FileProcessor(build_config(), logger)
+        errors, warnings = processor.process_file(self.csv_path, 'ventas')
+        logger.register_rule_timings(processor.rule_timings.as_list())
+        logger.register_memory(memory_report(processor, self.csv_path))
+        logger.summary(4, errors, warnings)
+
+        with open(logger.report_json, encoding='utf-8') as f:
+            performance = json.load(f)['performance']
+        self.assertTrue({'read', 'conversion', 'field_rules', 'row_rules', 'catalog_rules', 'logging'}
+                        <= set(performance['stages']))
+        memory = performance['memory']
+        self.assertEqual(memory['input_bytes'], os.path.getsize(self.csv_path))
+        self.assertEqual(list(memory['files']['ventas.csv']), ['after_read', 'after_conversion', 'after_validation'])
+        self.assertEqual(list(memory['totals']), ['after_read', 'after_conversion', 'after_validation'])
+        rules = {(t['level'], t['scope'], t['rule']): (t['evaluations'], t['rows'], t['failures'])
+                 for t in performance['rules']}
+        self.assertEqual(rules, {
+            ('field', 'ventas.csv/monto', 'Positivo'): (1, 3, 1),
+            ('row', 'ventas.csv', 'Acotado'): (1, 4, 2),   # El monto vacío tampoco es menor a 50
+            ('catalog', 'ventas.csv', 'Total'): (1, 4, 4)
+        })
+
+        with open(logger.results_file, encoding='utf-8') as f:
+            results = f.read()
+        self.assertIn('Reglas más lentas:', results)
+        self.assertIn('ventas.csv/monto', results)
+        self.assertIn('DataFrames tras conversión', results)
+
+
+if __name__ == '__main__':
+    unittest.main()
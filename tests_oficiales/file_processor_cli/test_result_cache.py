@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Pruebas para la caché de resultados por hash del archivo de datos y del YAML
+"""
+import json
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.main import lookup_cached_result, process_files
+from sage.result_cache import ResultCache
+
+from helpers import TempDirTestCase
+
+YAML = """
+sage_yaml:
+  name: Prueba
+  description: Prueba
+  version: '1.0'
+  author: SAGE
+catalogs:
+  ventas:
+    name: Ventas
+    description: Ventas
+    filename: ventas.csv
+    file_format: {type: CSV, delimiter: ',', header: true}
+    fields:
+      - {name: codigo, type: texto, required: true}
+      - {name: monto, type: decimal}
+    row_validation:
+      - {name: Positivo, description: Positivo, rule: "df['monto'] > 0", severity: error}
+packages: {}
+"""
+
+
+class TestResultCache(TempDirTestCase):
+    """Un reenvío del mismo archivo con el mismo YAML reutiliza el resultado de la primera ejecución"""
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.temp_dir.name)  # process_files crea executions/ en el directorio actual
+        self.yaml_path = self.write_file('config.yaml', YAML)
+        self.csv_path = self.write_file('ventas.csv', 'codigo,monto\nA,10\nB,-1\n,5\n')
+        env = mock.patch.dict(os.environ, {'SAGE_RESULT_CACHE_DIR': self.temp_path('cache'), 'SAGE_RESULT_CACHE': ''})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def report(self, execution_uuid):
+        with open(os.path.join('executions', execution_uuid, 'report.json'), encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_resend_reuses_result(self):
+        first, errors, warnings = process_files(self.yaml_path, self.csv_path)
+        self.assertEqual(errors, 2)
+
+        # Comentarios y orden distinto en el YAML no cambian la clave
+        with open(self.yaml_path, 'a', encoding='utf-8') as f:
+            f.write('# reenvío\n')
+        second = process_files(self.yaml_path, self.csv_path)
+        self.assertEqual(second[1:], (errors, warnings))
+        report = self.report(second[0])
+        self.assertEqual(report['execution_info']['cached_from']['execution_uuid'], first)
+        self.assertEqual(report['validation']['failures'], self.report(first)['validation']['failures'])
+        self.assertIn(f"El archivo y el YAML son idénticos a los de la ejecución {first}: "
+                      f"se reutiliza su resultado sin leer ni validar el archivo",
+                      [event['message'] for event in report['events']])
+
+        third = process_files(self.yaml_path, self.csv_path, use_cache=False)
+        self.assertNotIn('cached_from', self.report(third[0])['execution_info'])
+
+        with open(self.csv_path, 'a', encoding='utf-8') as f:
+            f.write('C,-2\n')
+        fourth = process_files(self.yaml_path, self.csv_path)
+        self.assertEqual(fourth[1], 3)
+        self.assertNotIn('cached_from', self.report(fourth[0])['execution_info'])
+
+    def test_key_and_materializations(self):
+        cache = ResultCache(self.temp_path('cache'))
+        key = cache.key(self.csv_path, self.yaml_path)
+        self.assertNotEqual(cache.key(self.csv_path, self.yaml_path, casilla_id=7), key)
+        self.assertNotEqual(cache.key(self.csv_path, self.yaml_path, casilla_id=7, emisor_id=3),
+                            cache.key(self.csv_path, self.yaml_path, casilla_id=7))
+        with mock.patch.dict(os.environ, {'SAGE_ENGINE': 'pyarrow'}):
+            self.assertNotEqual(cache.key(self.csv_path, self.yaml_path), key)
+
+        # Una entrada sin materializaciones completas no se reutiliza en una ejecución con casilla
+        logger = self.new_logger(console='off')
+        casilla_key = cache.key(self.csv_path, self.yaml_path, 7)
+        cache.store(casilla_key, {}, 'original', 'dir', 3, 0, 0, materialized=False)
+        self.assertIsNone(lookup_cached_result(cache, logger, self.yaml_path, self.csv_path, 7)[1])
+        cache.store(casilla_key, {}, 'original', 'dir', 3, 0, 0, materialized=True)
+        self.assertIsNotNone(lookup_cached_result(cache, logger, self.yaml_path, self.csv_path, 7)[1])
+
+    def test_eviction(self):
+        cache = ResultCache(self.temp_path('cache'), max_mb=1, max_age_days=1)
+        result = {'events': [{'message': 'x' * 400_000}]}
+        for key in ('a', 'b', 'c'):
+            cache.store(key, result, key, key, 1, 0, 0)
+            time.sleep(0.01)
+        # Caben dos entradas: se descarta la usada hace más tiempo
+        self.assertIsNone(cache.lookup('a'))
+        self.assertIsNotNone(cache.lookup('b'))
+
+        with open(os.path.join(cache.directory, 'c', 'entry.json'), encoding='utf-8') as f:
+            entry = json.load(f)
+        entry['created_at'] -= 2 * 24 * 3600
+        with open(os.path.join(cache.directory, 'c', 'entry.json'), 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        self.assertIsNone(cache.lookup('c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Pruebas para el análisis estático de las columnas que usan las reglas
+"""
+import os
+import sys
+import unittest
+import zipfile
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.file_processor import FileProcessor
+from sage.rule_analysis import package_rule_columns, rule_columns
+
+from helpers import TempDirTestCase, catalog, load_config, package, rule
+
+
+def build_config(package_rule, streaming=False):
+    """Construye un paquete con ventas y clientes y una regla de paquete"""
+    fields = [
+        {'name': 'codigo', 'type': 'texto', 'required': True},
+        {'name': 'cliente', 'type': 'texto'},
+        {'name': 'monto', 'type': 'decimal'}
+    ]
+    catalogs = {name: catalog(name, fields, file_format={'streaming': streaming}) for name in ('ventas', 'clientes')}
+    catalogs['ventas']['catalog_validation'] = [
+        rule('Total positivo', "bool(df['monto'].sum() > 0)", description='El total debe ser positivo')
+    ]
+    return load_config(catalogs, package(['ventas', 'clientes'], [rule('Regla de paquete', package_rule, 'warning')]))
+
+
+class TestRuleColumns(unittest.TestCase):
+    """Extracción de columnas desde las expresiones"""
+
+    def test_catalog_rules(self):
+        self.assertEqual(rule_columns("df['monto'] > 0"), ['monto'])
+        self.assertEqual(rule_columns("(df.monto > 0) & df['tipo'].isin(['A', 'B'])"), ['monto', 'tipo'])
+        self.assertEqual(rule_columns("df[['a', 'b']].notnull().all(axis=1)"), ['a', 'b'])
+        self.assertEqual(rule_columns("df['fecha'] <= pd.Timestamp.now()"), ['fecha'])
+        # Usos del DataFrame completo: no se puede saber qué columnas necesita
+        self.assertIsNone(rule_columns("df.apply(lambda row: row['a'] > 0, axis=1)"))
+        self.assertIsNone(rule_columns("len(df) > 0"))
+        self.assertIsNone(rule_columns("df[df['a'] > 0]['b'].notnull()"))
+        self.assertIsNone(rule_columns("df['a'] >"))
+
+    def test_package_rules(self):
+        self.assertEqual(
+            package_rule_columns("df['ventas']['cliente'].isin(df['clientes']['codigo'])"),
+            {'ventas': ['cliente'], 'clientes': ['codigo']}
+        )
+        self.assertEqual(package_rule_columns("len(df['ventas']) > 0"), {'ventas': None})
+        self.assertIsNone(package_rule_columns("all(len(v) > 0 for v in df.values())"))
+
+    def test_rules_are_analyzed_at_load(self):
+        config = build_config("df['ventas']['cliente'].isin(df['clientes']['codigo'])")
+        self.assertEqual(config.catalogs['ventas'].catalog_validation[0].columns, ['monto'])
+        self.assertEqual(config.packages['paquete'].package_validation[0].catalog_columns,
+                         {'ventas': ['cliente'], 'clientes': ['codigo']})
+
+
+class TestRetainedColumns(TempDirTestCase):
+    """self.dataframes conserva solo las columnas que usan las reglas de paquete"""
+
+    def setUp(self):
+        super().setUp()
+        self.zip_path = self.temp_path('paquete.zip')
+        with zipfile.ZipFile(self.zip_path, 'w') as zf:
+            zf.writestr('ventas.csv', 'codigo,cliente,monto\nV1,C1,10\nV2,C9,5\n')
+            zf.writestr('clientes.csv', 'codigo,cliente,monto\nC1,X,1\nC2,Y,2\n')
+
+    def run_package(self, package_rule, retain, streaming=False):
+        logger = self.new_logger()
+        processor = FileProcessor(build_config(package_rule, streaming), logger)
+        processor.retain_dataframes = retain
+        processor.process_zip_file(self.zip_path, 'paquete')
+        return processor
+
+    def test_projected_dataframes(self):
+        rule = "df['ventas']['cliente'].isin(df['clientes']['codigo'])"
+        for streaming in (False, True):
+            processor = self.run_package(rule, retain=False, streaming=streaming)
+            self.assertEqual(list(processor.dataframes['ventas'].columns), ['cliente'])
+            self.assertEqual(list(processor.dataframes['clientes'].columns), ['codigo'])
+            self.assertEqual(processor.warning_count, 1)  # C9 no es cliente
+            self.assertEqual(processor.error_count, 0)
+
+    def test_unreferenced_catalog_is_not_kept(self):
+        processor = self.run_package("df['ventas']['monto'] > 0", retain=False)
+        self.assertEqual(set(processor.dataframes), {'ventas'})
+
+    def test_full_dataframes_when_retained_or_unknown(self):
+        processor = self.run_package("df['ventas']['cliente'].isin(df['clientes']['codigo'])", retain=True)
+        self.assertEqual(list(processor.dataframes['ventas'].columns), ['codigo', 'cliente', 'monto'])
+        processor = self.run_package("len(df['ventas']) > 0", retain=False)
+        self.assertEqual(list(processor.dataframes['ventas'].columns), ['codigo', 'cliente', 'monto'])
+
+
+if __name__ == '__main__':
+    unittest.main()
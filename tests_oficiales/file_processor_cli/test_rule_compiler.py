@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Pruebas para la compilación y caché de reglas de validación
+"""
+import os
+import sys
+import unittest
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.rule_compiler import RuleCache, compute_yaml_hash
+from sage.exceptions import YAMLValidationError
+
+from helpers import catalog, load_config, rule
+
+
+def build_config(expression):
+    """Construye una configuración mínima con una regla de campo"""
+    return load_config({'ventas': catalog('ventas', [{
+        'name': 'monto',
+        'type': 'decimal',
+        'validation_rules': [rule('Monto positivo', expression, description='El monto debe ser positivo')]
+    }])})
+
+
+class TestRuleCache(unittest.TestCase):
+    """Pruebas para RuleCache"""
+
+    def test_hits_and_misses(self):
+        """La segunda compilación de la misma regla es un acierto"""
+        cache = RuleCache()
+        first = cache.get("df['monto'] > 0", "abc")
+        second = cache.get("df['monto'] > 0", "abc")
+        self.assertIs(first, second)
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'size': 1})
+
+    def test_key_includes_yaml_hash(self):
+        """La misma regla en otro YAML se compila por separado"""
+        cache = RuleCache()
+        cache.get("df['monto'] > 0", "abc")
+        cache.get("df['monto'] > 0", "def")
+        self.assertEqual(cache.stats()['misses'], 2)
+
+    def test_eviction(self):
+        """La caché no supera su tamaño máximo"""
+        cache = RuleCache(max_entries=2)
+        for i in range(5):
+            cache.get(f"df['monto'] > {i}")
+        self.assertEqual(cache.stats()['size'], 2)
+
+    def test_yaml_hash_ignores_key_order(self):
+        """El hash de un diccionario no depende del orden de sus claves"""
+        self.assertEqual(compute_yaml_hash({'a': 1, 'b': 2}), compute_yaml_hash({'b': 2, 'a': 1}))
+
+
+class TestYAMLValidatorCompilation(unittest.TestCase):
+    """Pruebas de compilación de reglas al cargar el YAML"""
+
+    def test_rules_are_compiled(self):
+        """Las reglas quedan compiladas en el SageConfig"""
+        config = build_config("df['monto'] > 0")
+        rule = config.catalogs['ventas'].fields[0].validation_rules[0]
+        self.assertIsNotNone(rule.code)
+        self.assertTrue(config.yaml_hash)
+
+    def test_surrounding_whitespace(self):
+        """Los espacios al inicio y al final de la regla se ignoran, como con eval()"""
+        config = build_config("  df['monto'] > 0 \t")
+        self.assertIsNotNone(config.catalogs['ventas'].fields[0].validation_rules[0].code)
+        cache = RuleCache()
+        self.assertIs(cache.get("  df['monto'] > 0\n"), cache.get("df['monto'] > 0"))
+
+    def test_syntax_error_at_load_time(self):
+        """Una regla con error de sintaxis falla al cargar el YAML"""
+        with self.assertRaises(YAMLValidationError):
+            build_config("df['monto'] >")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+"""
+Pruebas para las reglas declarativas y la reescritura de expresiones a kernels vectorizados
+"""
+import os
+import re
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.arrow_engine import re2_pattern
+from sage.exceptions import YAMLValidationError
+from sage.file_processor import FileProcessor
+from sage.rule_kernels import InSetKernel, LengthKernel, RangeKernel, RegexKernel, rewrite_expression
+
+from helpers import TempDirTestCase, catalog, load_config, rule
+
+
+def build_config(monto_rules, codigo_rules, row_rules=()):
+    """Catálogo con un campo de texto y uno decimal"""
+    return load_config({'ventas': catalog('ventas', [
+        {'name': 'codigo', 'type': 'texto', 'validation_rules': list(codigo_rules)},
+        {'name': 'monto', 'type': 'decimal', 'validation_rules': list(monto_rules)}
+    ], row_validation=list(row_rules))})
+
+
+class TestRewrite(unittest.TestCase):
+    """Las expresiones reconocidas se reescriben a un kernel con el mismo resultado que eval"""
+
+    DF = pd.DataFrame({
+        'monto': [10.0, -2.0, 0.0, np.nan, 500.0],
+        'codigo': pd.Series(['C01', 'X1', 'C12345', None, 'c02']),
+        'texto': pd.Series(['C01', 'X1', 'C12345', None, 'c02'], dtype=object)
+    })
+
+    def test_equivalent_to_eval(self):
+        expressions = [
+            "df['monto'] > 0",
+            "0 <= df['monto']",
+            "(df['monto'] >= 0) & (df['monto'] < 100)",
+            "df['monto'].astype(float).between(0, 100)",
+            "df['codigo'].str.match('^C[0-9]+$')",
+            "df['texto'].str.fullmatch('C[0-9]{2}')",
+            "df['codigo'].str.contains('1', na=False)",
+            "df['codigo'].isin(['C01', 'X1'])",
+            "df['texto'].str.len() <= 3",
+            "df['codigo'].str.len() == 3"
+        ]
+        for expression in expressions:
+            kernel = rewrite_expression(expression)
+            self.assertIsNotNone(kernel, expression)
+            expected = eval(expression, {'df': self.DF}).fillna(False).astype(bool)
+            pd.testing.assert_series_equal(kernel(self.DF), expected, check_names=False, obj=expression)
+
+    def test_unknown_patterns_are_kept(self):
+        for expression in ("df['monto'] == 5", "df['monto'] > df['otro']", "df['codigo'].notnull()",
+                           "(df['monto'] > 0) & (df['otro'] < 3)", "df['codigo'].str.contains('x', case=False)"):
+            self.assertIsNone(rewrite_expression(expression), expression)
+
+
+class TestArrowRegex(unittest.TestCase):
+    """Los patrones traducidos a RE2 dan el mismo resultado que re; los demás usan re"""
+
+    VALUES = ['ab', 'añ', 'a\n', 'A-123', 'x a1 b', 'ab\nc', '', None, '١٢', 'a_b', 'ab]', 'Ñandú', 7]
+
+    def test_same_result_as_re(self):
+        patterns = [r'^a\w$', 'a$', r'[A-Z]-[0-9]{3}', r'\d+', r'[\w-]+', r'[^\d]+', r'\S+', '(?i)ñ',
+                    '[]a]', r'\u00f1', r'b\Z', 'a|b$', '^$']
+        column = pd.Series(self.VALUES, dtype=object)
+        for pattern in patterns:
+            for mode in ('fullmatch', 'match', 'search'):
+                kernel = RegexKernel('x', pattern, mode)
+                expected = [isinstance(v, str) and getattr(re.compile(pattern), mode)(v) is not None
+                            for v in self.VALUES]
+                self.assertEqual(kernel.evaluate(column).tolist(), expected, f'{pattern} ({mode})')
+                self.assertEqual(kernel.engine, 're')  # El 7 no es texto: no se puede pasar a Arrow
+                self.assertEqual(kernel.evaluate(column[:-1]).tolist(), expected[:-1], f'{pattern} ({mode})')
+                self.assertEqual(kernel.engine, 'arrow')
+
+    def test_fallback_to_re(self):
+        for pattern in (r'a\b', '(?=a)', r'(a)\1', 'a{,2}', '(?x) a', '[[:alpha:]]'):
+            self.assertIsNone(re2_pattern(pattern, 'search'), pattern)
+        kernel = RegexKernel('x', r'\bC\d+', 'search')
+        self.assertEqual(kernel.evaluate(pd.Series(['la C12', 'AC1'])).tolist(), [True, False])
+        self.assertEqual(kernel.engine, 're')
+
+
+class TestDeclarativeRules(TempDirTestCase):
+    """Las reglas con type se cargan como kernels y reportan lo mismo que su expresión"""
+
+    def setUp(self):
+        super().setUp()
+        self.df = pd.DataFrame({
+            'codigo': ['V01', 'V02', 'X03', 'V4', 'V05'],
+            'monto': [10.0, np.nan, -5.0, 150.0, 99.0]
+        })
+
+    def failures(self, config):
+        logger = self.new_logger()
+        FileProcessor(config, logger).validate_catalog(self.df, config.catalogs['ventas'])
+        return sorted((e['message'], e['details']['line']) for e in logger.events if e['severity'] == 'error')
+
+    def test_parse(self):
+        config = build_config(
+            [rule('Rango', type='range', min=0, max=100, max_inclusive=False)],
+            [rule('Formato', type='regex', pattern='V[0-9]+'),
+             rule('Conjunto', type='in_set', values=['V01', 'V02']),
+             rule('Largo', type='length', min=3, max=3)],
+            [rule('Fila', type='range', field='monto', min=0)]
+        )
+        catalog = config.catalogs['ventas']
+        monto_rule = catalog.fields[1].validation_rules[0]
+        self.assertEqual(monto_rule.kernel, RangeKernel('monto', 0, 100, True, False))
+        self.assertEqual(monto_rule.rule, "(df['monto'] >= 0) & (df['monto'] < 100)")
+        self.assertEqual(monto_rule.columns, ['monto'])
+        self.assertEqual([r.kernel for r in catalog.fields[0].validation_rules], [
+            RegexKernel('codigo', 'V[0-9]+'), InSetKernel('codigo', ['V01', 'V02']), LengthKernel('codigo', 3, 3)
+        ])
+        self.assertEqual(catalog.row_validation[0].kernel.field, 'monto')
+
+    def test_invalid_rules(self):
+        invalid = [
+            rule('Tipo', type='between', min=0),
+            rule('Sin límites', type='range'),
+            rule('Límites', type='range', min=10, max=1),
+            rule('Patrón', type='regex', pattern='(sin cerrar'),
+            rule('Modo', type='regex', pattern='x', mode='exacto'),
+            rule('Vacío', type='in_set', values=[]),
+            rule('Largo', type='length', max=-1),
+            rule('Ambas', type='range', min=0, rule="df['monto'] > 0")
+        ]
+        for invalid_rule in invalid:
+            with self.assertRaises(YAMLValidationError, msg=invalid_rule['name']):
+                build_config([invalid_rule], [])
+        with self.assertRaises(YAMLValidationError):
+            build_config([], [], [rule('Fila sin campo', type='range', min=0)])
+
+    def test_same_failures_as_expressions(self):
+        declarative = build_config(
+            [rule('Rango', type='range', min=0, max=100)],
+            [rule('Formato', type='regex', pattern='V[0-9]{2}'), rule('Conjunto', type='in_set', values=['V01', 'V05'])]
+        )
+        expressions = build_config(
+            [rule('Rango', rule="df['monto'].between(0, 100)")],
+            [rule('Formato', rule="df['codigo'].str.fullmatch('V[0-9]{2}')"),
+             rule('Conjunto', rule="df['codigo'].isin(['V01', 'V05'])")]
+        )
+        with mock.patch.dict(os.environ, {'SAGE_RULE_REWRITE': '0'}):
+            evaluated = build_config(
+                [rule('Rango', rule="df['monto'].between(0, 100)")],
+                [rule('Formato', rule="df['codigo'].str.fullmatch('V[0-9]{2}')"),
+                 rule('Conjunto', rule="df['codigo'].isin(['V01', 'V05'])")]
+            )
+        self.assertIsNotNone(expressions.catalogs['ventas'].fields[1].validation_rules[0].kernel)
+        self.assertIsNone(evaluated.catalogs['ventas'].fields[1].validation_rules[0].kernel)
+
+        expected = self.failures(evaluated)
+        self.assertEqual(len(expected), 7)
+        self.assertEqual(self.failures(declarative), expected)
+        self.assertEqual(self.failures(expressions), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
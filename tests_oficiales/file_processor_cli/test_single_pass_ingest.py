@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Pruebas para la lectura de CSV en una sola pasada
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage import file_processor
+from sage.file_processor import FileProcessor
+from sage.ingest import SAMPLE_SIZE, sniff_encoding
+
+from helpers import TempDirTestCase, catalog, load_config
+
+
+def build_config(header=True):
+    """Construye un catálogo con campos de texto, entero y fecha"""
+    return load_config({'clientes': catalog('clientes', [
+        {'name': 'codigo', 'type': 'texto', 'required': True},
+        {'name': 'nombre', 'type': 'texto'},
+        {'name': 'alta', 'type': 'fecha'}
+    ], file_format={'header': header})})
+
+
+class TestSniffEncoding(unittest.TestCase):
+    """Pruebas para sniff_encoding"""
+
+    def test_sniff(self):
+        self.assertEqual(sniff_encoding(b'\xef\xbb\xbfa,b\n'), 'utf-8-sig')
+        self.assertEqual(sniff_encoding('a,ñ\n'.encode('utf-8')), 'utf-8')
+        self.assertEqual(sniff_encoding('a,ñ\n'.encode('latin1')), 'latin1')
+        # Un carácter multibyte cortado al final de la muestra no cambia la detección
+        self.assertEqual(sniff_encoding('ñ'.encode('utf-8')[:1]), 'utf-8')
+
+
+class TestSinglePassIngest(TempDirTestCase):
+    """El CSV se parsea una sola vez con los tipos del catálogo"""
+
+    def setUp(self):
+        super().setUp()
+        self.logger = self.new_logger()
+        self.csv_path = self.temp_path('clientes.csv')
+
+    def read(self, content, header=True):
+        with open(self.csv_path, 'wb') as f:
+            f.write(content)
+        config = build_config(header)
+        processor = FileProcessor(config, self.logger)
+        with mock.patch.object(file_processor.pd, 'read_csv', wraps=pd.read_csv) as read_csv:
+            df = processor._read_file(self.csv_path, config.catalogs['clientes'])
+        return processor, df, read_csv.call_count
+
+    def test_text_fields_keep_raw_values(self):
+        """Los campos de texto no pasan por la inferencia numérica"""
+        processor, df, calls = self.read(b'codigo,nombre,alta\n001,Ana,2024-01-31\n002,Luis,no es fecha\n')
+        self.assertEqual(calls, 1)
+        self.assertEqual(df['codigo'].tolist(), ['001', '002'])
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df['alta']))
+        self.assertEqual(processor.coercion_failures['clientes.csv']['alta'].tolist(), [False, True])
+
+    def test_mixed_encoding_single_read(self):
+        """Un archivo UTF-8 con bytes latin1 después de la muestra se lee en una pasada"""
+        rows = ''.join(f'C{i},Señal,2024-01-01\n' for i in range(SAMPLE_SIZE // 20))
+        content = b'codigo,nombre,alta\n' + rows.encode('utf-8') + 'C0,Ñuñoa,2024-01-01\n'.encode('latin1')
+        _, df, calls = self.read(content)
+        self.assertEqual(calls, 1)
+        self.assertEqual(df['nombre'].iloc[0], 'Señal')
+        self.assertEqual(df['nombre'].iloc[-1], 'Ñuñoa')
+
+    def test_extra_columns_are_projected(self):
+        """Las columnas que no están en el catálogo no se leen, pero se reporta la estructura"""
+        processor, df, _ = self.read(b'nombre,extra,codigo,alta\nAna,x,001,2024-01-31\n')
+        self.assertEqual(list(df.columns), ['codigo', 'nombre', 'alta'])
+        self.assertEqual(processor.error_count, 1)
+        self.assertEqual(self.logger.format_errors[0]['found'], '4 columnas')
+
+    def test_headerless_extra_columns(self):
+        """Sin encabezado se leen solo las primeras columnas del catálogo"""
+        processor, df, calls = self.read(b'001,Ana,2024-01-31,x\n002,Luis,2024-02-01,y\n', header=False)
+        self.assertEqual(calls, 1)
+        self.assertEqual(list(df.columns), ['codigo', 'nombre', 'alta'])
+        self.assertEqual(df['codigo'].tolist(), ['001', '002'])
+        self.assertEqual(self.logger.format_errors[0]['found'], '4 columnas')
+
+
+if __name__ == '__main__':
+    unittest.main()
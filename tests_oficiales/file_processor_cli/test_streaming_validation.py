@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""
+Pruebas para la validación de CSV en modo streaming (por bloques)
+"""
+import os
+import sys
+import unittest
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.file_processor import FileProcessor
+
+from helpers import TempDirTestCase, catalog, load_config, rule
+
+
+def build_config(streaming):
+    """Construye una configuración de un catálogo CSV con reglas de campo, fila y catálogo"""
+    return load_config({'ventas': catalog('ventas', [
+        {'name': 'codigo', 'type': 'texto', 'required': True, 'unique': True},
+        {'name': 'monto', 'type': 'decimal', 'validation_rules': [
+            rule('Monto positivo', "df['monto'] > 0", 'warning', description='El monto debe ser positivo')
+        ]}
+    ], file_format={'streaming': streaming, 'chunk_size': 1000},
+        row_validation=[rule('Monto acotado', "df['monto'] < 1000", description='El monto debe ser menor a 1000')],
+        catalog_validation=[rule('Total', "bool(df['monto'].sum() < 10)", 'warning',
+                                 description='El total no debe superar el límite')])})
+
+
+class TestStreamingValidation(TempDirTestCase):
+    """El modo streaming debe producir los mismos resultados que la lectura completa"""
+
+    def setUp(self):
+        super().setUp()
+        self.csv_path = self.temp_path('ventas.csv')
+        with open(self.csv_path, 'w', encoding='utf-8') as f:
+            f.write('codigo,monto\n')
+            for i in range(3500):
+                codigo = 'DUP' if i % 700 == 0 else ('' if i % 900 == 1 else f'C{i}')
+                monto = -1 if i % 250 == 0 else (2000 if i % 333 == 0 else i % 100 + 1)
+                f.write(f'{codigo},{monto}\n')
+
+    def run_processor(self, streaming):
+        logger = self.new_logger()
+        processor = FileProcessor(build_config(streaming), logger)
+        processor.process_file(self.csv_path, 'ventas')
+        lines = sorted(
+            (failure['message'], failure.get('line'))
+            for failure in logger.validation_failures
+        )
+        errors = sorted(
+            (event['message'], event['details'].get('line'))
+            for event in logger.events if event['severity'] == 'error'
+        )
+        return processor, lines, errors
+
+    def test_streaming_matches_full_read(self):
+        """Conteos y líneas reportadas coinciden entre ambos modos"""
+        full, full_lines, full_errors = self.run_processor(False)
+        streamed, streamed_lines, streamed_errors = self.run_processor(True)
+        self.assertEqual(full.error_count, streamed.error_count)
+        self.assertEqual(full.warning_count, streamed.warning_count)
+        self.assertEqual(full_lines, streamed_lines)
+        self.assertEqual(full_errors, streamed_errors)
+
+    def test_duplicates_across_chunks(self):
+        """Los duplicados en bloques distintos se detectan"""
+        streamed, _, errors = self.run_processor(True)
+        duplicate_lines = [line for message, line in errors if message == "Field 'codigo' must be unique"]
+        # 'DUP' aparece en las filas 0, 700, 1400, 2100 y 2800 (líneas 2, 702, ...);
+        # los códigos vacíos de las filas 1, 901, 1801 y 2701 también cuentan como repetidos
+        self.assertEqual(duplicate_lines, [702, 903, 1402, 1803, 2102, 2703, 2802])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Pruebas para el índice de unicidad y las claves únicas compuestas
+"""
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.exceptions import YAMLValidationError
+from sage.file_processor import FileProcessor
+from sage.uniqueness import UniquenessIndex
+
+from helpers import TempDirTestCase, catalog, load_config
+
+
+def build_config(unique_keys):
+    """Construye una configuración con un catálogo de facturas y las claves únicas indicadas"""
+    return load_config({'facturas': catalog('facturas', [
+        {'name': 'sucursal', 'type': 'texto'},
+        {'name': 'numero', 'type': 'entero'}
+    ], unique_keys=unique_keys)})
+
+
+class TestUniquenessIndex(unittest.TestCase):
+    """Pruebas para UniquenessIndex"""
+
+    def test_duplicates_across_batches(self):
+        """Las claves repetidas se detectan dentro y entre lotes con su primera línea"""
+        index = UniquenessIndex(['codigo'])
+        positions, first = index.add(pd.DataFrame({'codigo': ['A', 'B', 'A']}), [2, 3, 4])
+        self.assertEqual(positions.tolist(), [2])
+        self.assertEqual(first.tolist(), [2])
+        positions, first = index.add(pd.DataFrame({'codigo': ['C', 'B', 'A']}), [5, 6, 7])
+        self.assertEqual(positions.tolist(), [1, 2])
+        self.assertEqual(first.tolist(), [3, 2])
+        self.assertEqual(index.size, 3)
+
+    def test_numeric_types_are_normalized(self):
+        """Un mismo número leído como entero o decimal es la misma clave"""
+        index = UniquenessIndex(['id'])
+        index.add(pd.DataFrame({'id': [1, 2]}), [2, 3])
+        positions, first = index.add(pd.DataFrame({'id': [2.0, np.nan, 3.5]}), [4, 5, 6])
+        self.assertEqual(positions.tolist(), [0])
+        self.assertEqual(first.tolist(), [3])
+
+    def test_hash_collisions_are_confirmed(self):
+        """Dos claves distintas con el mismo hash no se reportan como duplicadas"""
+        index = UniquenessIndex(['codigo'])
+        index._hash = lambda keys: np.zeros(len(keys[0]), dtype=np.uint64)
+        positions, _ = index.add(pd.DataFrame({'codigo': ['A', 'B', 'A']}), [2, 3, 4])
+        self.assertEqual(positions.tolist(), [2])
+        positions, first = index.add(pd.DataFrame({'codigo': ['C', 'B']}), [5, 6])
+        self.assertEqual(positions.tolist(), [1])
+        self.assertEqual(first.tolist(), [3])
+
+    def test_compaction_keeps_keys(self):
+        """Al compactar los segmentos no se pierden claves"""
+        index = UniquenessIndex(['codigo'])
+        for batch in range(UniquenessIndex.MAX_SEGMENTS + 2):
+            index.add(pd.DataFrame({'codigo': [f'C{batch}']}), [batch + 2])
+        positions, first = index.add(pd.DataFrame({'codigo': ['C0', 'C9']}), [100, 101])
+        self.assertEqual(positions.tolist(), [0, 1])
+        self.assertEqual(first.tolist(), [2, 11])
+
+
+class TestCompositeUniqueKeys(TempDirTestCase):
+    """Pruebas para unique_keys en los catálogos"""
+
+    def test_composite_key_duplicates(self):
+        """Solo se reportan las combinaciones repetidas de la clave compuesta"""
+        config = build_config([['sucursal', 'numero']])
+        logger = self.new_logger()
+        processor = FileProcessor(config, logger)
+        df = pd.DataFrame({'sucursal': ['A', 'A', 'B', 'A'], 'numero': [1, 2, 1, 1]})
+        processor.validate_catalog(df, config.catalogs['facturas'])
+        self.assertEqual(processor.error_count, 1)
+        event = [e for e in logger.events if e['severity'] == 'error'][0]
+        self.assertEqual(event['details']['line'], 5)
+        self.assertEqual(event['details']['first_line'], 2)
+        self.assertEqual(event['details']['value'], 'A, 1')
+
+    def test_unknown_field_in_key(self):
+        """Una clave compuesta con un campo inexistente falla al cargar el YAML"""
+        with self.assertRaises(YAMLValidationError):
+            build_config([['sucursal', 'fecha']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+Pruebas para la lectura de catálogos directamente desde el ZIP, sin extraerlo
+"""
+import os
+import sys
+import unittest
+import zipfile
+from unittest import mock
+
+# Agregar directorio raíz al path para poder importar los módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sage.file_processor import FileProcessor, ZipMember, detect_bom, detect_encoding
+
+from helpers import TempDirTestCase, catalog, load_config, package
+
+
+def build_config(streaming=False):
+    """Construye un paquete ZIP con dos catálogos CSV"""
+    fields = [
+        {'name': 'codigo', 'type': 'texto', 'required': True},
+        {'name': 'nombre', 'type': 'texto'}
+    ]
+    catalogs = {name: catalog(name, fields, file_format={'streaming': streaming}) for name in ('ventas', 'clientes')}
+    return load_config(catalogs, package(['ventas', 'clientes']))
+
+
+class TestZipMembers(TempDirTestCase):
+    """Los miembros del ZIP se leen como flujos"""
+
+    def setUp(self):
+        super().setUp()
+        self.zip_path = self.temp_path('paquete.zip')
+        with zipfile.ZipFile(self.zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            # Con BOM y en UTF-8
+            zf.writestr('ventas.csv', '\ufeffcodigo,nombre\nV1,Señal\nV2,Año\n'.encode('utf-8'))
+            # En latin1
+            zf.writestr('clientes.csv', 'codigo,nombre\nC1,Peñalolén\n,Ñuñoa\n'.encode('latin1'))
+            zf.writestr('otro.csv', 'no,se,lee\n')
+
+    def test_encoding_detection_on_members(self):
+        """BOM y codificación se detectan sobre el flujo del miembro"""
+        with zipfile.ZipFile(self.zip_path) as zf:
+            self.assertTrue(detect_bom(ZipMember(zf, 'ventas.csv')))
+            self.assertEqual(detect_encoding(ZipMember(zf, 'ventas.csv')), 'utf-8-sig')
+            self.assertFalse(detect_bom(ZipMember(zf, 'clientes.csv')))
+            self.assertEqual(detect_encoding(ZipMember(zf, 'clientes.csv')), 'latin1')
+
+    def run_package(self, streaming):
+        logger = self.new_logger()
+        processor = FileProcessor(build_config(streaming), logger)
+        with mock.patch.object(zipfile.ZipFile, 'extractall', side_effect=AssertionError('extractall')), \
+                mock.patch.object(zipfile.ZipFile, 'open', autospec=True, side_effect=zipfile.ZipFile.open) as opened:
+            processor.process_zip_file(self.zip_path, 'paquete')
+        return processor, logger, {call.args[1] for call in opened.call_args_list}
+
+    def test_package_without_extraction(self):
+        """El paquete se valida sin extraer y solo se abren los miembros del paquete"""
+        for streaming in (False, True):
+            processor, logger, opened = self.run_package(streaming)
+            self.assertEqual(processor.error_count, 1)  # Código requerido vacío en clientes
+            self.assertEqual(opened, {'ventas.csv', 'clientes.csv'})
+            self.assertEqual(processor.dataframes['ventas']['nombre'].tolist(), ['Señal', 'Año'])
+            self.assertEqual(processor.dataframes['clientes']['nombre'].tolist(), ['Peñalolén', 'Ñuñoa'])
+
+    def test_missing_member(self):
+        """Un catálogo ausente en el ZIP se registra como faltante"""
+        with zipfile.ZipFile(self.zip_path, 'w') as zf:
+            zf.writestr('ventas.csv', 'codigo,nombre\nV1,Uno\n')
+        logger = self.new_logger()
+        processor = FileProcessor(build_config(), logger)
+        processor.process_zip_file(self.zip_path, 'paquete')
+        self.assertEqual(processor.error_count, 1)
+        self.assertEqual(logger.missing_files, [{'filename': 'clientes.csv', 'package': 'paquete'}])
+
+
+if __name__ == '__main__':
+    unittest.main()